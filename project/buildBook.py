@@ -0,0 +1,25 @@
+import argparse
+
+from chess.chessBoard import ChessBoard
+from chess.chessOpeningBook import ChessOpeningBookBuilder
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description = "Build an opening book from PGN games.")
+	parser.add_argument("output", help = "book file to write")
+	parser.add_argument("pgn", nargs = "+", help = "PGN files to read the games from")
+	parser.add_argument("--max-ply", type = int, default = ChessOpeningBookBuilder.DefaultMaximumPly, help = "plies of each game added to the book")
+	parser.add_argument("--min-weight", type = int, default = 1, help = "leave out moves weighted less than this")
+	args = parser.parse_args()
+
+	builder = ChessOpeningBookBuilder(ChessBoard(), args.max_ply)
+	for pgnFilePath in args.pgn:
+		with open(pgnFilePath, "r", encoding = "utf-8", errors = "replace") as pgnFile:
+			builder.addPgn(pgnFile)
+
+	numberOfEntries = builder.write(args.output, args.min_weight)
+	print(args.output + ": " + str(numberOfEntries) + " entries from " + str(builder.numberOfGames) + " games")
+
+	return 0
+
+if __name__ == "__main__":
+	exit(main())
@@ -0,0 +1,35 @@
+import argparse
+import os
+
+from chess.chessBoard import ChessBoard
+from chess.chessTablebase import ChessTablebase, ChessTablebases, ChessTablebaseGenerator
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description = "Build the king and piece against king endgame tablebases.")
+	parser.add_argument("output", help = "directory to write the tables to")
+	args = parser.parse_args()
+
+	os.makedirs(args.output, exist_ok = True)
+
+	generator = ChessTablebaseGenerator(ChessBoard())
+
+	# The pawn table continues in the queen table after promotions, so it comes last.
+	queenTablebase: ChessTablebase = None
+	for pieceCharacter in ['Q', 'R', 'P']:
+		name = "K" + pieceCharacter + "K"
+		values = generator.generate(pieceCharacter, queenTablebase)
+		if values is None:
+			return 1
+
+		with open(os.path.join(args.output, name + ChessTablebases.FileExtension), "wb") as file:
+			file.write(values)
+
+		if pieceCharacter == 'Q':
+			queenTablebase = ChessTablebase(name, values)
+
+		print(name + ": longest mate in " + str(max(values) - 1) + " plies")
+
+	return 0
+
+if __name__ == "__main__":
+	exit(main())
@@ -0,0 +1,108 @@
+import argparse
+import os
+import random
+
+# Render off screen, so that the check runs without a display.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from chess.chessBoard import ChessEndGameCondition
+from chess.chessGameModel import ChessGameModel
+from chess.chessGameController import ChessGameController
+from chess.guiChessGameView import GuiChessGameView
+
+# Compares the screen after each partial redraw (dirty board cells and screen areas)
+# against a full redraw of the same frame, over randomly played games.
+class RedrawCheck():
+	def __init__(self, seed: int):
+		self.moveRandom = random.Random(seed)
+
+		self.chessGameModel = ChessGameModel()
+		self.chessGameController = ChessGameController(self.chessGameModel)
+		self.guiChessGameView = GuiChessGameView(self.chessGameModel, self.chessGameController)
+
+		self.numberOfFrames = 0
+		self.numberOfPartialUpdates = 0
+
+		self.displayUpdate = pygame.display.update
+		pygame.display.update = self.onDisplayUpdate
+
+	def onDisplayUpdate(self, rects = None) -> None:
+		if rects is None:
+			self.displayUpdate()
+			return
+
+		self.numberOfPartialUpdates += 1
+		self.displayUpdate(rects)
+
+	# Returns False when the partially redrawn frame differs from the fully redrawn one.
+	def checkFrame(self) -> bool:
+		view = self.guiChessGameView
+
+		view.draw()
+		partialFrame = pygame.image.tobytes(view.screen, "RGB")
+
+		view.guiChessBoard.invalidate()
+		view.isFullDrawOutdated = True
+		view.draw()
+		fullFrame = pygame.image.tobytes(view.screen, "RGB")
+
+		self.numberOfFrames += 1
+
+		return partialFrame == fullFrame
+
+	def selectCell(self, cellIndex: int, description: str) -> bool:
+		self.guiChessGameView.selectCell(cellIndex)
+		if self.checkFrame():
+			return True
+
+		print("RedrawCheck::selectCell - Partial redraw differs from full redraw after " + description)
+		return False
+
+	def run(self, numberOfPlies: int) -> int:
+		model = self.chessGameModel
+		board = model.board
+
+		model.initialize()
+		self.guiChessGameView.draw()
+
+		for ply in range(numberOfPlies):
+			if board.getCurrentMetEndOfGameCondition(model.currentTurnTeamIndex) is not ChessEndGameCondition.NONE:
+				break
+
+			moves = [(activeCellIndex, targetCellIndex) for activeCellIndex in board.getAllTeamPieceIndices(model.currentTurnTeamIndex) for targetCellIndex in board.getValidTargetCellIndices(activeCellIndex)]
+			(activeCellIndex, targetCellIndex) = self.moveRandom.choice(moves)
+			plyDescription = " at ply " + str(ply + 1)
+
+			if not self.selectCell(activeCellIndex, "activating a piece" + plyDescription):
+				return -1
+
+			# Also deactivate and reactivate pieces now and then.
+			if self.moveRandom.random() < 0.2:
+				if not self.selectCell(activeCellIndex, "deactivating a piece" + plyDescription):
+					return -1
+
+				if not self.selectCell(activeCellIndex, "reactivating a piece" + plyDescription):
+					return -1
+
+			if not self.selectCell(targetCellIndex, "moving a piece" + plyDescription):
+				return -1
+
+		return 0
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description = "Check that partial redraws of the chess view match full redraws, over random games.")
+	parser.add_argument("plies", type = int, nargs = "?", default = 120, help = "number of plies to play")
+	parser.add_argument("--seed", type = int, default = 3, help = "seed of the random moves")
+	args = parser.parse_args()
+
+	redrawCheck = RedrawCheck(args.seed)
+	result = redrawCheck.run(args.plies)
+
+	print(str(redrawCheck.numberOfFrames) + " frames compared, " + str(redrawCheck.numberOfPartialUpdates) + " partial display updates")
+
+	return 0 if result == 0 and redrawCheck.numberOfPartialUpdates > 0 else 1
+
+if __name__ == "__main__":
+	exit(main())
@@ -0,0 +1,399 @@
+from typing import List
+
+from chess.piece import Piece
+from chess.chessBoard import ChessBoard, ChessCheckInfo
+import chess.pawnChessPiece
+import chess.rookChessPiece
+import chess.knightChessPiece
+import chess.bishopChessPiece
+import chess.queenChessPiece
+import chess.kingChessPiece
+
+# Check info extended with the same cells as bitboards.
+class BitboardChessCheckInfo(ChessCheckInfo):
+	__slots__ = (
+		"checkBlockBitboard",
+		"pinRayBitboards"
+	)
+
+	def __init__(self, kingCellIndex: int):
+		super().__init__(kingCellIndex)
+
+		self.checkBlockBitboard = 0
+		self.pinRayBitboards: dict[int, int] = {}
+
+# Chess board which mirrors its cell contents into integer bitboards
+# (bit N represents cell index N), so that occupancy, attack, check and pin
+# queries become set-wise bit operations instead of per cell list inspection.
+class BitboardChessBoard(ChessBoard):
+	# Kinds of moves covered by the bitboard tables, indexing pieceKindBitboards.
+	PawnKind = 0
+	KnightKind = 1
+	BishopKind = 2
+	RookKind = 3
+	QueenKind = 4
+	KingKind = 5
+
+	# Sliding attacks per cell, keyed by the occupancy of the cells which can block them
+	# (filled as positions are met), shared by all bitboard chess boards.
+	orthogonalAttackTables: list[dict[int, int]] = None
+	diagonalAttackTables: list[dict[int, int]] = None
+
+	def __init__(self, maximumHistoryLength: int = -1, historyArchiveFilename: str = None):
+		super().__init__(maximumHistoryLength, historyArchiveFilename)
+
+		self.occupiedBitboard = 0
+		self.teamBitboards: list[int] = [0, 0]
+		self.pieceKindBitboards: list[int] = [0] * (self.KingKind + 1)
+
+		# Cells holding pieces of types the bitboard tables do not cover, which leave
+		# attack, check and move queries to the cell list implementation while on the board.
+		self.uncoveredPieceBitboard = 0
+
+		# Kind of every piece type id (including derived piece types), -1 when not covered.
+		self.pieceTypeKinds: list[int] = [-1] * len(self.pieceSet.pieceTypes)
+		for (pieceKind, basePieceType) in enumerate([chess.pawnChessPiece.PawnChessPiece, chess.knightChessPiece.KnightChessPiece, chess.bishopChessPiece.BishopChessPiece, chess.rookChessPiece.RookChessPiece, chess.queenChessPiece.QueenChessPiece, chess.kingChessPiece.KingChessPiece]):
+			for pieceTypeId in self.getPieceTypeIdsFromBaseType(basePieceType):
+				self.pieceTypeKinds[pieceTypeId] = pieceKind
+
+		self.knightAttackBitboards = self.createCellBitboards(self.pieceOffsetTables[chess.knightChessPiece.KnightChessPiece])
+		self.kingAttackBitboards = self.createCellBitboards(self.kingMoveCellIndices)
+
+		# Cells attacked by a pawn of a team standing on a given cell, which are also the cells
+		# from which an opponent pawn would attack a given cell of this team.
+		self.pawnAttackBitboards: list[list[int]] = [
+			self.createCellBitboards([[cellRays[attackDirectionIndex][0] for attackDirectionIndex in attackDirectionIndices if len(cellRays[attackDirectionIndex]) > 0] for cellRays in self.cellRays])
+			for attackDirectionIndices in chess.pawnChessPiece.PawnChessPiece.attackDirectionIndices
+		]
+
+		# rayBitboards[rayDirectionIndex][cellIndex]: the cells of cellRays as a bitboard.
+		self.rayBitboards = [self.createCellBitboards([cellRays[directionIndex] for cellRays in self.cellRays]) for directionIndex in range(len(self.RayDirections))]
+
+		# Whether the cell indices along a ray direction increase, so that its nearest blocker is the lowest bit.
+		self.isRayDirectionIncreasing = [direction[1] > 0 or (direction[1] == 0 and direction[0] > 0) for direction in self.RayDirections]
+
+		self.orthogonalDirectionIndices = chess.rookChessPiece.RookChessPiece.moveDirectionIndices
+		self.diagonalDirectionIndices = chess.bishopChessPiece.BishopChessPiece.moveDirectionIndices
+
+		# Cells which can block sliding attacks from a cell: the rays without their last cell at the board edge.
+		self.orthogonalBlockerBitboards = [self.getRayBlockerBitboard(cellIndex, self.orthogonalDirectionIndices) for cellIndex in range(self.getNumberOfCells())]
+		self.diagonalBlockerBitboards = [self.getRayBlockerBitboard(cellIndex, self.diagonalDirectionIndices) for cellIndex in range(self.getNumberOfCells())]
+
+		if BitboardChessBoard.orthogonalAttackTables is None:
+			BitboardChessBoard.orthogonalAttackTables = [{} for cellIndex in range(self.getNumberOfCells())]
+			BitboardChessBoard.diagonalAttackTables = [{} for cellIndex in range(self.getNumberOfCells())]
+
+		# Pawn advances per team: the cell in front, the cell two in front from the starting row (rank 2),
+		# and the promotion row (rank 8).
+		forwardDirectionIndices = chess.pawnChessPiece.PawnChessPiece.forwardDirectionIndices
+		pawnStartRows = [self.cellHeight - 2, 1]
+		self.pawnPushBitboards: list[list[int]] = []
+		self.pawnDoublePushBitboards: list[list[int]] = []
+		self.pawnPromotionBitboards: list[int] = []
+		for teamIndex in range(self.NumberOfTeams):
+			forwardRays = [cellRays[forwardDirectionIndices[teamIndex]] for cellRays in self.cellRays]
+			self.pawnPushBitboards.append(self.createCellBitboards([forwardRay[:1] for forwardRay in forwardRays]))
+			self.pawnDoublePushBitboards.append(self.createCellBitboards([forwardRays[cellIndex][1:2] if self.getCellCoordinatesFromIndex(cellIndex)[1] == pawnStartRows[teamIndex] else [] for cellIndex in range(self.getNumberOfCells())]))
+			self.pawnPromotionBitboards.append(self.createCellBitboards([[self.getCellIndexFromCoordinates([x, self.getHomeRow(self.getNextTurnTeamIndex(teamIndex))]) for x in range(self.cellWidth)]])[0])
+
+	def createCellBitboards(self, cellIndicesPerCell: List[List[int]]) -> List[int]:
+		cellBitboards: list[int] = []
+
+		for cellIndices in cellIndicesPerCell:
+			bitboard = 0
+			for cellIndex in cellIndices:
+				bitboard |= 1 << cellIndex
+
+			cellBitboards.append(bitboard)
+
+		return cellBitboards
+
+	def getCellIndicesFromBitboard(self, bitboard: int) -> List[int]:
+		cellIndices: list[int] = []
+
+		while bitboard:
+			lowestBit = bitboard & -bitboard
+			cellIndices.append(lowestBit.bit_length() - 1)
+			bitboard ^= lowestBit
+
+		return cellIndices
+
+	def getRayBlockerBitboard(self, cellIndex: int, directionIndices: List[int]) -> int:
+		blockerBitboard = 0
+
+		for directionIndex in directionIndices:
+			for rayCellIndex in self.cellRays[cellIndex][directionIndex][:-1]:
+				blockerBitboard |= 1 << rayCellIndex
+
+		return blockerBitboard
+
+	def getNearestCellIndex(self, directionIndex: int, bitboard: int) -> int:
+		if self.isRayDirectionIncreasing[directionIndex]:
+			return (bitboard & -bitboard).bit_length() - 1
+
+		return bitboard.bit_length() - 1
+
+	def onPieceAddedToCell(self, cellIndex: int, piece: Piece) -> None:
+		super().onPieceAddedToCell(cellIndex, piece)
+
+		cellBit = 1 << cellIndex
+		self.occupiedBitboard |= cellBit
+		self.teamBitboards[piece.teamIndex] |= cellBit
+
+		pieceKind = self.pieceTypeKinds[self.pieceSet.getTypeIdFromPiece(piece)]
+		if pieceKind > -1:
+			self.pieceKindBitboards[pieceKind] |= cellBit
+		else:
+			self.uncoveredPieceBitboard |= cellBit
+
+	def onPieceRemovedFromCell(self, cellIndex: int, piece: Piece) -> None:
+		super().onPieceRemovedFromCell(cellIndex, piece)
+
+		cellMask = ~(1 << cellIndex)
+		self.occupiedBitboard &= cellMask
+		self.teamBitboards[piece.teamIndex] &= cellMask
+
+		pieceKind = self.pieceTypeKinds[self.pieceSet.getTypeIdFromPiece(piece)]
+		if pieceKind > -1:
+			self.pieceKindBitboards[pieceKind] &= cellMask
+		else:
+			self.uncoveredPieceBitboard &= cellMask
+
+	def isCellEmpty(self, cellIndex: int) -> bool:
+		return not (self.occupiedBitboard >> cellIndex) & 1
+
+	def doesCellHaveOpponentPiece(self, cellIndex: int, teamIndex: int) -> bool:
+		return bool(((self.occupiedBitboard & ~self.teamBitboards[teamIndex]) >> cellIndex) & 1)
+
+	def getAllPieceIndices(self) -> List[int]:
+		return self.getCellIndicesFromBitboard(self.occupiedBitboard)
+
+	def getAllTeamPieceIndices(self, teamIndex: int) -> List[int]:
+		return self.getCellIndicesFromBitboard(self.teamBitboards[teamIndex])
+
+	def getAllOpponentTeamPieceIndices(self, teamIndex: int) -> List[int]:
+		return self.getCellIndicesFromBitboard(self.occupiedBitboard & ~self.teamBitboards[teamIndex])
+
+	def getAllKingIndices(self, teamIndex: int = -1) -> List[int]:
+		bitboard = self.pieceKindBitboards[self.KingKind]
+		if teamIndex > -1:
+			bitboard &= self.teamBitboards[teamIndex]
+
+		return self.getCellIndicesFromBitboard(bitboard)
+
+	def getAllRookIndices(self, teamIndex: int = -1) -> List[int]:
+		bitboard = self.pieceKindBitboards[self.RookKind]
+		if teamIndex > -1:
+			bitboard &= self.teamBitboards[teamIndex]
+
+		return self.getCellIndicesFromBitboard(bitboard)
+
+	# Cells reached along the ray directions, up to and including the first occupied cell of each ray.
+	def getRayAttackBitboard(self, cellIndex: int, directionIndices: List[int], occupiedBitboard: int) -> int:
+		attackBitboard = 0
+
+		for directionIndex in directionIndices:
+			rayBitboard = self.rayBitboards[directionIndex][cellIndex]
+
+			blockerBitboard = rayBitboard & occupiedBitboard
+			if blockerBitboard:
+				rayBitboard ^= self.rayBitboards[directionIndex][self.getNearestCellIndex(directionIndex, blockerBitboard)]
+
+			attackBitboard |= rayBitboard
+
+		return attackBitboard
+
+	def getOrthogonalAttackBitboard(self, cellIndex: int, occupiedBitboard: int) -> int:
+		blockerBitboard = occupiedBitboard & self.orthogonalBlockerBitboards[cellIndex]
+		attackTable = self.orthogonalAttackTables[cellIndex]
+
+		attackBitboard = attackTable.get(blockerBitboard, -1)
+		if attackBitboard < 0:
+			attackBitboard = self.getRayAttackBitboard(cellIndex, self.orthogonalDirectionIndices, blockerBitboard)
+			attackTable[blockerBitboard] = attackBitboard
+
+		return attackBitboard
+
+	def getDiagonalAttackBitboard(self, cellIndex: int, occupiedBitboard: int) -> int:
+		blockerBitboard = occupiedBitboard & self.diagonalBlockerBitboards[cellIndex]
+		attackTable = self.diagonalAttackTables[cellIndex]
+
+		attackBitboard = attackTable.get(blockerBitboard, -1)
+		if attackBitboard < 0:
+			attackBitboard = self.getRayAttackBitboard(cellIndex, self.diagonalDirectionIndices, blockerBitboard)
+			attackTable[blockerBitboard] = attackBitboard
+
+		return attackBitboard
+
+	def getOrthogonalSliderBitboard(self) -> int:
+		return self.pieceKindBitboards[self.RookKind] | self.pieceKindBitboards[self.QueenKind]
+
+	def getDiagonalSliderBitboard(self) -> int:
+		return self.pieceKindBitboards[self.BishopKind] | self.pieceKindBitboards[self.QueenKind]
+
+	# Opponent pieces attacking a cell, as seen by a team, treating the piece at ignoredCellIndex as absent.
+	def getCellAttackerBitboard(self, cellIndex: int, teamIndex: int, ignoredCellIndex: int = -1) -> int:
+		occupiedBitboard = self.occupiedBitboard
+		if ignoredCellIndex > -1:
+			occupiedBitboard &= ~(1 << ignoredCellIndex)
+
+		opponentBitboard = occupiedBitboard & ~self.teamBitboards[teamIndex]
+		pieceKindBitboards = self.pieceKindBitboards
+
+		attackerBitboard = (self.knightAttackBitboards[cellIndex] & pieceKindBitboards[self.KnightKind]) | (self.kingAttackBitboards[cellIndex] & pieceKindBitboards[self.KingKind]) | (self.pawnAttackBitboards[teamIndex][cellIndex] & pieceKindBitboards[self.PawnKind])
+
+		orthogonalSliderBitboard = opponentBitboard & self.getOrthogonalSliderBitboard()
+		if orthogonalSliderBitboard:
+			attackerBitboard |= self.getOrthogonalAttackBitboard(cellIndex, occupiedBitboard) & orthogonalSliderBitboard
+
+		diagonalSliderBitboard = opponentBitboard & self.getDiagonalSliderBitboard()
+		if diagonalSliderBitboard:
+			attackerBitboard |= self.getDiagonalAttackBitboard(cellIndex, occupiedBitboard) & diagonalSliderBitboard
+
+		return attackerBitboard & opponentBitboard
+
+	def getCellAttackerIndices(self, cellIndex: int, teamIndex: int, ignoredCellIndex: int = -1, findFirstOnly: bool = False) -> List[int]:
+		if self.uncoveredPieceBitboard:
+			return super().getCellAttackerIndices(cellIndex, teamIndex, ignoredCellIndex, findFirstOnly)
+
+		attackerCellIndices = self.getCellIndicesFromBitboard(self.getCellAttackerBitboard(cellIndex, teamIndex, ignoredCellIndex))
+		if findFirstOnly:
+			return attackerCellIndices[:1]
+
+		return attackerCellIndices
+
+	def isCellAttacked(self, cellIndex: int, teamIndex: int, ignoredCellIndex: int = -1) -> bool:
+		if self.uncoveredPieceBitboard:
+			return super().isCellAttacked(cellIndex, teamIndex, ignoredCellIndex)
+
+		return self.getCellAttackerBitboard(cellIndex, teamIndex, ignoredCellIndex) != 0
+
+	def createCheckInfo(self, kingCellIndex: int, teamIndex: int) -> ChessCheckInfo:
+		if self.uncoveredPieceBitboard:
+			return super().createCheckInfo(kingCellIndex, teamIndex)
+
+		checkInfo = BitboardChessCheckInfo(kingCellIndex)
+
+		checkerBitboard = self.getCellAttackerBitboard(kingCellIndex, teamIndex)
+		checkBlockBitboard = checkerBitboard
+
+		teamBitboard = self.teamBitboards[teamIndex]
+		opponentBitboard = self.occupiedBitboard & ~teamBitboard
+
+		# Look along each ray from the king for its nearest piece: an opponent slider checks,
+		# an own piece with an opponent slider behind it is pinned.
+		for (directionIndices, sliderBitboard) in [(self.orthogonalDirectionIndices, self.getOrthogonalSliderBitboard()), (self.diagonalDirectionIndices, self.getDiagonalSliderBitboard())]:
+			sliderBitboard &= opponentBitboard
+			if not sliderBitboard:
+				continue
+
+			for directionIndex in directionIndices:
+				rayBitboards = self.rayBitboards[directionIndex]
+				rayBitboard = rayBitboards[kingCellIndex]
+				if not rayBitboard & sliderBitboard:
+					continue
+
+				blockerBitboard = rayBitboard & self.occupiedBitboard
+				nearestCellIndex = self.getNearestCellIndex(directionIndex, blockerBitboard)
+				nearestCellBit = 1 << nearestCellIndex
+
+				if nearestCellBit & sliderBitboard:
+					checkBlockBitboard |= rayBitboard ^ rayBitboards[nearestCellIndex]
+					continue
+
+				if not nearestCellBit & teamBitboard:
+					continue
+
+				blockerBitboard ^= nearestCellBit
+				if not blockerBitboard:
+					continue
+
+				pinnerCellIndex = self.getNearestCellIndex(directionIndex, blockerBitboard)
+				if (1 << pinnerCellIndex) & sliderBitboard:
+					checkInfo.pinRayBitboards[nearestCellIndex] = rayBitboard ^ rayBitboards[pinnerCellIndex]
+
+		checkInfo.checkerCellIndices = self.getCellIndicesFromBitboard(checkerBitboard)
+		checkInfo.checkBlockBitboard = checkBlockBitboard
+		checkInfo.checkBlockCellIndices = set(self.getCellIndicesFromBitboard(checkBlockBitboard))
+		for (pinnedCellIndex, pinRayBitboard) in checkInfo.pinRayBitboards.items():
+			checkInfo.pinRayCellIndices[pinnedCellIndex] = set(self.getCellIndicesFromBitboard(pinRayBitboard))
+
+		return checkInfo
+
+	# Target cells of a piece other than the king, before accounting for checks and pins (and leaving out en passant).
+	def getPieceTargetBitboard(self, cellIndex: int, pieceKind: int, teamIndex: int, capturesOnly: bool) -> int:
+		occupiedBitboard = self.occupiedBitboard
+		teamBitboard = self.teamBitboards[teamIndex]
+		opponentBitboard = occupiedBitboard & ~teamBitboard
+
+		if pieceKind == self.PawnKind:
+			targetBitboard = self.pawnAttackBitboards[teamIndex][cellIndex] & opponentBitboard
+			pushBitboard = self.pawnPushBitboards[teamIndex][cellIndex] & ~occupiedBitboard
+
+			if capturesOnly:
+				return targetBitboard | (pushBitboard & self.pawnPromotionBitboards[teamIndex])
+
+			if pushBitboard:
+				targetBitboard |= pushBitboard | (self.pawnDoublePushBitboards[teamIndex][cellIndex] & ~occupiedBitboard)
+
+			return targetBitboard
+
+		if pieceKind == self.KnightKind:
+			targetBitboard = self.knightAttackBitboards[cellIndex]
+		elif pieceKind == self.RookKind:
+			targetBitboard = self.getOrthogonalAttackBitboard(cellIndex, occupiedBitboard)
+		elif pieceKind == self.BishopKind:
+			targetBitboard = self.getDiagonalAttackBitboard(cellIndex, occupiedBitboard)
+		else:
+			targetBitboard = self.getOrthogonalAttackBitboard(cellIndex, occupiedBitboard) | self.getDiagonalAttackBitboard(cellIndex, occupiedBitboard)
+
+		return targetBitboard & (opponentBitboard if capturesOnly else ~teamBitboard)
+
+	# Boards without exactly one king per team, or with piece types the bitboard tables
+	# do not cover, are left to the cell list implementation.
+	def getLegalTargetCellIndices(self, cellIndex: int, piece: Piece, capturesOnly: bool) -> List[int]:
+		teamIndex = piece.teamIndex
+
+		checkInfo: BitboardChessCheckInfo = self.getCheckInfo(teamIndex)
+		if checkInfo is None or self.uncoveredPieceBitboard:
+			return super().getLegalTargetCellIndices(cellIndex, piece, capturesOnly)
+
+		numberOfCheckers = len(checkInfo.checkerCellIndices)
+
+		# The king cannot move into an attacked cell (looking through its current cell),
+		# nor castle out of check.
+		if cellIndex == checkInfo.kingCellIndex:
+			targetBitboard = self.kingAttackBitboards[cellIndex] & ~self.teamBitboards[teamIndex]
+			if capturesOnly:
+				targetBitboard &= self.occupiedBitboard
+
+			validTargetCellIndices = [targetCellIndex for targetCellIndex in self.getCellIndicesFromBitboard(targetBitboard) if not self.isCellAttacked(targetCellIndex, teamIndex, cellIndex)]
+			if not capturesOnly and numberOfCheckers == 0:
+				validTargetCellIndices += piece.getPossibleCastleTargetCellIndices(self, cellIndex)
+
+			return validTargetCellIndices
+
+		# Only the king can move out of a double check.
+		if numberOfCheckers > 1:
+			return []
+
+		pieceKind = self.pieceTypeKinds[self.pieceSet.getTypeIdFromPiece(piece)]
+
+		targetBitboard = self.getPieceTargetBitboard(cellIndex, pieceKind, teamIndex, capturesOnly)
+
+		pinRayBitboard = checkInfo.pinRayBitboards.get(cellIndex, 0)
+		if pinRayBitboard:
+			targetBitboard &= pinRayBitboard
+
+		if numberOfCheckers > 0:
+			targetBitboard &= checkInfo.checkBlockBitboard
+
+		validTargetCellIndices = self.getCellIndicesFromBitboard(targetBitboard)
+
+		# En passant can expose the king along the row of both pawns, so it is verified by making the move.
+		if pieceKind == self.PawnKind and self.enPassantCellIndex > -1 and (self.pawnAttackBitboards[teamIndex][cellIndex] >> self.enPassantCellIndex) & 1:
+			for specialTargetCellIndex in piece.getSpecialTargetCellIndices(self, cellIndex):
+				if not self.doesTargetCellPutTeamKingIntoCheck(cellIndex, specialTargetCellIndex, teamIndex):
+					validTargetCellIndices.append(specialTargetCellIndex)
+
+		return validTargetCellIndices
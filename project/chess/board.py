@@ -1,8 +1,11 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set
 from enum import Enum
+from collections import deque
 
 from chess.piece import Piece
 from chess.pieceSet import PieceSet
+from chess.boardMove import BoardMove, BoardUndoInfo
+from chess.pieceActionJournal import PieceActionJournal
 
 class BoardPieceActionType(Enum):
 	REMOVE_FROM_CELL = 0,
@@ -10,7 +13,21 @@ class BoardPieceActionType(Enum):
 	MOVE_TO_CELL = 2
 
 class Board:
-	def __init__(self, cellWidth: int, cellHeight: int, pieceSet):
+	RayDirections = [
+		[0, -1],
+		[1, 0],
+		[0, 1],
+		[-1, 0],
+		[-1, -1],
+		[1, -1],
+		[-1, 1],
+		[1, 1]
+	]
+
+	# The history of performed moves can be limited to its most recent maximumHistoryLength moves,
+	# older ones being dropped, or appended to historyArchiveFilename (see PieceActionJournal).
+	# Moves dropped from memory can no longer be unmade, which also bounds the undo stack.
+	def __init__(self, cellWidth: int, cellHeight: int, pieceSet, maximumHistoryLength: int = -1, historyArchiveFilename: str = None):
 		self.cellWidth = cellWidth
 		self.cellHeight = cellHeight
 
@@ -19,7 +36,17 @@ class Board:
 
 		self.pieceSet: PieceSet = pieceSet
 
-		self.pieceActionHistory: list[dict] = []
+		self.pieceActionHistory = PieceActionJournal(maximumHistoryLength, historyArchiveFilename)
+		self.undoInfoStack: deque[BoardUndoInfo] = deque()
+
+		# Cell indices of the pieces on the board, per team index, and per team index & piece type id.
+		self.teamPieceCellIndices: dict[int, set[int]] = {}
+		self.teamPieceTypeCellIndices: dict[int, list[set[int]]] = {}
+
+		# Geometry lookup tables, built once for this board size.
+		# cellRays[cellIndex][rayDirectionIndex] lists the cells up to the board edge.
+		self.oppositeRayDirectionIndices = [self.RayDirections.index([-direction[0], -direction[1]]) for direction in self.RayDirections]
+		self.cellRays: list[list[list[int]]] = [[self.createCellRay(cellIndex, direction) for direction in self.RayDirections] for cellIndex in range(numberOfCells)]
 
 	def getNumberOfCells(self) -> int:
 		return self.cellWidth * self.cellHeight
@@ -27,7 +54,7 @@ class Board:
 	def getCellCoordinatesFromIndex(self, cellIndex: int) -> List[int]:
 		return [
 			int(cellIndex % self.cellWidth),
-			int(cellIndex / self.cellHeight)
+			int(cellIndex // self.cellWidth)
 		]
 
 	def getCellIndexFromCoordinates(self, cellCoordinates: List[int]) -> int:
@@ -48,15 +75,84 @@ class Board:
 		
 		return True
 
+	def createCellRay(self, cellIndex: int, direction: List[int]) -> List[int]:
+		rayCellIndices: list[int] = []
+
+		cellCoordinates = self.getCellCoordinatesFromIndex(cellIndex)
+		while True:
+			cellCoordinates[0] += direction[0]
+			cellCoordinates[1] += direction[1]
+			if not self.areCellCoordinatesOnBoard(cellCoordinates):
+				break
+
+			rayCellIndices.append(self.getCellIndexFromCoordinates(cellCoordinates))
+
+		return rayCellIndices
+
+	# Returns, for every cell, the cells reached by each of the offsets that are on the board.
+	def createOffsetTable(self, offsets: List[List[int]]) -> List[List[int]]:
+		offsetTable: list[list[int]] = []
+
+		for cellIndex in range(self.getNumberOfCells()):
+			cellCoordinates = self.getCellCoordinatesFromIndex(cellIndex)
+
+			offsetCellIndices: list[int] = []
+			for offset in offsets:
+				offsetCellCoordinates = [cellCoordinates[0] + offset[0], cellCoordinates[1] + offset[1]]
+				if self.areCellCoordinatesOnBoard(offsetCellCoordinates):
+					offsetCellIndices.append(self.getCellIndexFromCoordinates(offsetCellCoordinates))
+
+			offsetTable.append(offsetCellIndices)
+
+		return offsetTable
+
 	def getCellContents(self, cellIndex: int):
 		return self.cellContents[cellIndex]
 	
 	def setCellContents(self, cellIndex: int, cellContents: List) -> None:
+		for piece in self.cellContents[cellIndex]:
+			self.onPieceRemovedFromCell(cellIndex, piece)
+
 		self.cellContents[cellIndex] = cellContents
 
+		for piece in cellContents:
+			self.onPieceAddedToCell(cellIndex, piece)
+
 	def clearCellContents(self, cellIndex: int) -> None:
+		for piece in self.cellContents[cellIndex]:
+			self.onPieceRemovedFromCell(cellIndex, piece)
+
 		self.cellContents[cellIndex].clear()
 
+	# All changes to cell contents go through setCellContents and clearCellContents,
+	# so derived boards can keep their own indices in sync by overriding these.
+	def onPieceAddedToCell(self, cellIndex: int, piece: Piece) -> None:
+		teamIndex = piece.teamIndex
+		if teamIndex not in self.teamPieceCellIndices:
+			self.teamPieceCellIndices[teamIndex] = set()
+			self.teamPieceTypeCellIndices[teamIndex] = [set() for pieceType in self.pieceSet.pieceTypes]
+
+		self.teamPieceCellIndices[teamIndex].add(cellIndex)
+		self.teamPieceTypeCellIndices[teamIndex][self.pieceSet.getTypeIdFromPiece(piece)].add(cellIndex)
+
+	def onPieceRemovedFromCell(self, cellIndex: int, piece: Piece) -> None:
+		teamIndex = piece.teamIndex
+		self.teamPieceCellIndices[teamIndex].discard(cellIndex)
+		self.teamPieceTypeCellIndices[teamIndex][self.pieceSet.getTypeIdFromPiece(piece)].discard(cellIndex)
+
+	def getTeamIndices(self) -> List[int]:
+		return sorted(self.teamPieceCellIndices.keys())
+
+	def getTeamPieceCellIndices(self, teamIndex: int) -> Set[int]:
+		return self.teamPieceCellIndices.get(teamIndex, set())
+
+	def getTeamPieceTypeCellIndices(self, teamIndex: int, pieceTypeId: int) -> Set[int]:
+		teamPieceTypeCellIndices = self.teamPieceTypeCellIndices.get(teamIndex, None)
+		if teamPieceTypeCellIndices is None:
+			return set()
+
+		return teamPieceTypeCellIndices[pieceTypeId]
+
 	#def addPieceToCell(self, cellIndex: int, piece) -> None:
 	#	self.cellContents[cellIndex].append(piece)
 
@@ -99,6 +195,18 @@ class Board:
 				x += 1
 			y += 1
 
+	# Drops the moves made so far, eg once the whole position got replaced.
+	def clearHistory(self) -> None:
+		self.undoInfoStack.clear()
+		self.pieceActionHistory.clear()
+
+	def loadFromBoard(self, board) -> None:
+		for cellIndex in range(self.getNumberOfCells()):
+			piece = board.getPieceFromCell(cellIndex)
+			self.setCellContents(cellIndex, [] if piece is None else [piece.copy()])
+
+		self.pieceActionHistory = board.pieceActionHistory.copy()
+
 	def getStringRowList(self) -> List[str]:
 		stringRows: List[str] = []
 		
@@ -236,6 +344,33 @@ class Board:
 
 		return pieceActions
 	
+	def getPieceActionsFromMove(self, move: BoardMove) -> List[dict]:
+		if move is None:
+			return []
+
+		pieceActions: list[dict] = []
+
+		if move.captureCellIndex > -1 and move.captureCellIndex != move.toCellIndex:
+			pieceActions += self.getRemovePieceActions(move.captureCellIndex)
+
+		if move.secondaryFromCellIndex > -1:
+			pieceActions += self.getMovePieceActions(move.secondaryFromCellIndex, move.secondaryToCellIndex)
+
+		pieceActions += self.getMovePieceActions(move.fromCellIndex, move.toCellIndex)
+
+		if move.promotionPieceTypeId > -1:
+			movedPiece = self.getPieceFromCell(move.fromCellIndex)
+
+			pieceActions += self.getRemovePieceActions(move.toCellIndex, self.pieceSet.getTypeIdFromPiece(movedPiece))
+			
+			pieceAttributes = {
+				"teamIndex": movedPiece.teamIndex
+			}
+
+			pieceActions += self.getAddPieceActions(move.toCellIndex, move.promotionPieceTypeId, pieceAttributes)
+
+		return pieceActions
+
 	def getPieceActionsFromTargetCell(self, activeCellIndex: int, targetCellIndex: int) -> List[dict]:
 		piece = self.getPieceFromCell(activeCellIndex)
 		if piece is not None:
@@ -243,18 +378,105 @@ class Board:
 
 		return []
 
+	def createMove(self, fromCellIndex: int, toCellIndex: int) -> BoardMove:
+		captureCellIndex = -1 if self.isCellEmpty(toCellIndex) else toCellIndex
+		return BoardMove(fromCellIndex, toCellIndex, captureCellIndex = captureCellIndex)
+
+	def getMoveFromTargetCell(self, activeCellIndex: int, targetCellIndex: int) -> BoardMove:
+		piece = self.getPieceFromCell(activeCellIndex)
+		if piece is not None:
+			return piece.getMoveFromTargetCell(self, activeCellIndex, targetCellIndex)
+
+		return None
+
+	def getLastMove(self) -> BoardMove:
+		if len(self.undoInfoStack) == 0:
+			return None
+
+		return self.undoInfoStack[-1].move
+
+	def createUndoInfo(self, move: BoardMove) -> BoardUndoInfo:
+		return BoardUndoInfo(move)
+
+	# Applies a move in place, moving the existing piece objects, and pushes
+	# the information needed to revert it with unmakeMove.
+	def makeMove(self, move: BoardMove) -> BoardUndoInfo:
+		undoInfo = self.createUndoInfo(move)
+
+		if move.captureCellIndex > -1:
+			undoInfo.capturedPiece = self.getPieceFromCell(move.captureCellIndex)
+			self.clearCellContents(move.captureCellIndex)
+
+		if move.secondaryFromCellIndex > -1:
+			secondaryPiece = self.getPieceFromCell(move.secondaryFromCellIndex)
+			self.clearCellContents(move.secondaryFromCellIndex)
+			secondaryPiece.moveCount += 1
+			self.setCellContents(move.secondaryToCellIndex, [secondaryPiece])
+
+		movedPiece = self.getPieceFromCell(move.fromCellIndex)
+		self.clearCellContents(move.fromCellIndex)
+		movedPiece.moveCount += 1
+		undoInfo.movedPiece = movedPiece
+
+		if move.promotionPieceTypeId > -1:
+			promotedPiece = self.pieceSet.createPieceFromTypeId(move.promotionPieceTypeId)
+			promotedPiece.teamIndex = movedPiece.teamIndex
+			self.setCellContents(move.toCellIndex, [promotedPiece])
+		else:
+			self.setCellContents(move.toCellIndex, [movedPiece])
+
+		self.undoInfoStack.append(undoInfo)
+
+		return undoInfo
+
+	def unmakeMove(self, undoInfo: BoardUndoInfo = None) -> int:
+		if len(self.undoInfoStack) == 0:
+			print("Board::unmakeMove - Undo stack is empty")
+			return -1
+
+		if undoInfo is not None and undoInfo is not self.undoInfoStack[-1]:
+			print("Board::unmakeMove - Can only unmake the last made move")
+			return -1
+
+		undoInfo = self.undoInfoStack.pop()
+		move = undoInfo.move
+
+		movedPiece = undoInfo.movedPiece
+		self.clearCellContents(move.toCellIndex)
+		movedPiece.moveCount -= 1
+		self.setCellContents(move.fromCellIndex, [movedPiece])
+
+		if move.secondaryFromCellIndex > -1:
+			secondaryPiece = self.getPieceFromCell(move.secondaryToCellIndex)
+			self.clearCellContents(move.secondaryToCellIndex)
+			secondaryPiece.moveCount -= 1
+			self.setCellContents(move.secondaryFromCellIndex, [secondaryPiece])
+
+		if undoInfo.capturedPiece is not None:
+			self.setCellContents(move.captureCellIndex, [undoInfo.capturedPiece])
+
+		return 0
+
 	def performPieceAction(self, activeCellIndex: int, targetCellIndex: int) -> List[dict]:
-		pieceActions = self.getPieceActionsFromTargetCell(activeCellIndex, targetCellIndex)
-	
-		self.executePieceActions(pieceActions)
+		move = self.getMoveFromTargetCell(activeCellIndex, targetCellIndex)
+		if move is None:
+			return []
+
+		# Piece actions are still produced to describe the move to observers.
+		pieceActions = self.getPieceActionsFromMove(move)
+
+		self.makeMove(move)
+
+		self.pieceActionHistory.push(pieceActions)
 
-		self.pieceActionHistory += pieceActions
+		maximumHistoryLength = self.pieceActionHistory.maximumLength
+		if maximumHistoryLength > -1 and len(self.undoInfoStack) > maximumHistoryLength:
+			self.undoInfoStack.popleft()
 
 		return pieceActions
 
 	def rollbackPieceActions(self, pieceActions: List[dict]) -> None:
-		# Reverse temporary move to restore board state.
-		self.reversePieceActions(pieceActions)
-		self.executePieceActions(pieceActions)
+		# Unmake temporary move to restore board state.
+		self.unmakeMove()
 
-		self.pieceActionHistory = self.pieceActionHistory[:len(self.pieceActionHistory) - len(pieceActions)]
+		self.pieceActionHistory.pop()
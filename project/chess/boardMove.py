@@ -0,0 +1,38 @@
+from chess.piece import Piece
+
+# Compact record of a single move, from which the board can apply and revert
+# the move directly, without building piece action dicts.
+# targetCellIndex is the cell selected to perform the move, which can differ
+# from toCellIndex (eg a king castles by selecting its rook's cell).
+class BoardMove:
+	__slots__ = (
+		"fromCellIndex",
+		"toCellIndex",
+		"targetCellIndex",
+		"captureCellIndex",
+		"secondaryFromCellIndex",
+		"secondaryToCellIndex",
+		"promotionPieceTypeId"
+	)
+
+	def __init__(self, fromCellIndex: int, toCellIndex: int, targetCellIndex: int = -1, captureCellIndex: int = -1, secondaryFromCellIndex: int = -1, secondaryToCellIndex: int = -1, promotionPieceTypeId: int = -1):
+		self.fromCellIndex = fromCellIndex
+		self.toCellIndex = toCellIndex
+		self.targetCellIndex = toCellIndex if targetCellIndex < 0 else targetCellIndex
+		self.captureCellIndex = captureCellIndex
+		self.secondaryFromCellIndex = secondaryFromCellIndex
+		self.secondaryToCellIndex = secondaryToCellIndex
+		self.promotionPieceTypeId = promotionPieceTypeId
+
+# Everything needed to revert a BoardMove, kept on the board's undo stack.
+class BoardUndoInfo:
+	__slots__ = (
+		"move",
+		"movedPiece",
+		"capturedPiece"
+	)
+
+	def __init__(self, move: BoardMove):
+		self.move = move
+		self.movedPiece: Piece = None
+		self.capturedPiece: Piece = None
@@ -2,7 +2,12 @@ from typing import Dict, List, Set
 from enum import Enum
 
 from chess.board import Board, BoardPieceActionType
+from chess.piece import Piece
+from chess.boardMove import BoardMove, BoardUndoInfo
 import chess.chessPieceSet
+import chess.zobristKeys
+import chess.chessEvaluator
+import chess.pawnChessPiece
 import chess.rookChessPiece
 import chess.kingChessPiece
 
@@ -11,9 +16,450 @@ class ChessEndGameCondition(Enum):
 	CHECKMATE = 0
 	STALEMATE = 1
 
+# Checking pieces and pins against a team's king, for one board position.
+class ChessCheckInfo:
+	__slots__ = (
+		"kingCellIndex",
+		"checkerCellIndices",
+		"checkBlockCellIndices",
+		"pinRayCellIndices"
+	)
+
+	def __init__(self, kingCellIndex: int):
+		self.kingCellIndex = kingCellIndex
+
+		self.checkerCellIndices: list[int] = []
+
+		# Cells which resolve a single check, when moved into (capture or block).
+		self.checkBlockCellIndices: set[int] = set()
+
+		# Pinned piece cell index -> cells it can move to without exposing the king.
+		self.pinRayCellIndices: dict[int, set[int]] = {}
+
+# Undo information extended with the chess specific position state.
+class ChessBoardUndoInfo(BoardUndoInfo):
+	__slots__ = (
+		"previousTurnTeamIndex",
+		"previousEnPassantCellIndex",
+		"previousHalfMoveClock",
+		"previousFullMoveNumber"
+	)
+
+	def __init__(self, move: BoardMove, previousTurnTeamIndex: int, previousEnPassantCellIndex: int, previousHalfMoveClock: int, previousFullMoveNumber: int):
+		super().__init__(move)
+		self.previousTurnTeamIndex = previousTurnTeamIndex
+		self.previousEnPassantCellIndex = previousEnPassantCellIndex
+		self.previousHalfMoveClock = previousHalfMoveClock
+		self.previousFullMoveNumber = previousFullMoveNumber
+
 class ChessBoard(Board):
-	def __init__(self):
-		super().__init__(8, 8, chess.chessPieceSet.ChessPieceSet())
+	NumberOfTeams = 2
+
+	StartingFen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+	# Shared by all chess boards, so that equal positions hash equally across boards.
+	zobristKeys: chess.zobristKeys.ZobristKeys = None
+
+	def __init__(self, maximumHistoryLength: int = -1, historyArchiveFilename: str = None):
+		super().__init__(8, 8, chess.chessPieceSet.ChessPieceSet(), maximumHistoryLength, historyArchiveFilename)
+
+		if ChessBoard.zobristKeys is None:
+			ChessBoard.zobristKeys = chess.zobristKeys.ZobristKeys(self.NumberOfTeams, len(self.pieceSet.pieceTypes), self.getNumberOfCells())
+
+		# Zobrist hash of piece placement, castling rights, team to move and en passant cell, updated incrementally.
+		self.hash = 0
+
+		# Castling rights enter the hash through the cells of the rooks which can still castle,
+		# so that a position hashes the same however its kings and rooks got there (eg loaded from FEN).
+		# They are recomputed when the hash is next read, after kings or rooks changed.
+		self.castlingHashKey = 0
+		self.isCastlingHashKeyOutdated = False
+
+		self.turnTeamIndex = 0
+
+		# Cell a pawn can move into to capture en passant, -1 if none.
+		# It only enters the hash when a capture is actually possible (enPassantHashKey).
+		self.enPassantCellIndex = -1
+		self.enPassantHashKey = 0
+
+		# Moves since the last capture or pawn move (for the fifty-move rule), and number of the current full move.
+		self.halfMoveClock = 0
+		self.fullMoveNumber = 1
+
+		# Destination cells of every jumping piece type and of the king, per cell.
+		self.pieceOffsetTables: dict[type, list[list[int]]] = {}
+		for pieceType in self.pieceSet.pieceTypes:
+			if len(pieceType.moveOffsets) > 0:
+				self.pieceOffsetTables[pieceType] = self.createOffsetTable(pieceType.moveOffsets)
+
+		self.kingMoveCellIndices = self.createOffsetTable(chess.kingChessPiece.KingChessPiece.moveDirections)
+
+		# All the distinct jumps of the piece set, for looking up attackers.
+		attackOffsets: list[list[int]] = []
+		for pieceType in self.pieceSet.pieceTypes:
+			for attackOffset in pieceType.moveOffsets:
+				if attackOffset not in attackOffsets:
+					attackOffsets.append(attackOffset)
+
+		# attackOffsetCells[cellIndex] lists the (attacker cell index, jump offset) pairs reaching the cell.
+		self.attackOffsetCells: list[list[tuple]] = []
+		for cellIndex in range(self.getNumberOfCells()):
+			cellCoordinates = self.getCellCoordinatesFromIndex(cellIndex)
+
+			offsetCells: list[tuple] = []
+			for attackOffset in attackOffsets:
+				attackerCellCoordinates = [cellCoordinates[0] - attackOffset[0], cellCoordinates[1] - attackOffset[1]]
+				if self.areCellCoordinatesOnBoard(attackerCellCoordinates):
+					offsetCells.append((self.getCellIndexFromCoordinates(attackerCellCoordinates), attackOffset))
+
+			self.attackOffsetCells.append(offsetCells)
+
+		# Piece type ids (including derived piece types) looked up through the piece lists.
+		self.kingPieceTypeIds = self.getPieceTypeIdsFromBaseType(chess.kingChessPiece.KingChessPiece)
+		self.rookPieceTypeIds = self.getPieceTypeIdsFromBaseType(chess.rookChessPiece.RookChessPiece)
+		self.pawnPieceTypeIds = self.getPieceTypeIdsFromBaseType(chess.pawnChessPiece.PawnChessPiece)
+		self.castlingPieceTypeIds = self.kingPieceTypeIds + self.rookPieceTypeIds
+
+		self.horizontalRayDirectionIndices = [self.RayDirections.index(direction) for direction in [[-1, 0], [1, 0]]]
+
+		self.evaluator = chess.chessEvaluator.ChessEvaluator(self)
+
+		self.checkInfos: dict[int, ChessCheckInfo] = {}
+
+	def getPieceTypeIdsFromBaseType(self, basePieceType: type) -> List[int]:
+		return [self.pieceSet.getTypeIdFromPieceType(pieceType) for pieceType in self.pieceSet.pieceTypes if issubclass(pieceType, basePieceType)]
+
+	def onPieceAddedToCell(self, cellIndex: int, piece: Piece) -> None:
+		super().onPieceAddedToCell(cellIndex, piece)
+
+		self.hash ^= self.getPieceHashKey(cellIndex, piece)
+		self.evaluator.onPieceAddedToCell(cellIndex, piece)
+		self.checkInfos.clear()
+
+		if self.pieceSet.getTypeIdFromPiece(piece) in self.castlingPieceTypeIds:
+			self.isCastlingHashKeyOutdated = True
+
+	def onPieceRemovedFromCell(self, cellIndex: int, piece: Piece) -> None:
+		super().onPieceRemovedFromCell(cellIndex, piece)
+
+		self.hash ^= self.getPieceHashKey(cellIndex, piece)
+		self.evaluator.onPieceRemovedFromCell(cellIndex, piece)
+		self.checkInfos.clear()
+
+		if self.pieceSet.getTypeIdFromPiece(piece) in self.castlingPieceTypeIds:
+			self.isCastlingHashKeyOutdated = True
+
+	def getPieceHashKey(self, cellIndex: int, piece: Piece) -> int:
+		return self.zobristKeys.pieceKeys[piece.teamIndex][self.pieceSet.getTypeIdFromPiece(piece)][cellIndex]
+
+	def getCastlingHashKey(self) -> int:
+		castlingHashKey = 0
+
+		for rookCellIndex in self.getCastlingRookCellIndices():
+			castlingHashKey ^= self.zobristKeys.castlingKeys[rookCellIndex]
+
+		return castlingHashKey
+
+	def getHash(self) -> int:
+		if self.isCastlingHashKeyOutdated:
+			castlingHashKey = self.getCastlingHashKey()
+			self.hash ^= self.castlingHashKey ^ castlingHashKey
+			self.castlingHashKey = castlingHashKey
+			self.isCastlingHashKeyOutdated = False
+
+		return self.hash
+
+	def computeHash(self) -> int:
+		positionHash = self.zobristKeys.turnKeys[self.turnTeamIndex] ^ self.getEnPassantHashKey(self.enPassantCellIndex) ^ self.getCastlingHashKey()
+
+		for cellIndex in self.getAllPieceIndices():
+			positionHash ^= self.getPieceHashKey(cellIndex, self.getPieceFromCell(cellIndex))
+
+		return positionHash
+
+	def setTurnTeamIndex(self, teamIndex: int) -> None:
+		self.hash ^= self.zobristKeys.turnKeys[self.turnTeamIndex] ^ self.zobristKeys.turnKeys[teamIndex]
+		self.turnTeamIndex = teamIndex
+
+	def getNextTurnTeamIndex(self, teamIndex: int) -> int:
+		return (teamIndex + 1) % self.NumberOfTeams
+
+	def setEnPassantCellIndex(self, cellIndex: int) -> None:
+		enPassantHashKey = self.getEnPassantHashKey(cellIndex)
+		self.hash ^= self.enPassantHashKey ^ enPassantHashKey
+
+		self.enPassantCellIndex = cellIndex
+		self.enPassantHashKey = enPassantHashKey
+
+	def getEnPassantHashKey(self, cellIndex: int) -> int:
+		if cellIndex < 0 or not self.isEnPassantCapturePossible(cellIndex):
+			return 0
+
+		return self.zobristKeys.enPassantKeys[cellIndex]
+
+	# Whether an opponent pawn stands next to the pawn which skipped the cell.
+	def isEnPassantCapturePossible(self, cellIndex: int) -> bool:
+		cellRays = self.cellRays[cellIndex]
+
+		for pawnTeamIndex in range(self.NumberOfTeams):
+			forwardRayCellIndices = cellRays[chess.pawnChessPiece.PawnChessPiece.forwardDirectionIndices[pawnTeamIndex]]
+			if len(forwardRayCellIndices) == 0:
+				continue
+
+			pawnCellIndex = forwardRayCellIndices[0]
+			pawn = self.getPieceFromCell(pawnCellIndex)
+			if pawn is None or pawn.teamIndex != pawnTeamIndex or self.pieceSet.getTypeIdFromPiece(pawn) not in self.pawnPieceTypeIds:
+				continue
+
+			for directionIndex in self.horizontalRayDirectionIndices:
+				sideRayCellIndices = self.cellRays[pawnCellIndex][directionIndex]
+				if len(sideRayCellIndices) == 0:
+					continue
+
+				sidePiece = self.getPieceFromCell(sideRayCellIndices[0])
+				if sidePiece is not None and sidePiece.teamIndex != pawnTeamIndex and self.pieceSet.getTypeIdFromPiece(sidePiece) in self.pawnPieceTypeIds:
+					return True
+
+		return False
+
+	def getCellNameFromIndex(self, cellIndex: int) -> str:
+		cellCoordinates = self.getCellCoordinatesFromIndex(cellIndex)
+		return chr(ord('a') + cellCoordinates[0]) + str(self.cellHeight - cellCoordinates[1])
+
+	def getCellIndexFromName(self, cellName: str) -> int:
+		cellCoordinates = [ord(cellName[0]) - ord('a'), self.cellHeight - int(cellName[1:])]
+		if not self.areCellCoordinatesOnBoard(cellCoordinates):
+			return -1
+
+		return self.getCellIndexFromCoordinates(cellCoordinates)
+
+	def getHomeRow(self, teamIndex: int) -> int:
+		return self.cellHeight - 1 if teamIndex == 0 else 0
+
+	# Castling rights follow from kings and rooks not having moved yet.
+	# Applies rights given as in FEN ("KQkq", or "-" for none), by setting
+	# the move counts of the kings and corner rooks accordingly.
+	def setCastlingRights(self, castlingRights: str) -> None:
+		for teamIndex in range(self.NumberOfTeams):
+			homeRow = self.getHomeRow(teamIndex)
+			castlingCharacters = ['K', 'Q'] if teamIndex == 0 else ['k', 'q']
+			cornerColumns = [self.cellWidth - 1, 0]
+
+			for kingCellIndex in self.getAllKingIndices(teamIndex):
+				hasRights = self.getCellCoordinatesFromIndex(kingCellIndex)[1] == homeRow and any(castlingCharacter in castlingRights for castlingCharacter in castlingCharacters)
+				self.setPieceMoveCount(kingCellIndex, 0 if hasRights else 1)
+
+			for rookCellIndex in self.getAllRookIndices(teamIndex):
+				rookCellCoordinates = self.getCellCoordinatesFromIndex(rookCellIndex)
+				hasRights = False
+				if rookCellCoordinates[1] == homeRow:
+					for castlingCharacter, cornerColumn in zip(castlingCharacters, cornerColumns):
+						if castlingCharacter in castlingRights and rookCellCoordinates[0] == cornerColumn:
+							hasRights = True
+
+				self.setPieceMoveCount(rookCellIndex, 0 if hasRights else 1)
+
+	# Cells of the rooks which can still castle: unmoved, in a corner of the home row of their unmoved king.
+	# In the order of FEN castling rights (KQkq).
+	def getCastlingRookCellIndices(self) -> List[int]:
+		castlingRookCellIndices: list[int] = []
+
+		for teamIndex in range(self.NumberOfTeams):
+			homeRow = self.getHomeRow(teamIndex)
+
+			if not any(self.getPieceFromCell(kingCellIndex).moveCount == 0 and self.getCellCoordinatesFromIndex(kingCellIndex)[1] == homeRow for kingCellIndex in self.getAllKingIndices(teamIndex)):
+				continue
+
+			for cornerColumn in [self.cellWidth - 1, 0]:
+				rookCellIndex = self.getCellIndexFromCoordinates([cornerColumn, homeRow])
+				rook = self.getPieceFromCell(rookCellIndex)
+				if rook is not None and rook.teamIndex == teamIndex and rook.moveCount == 0 and self.pieceSet.getTypeIdFromPiece(rook) in self.rookPieceTypeIds:
+					castlingRookCellIndices.append(rookCellIndex)
+
+		return castlingRookCellIndices
+
+	# Castling rights as in FEN, from the kings and corner rooks which have not moved yet.
+	def getCastlingRights(self) -> str:
+		castlingRights = ""
+
+		for rookCellIndex in self.getCastlingRookCellIndices():
+			castlingCharacter = 'Q' if self.getCellCoordinatesFromIndex(rookCellIndex)[0] == 0 else 'K'
+			castlingRights += castlingCharacter if self.getPieceFromCell(rookCellIndex).teamIndex == 0 else castlingCharacter.lower()
+
+		return "-" if castlingRights == "" else castlingRights
+
+	def setPieceMoveCount(self, cellIndex: int, moveCount: int) -> None:
+		# Readd the piece, so that the hash and other derived state follow the move count.
+		piece = self.getPieceFromCell(cellIndex)
+		self.clearCellContents(cellIndex)
+		piece.moveCount = moveCount
+		self.setCellContents(cellIndex, [piece])
+
+	def loadFromBoard(self, board) -> None:
+		super().loadFromBoard(board)
+
+		self.setTurnTeamIndex(board.turnTeamIndex)
+		self.setEnPassantCellIndex(board.enPassantCellIndex)
+		self.halfMoveClock = board.halfMoveClock
+		self.fullMoveNumber = board.fullMoveNumber
+
+	# Replaces the whole position with one in Forsyth-Edwards Notation, dropping the history.
+	# The fields following the piece placement can be left out (first team to move,
+	# no castling rights nor en passant cell, move clocks at 0 and 1).
+	# The position is only changed once the whole FEN parsed successfully.
+	def loadFromFen(self, fen: str) -> int:
+		fields = fen.split()
+		if len(fields) < 1 or len(fields) > 6:
+			print("ChessBoard::loadFromFen - Invalid number of fields")
+			return -1
+
+		cellContents: list[list[Piece]] = []
+		x = 0
+		for character in fields[0]:
+			if character == '/':
+				if x != self.cellWidth:
+					print("ChessBoard::loadFromFen - Invalid row length")
+					return -1
+
+				x = 0
+				continue
+
+			if character.isdigit():
+				numberOfEmptyCells = int(character)
+				cellContents.extend([] for emptyCellIndex in range(numberOfEmptyCells))
+				x += numberOfEmptyCells
+			else:
+				piece = self.pieceSet.createPieceFromCharacter(character)
+				if piece is None:
+					print("ChessBoard::loadFromFen - Invalid piece character " + character)
+					return -1
+
+				cellContents.append([piece])
+				x += 1
+
+			if x > self.cellWidth:
+				print("ChessBoard::loadFromFen - Invalid row length")
+				return -1
+
+		if len(cellContents) != self.getNumberOfCells():
+			print("ChessBoard::loadFromFen - Invalid number of cells")
+			return -1
+
+		turnField = fields[1] if len(fields) > 1 else "w"
+		if turnField not in ["w", "b"]:
+			print("ChessBoard::loadFromFen - Invalid team to move " + turnField)
+			return -1
+
+		castlingRights = fields[2] if len(fields) > 2 else "-"
+		if castlingRights != "-" and any(character not in "KQkq" for character in castlingRights):
+			print("ChessBoard::loadFromFen - Invalid castling rights " + castlingRights)
+			return -1
+
+		enPassantCellName = fields[3] if len(fields) > 3 else "-"
+		enPassantCellIndex = -1
+		if enPassantCellName != "-":
+			if len(enPassantCellName) != 2 or not enPassantCellName[0].isalpha() or not enPassantCellName[1].isdigit():
+				print("ChessBoard::loadFromFen - Invalid en passant cell " + enPassantCellName)
+				return -1
+
+			enPassantCellIndex = self.getCellIndexFromName(enPassantCellName)
+			if enPassantCellIndex < 0:
+				print("ChessBoard::loadFromFen - Invalid en passant cell " + enPassantCellName)
+				return -1
+
+		moveClockFields = fields[4:] + ["0", "1"][len(fields[4:]):]
+		if not all(moveClockField.isdigit() for moveClockField in moveClockFields):
+			print("ChessBoard::loadFromFen - Invalid move clocks")
+			return -1
+
+		for cellIndex in range(self.getNumberOfCells()):
+			self.setCellContents(cellIndex, cellContents[cellIndex])
+
+		self.clearHistory()
+
+		self.setCastlingRights(castlingRights)
+		self.setTurnTeamIndex(0 if turnField == "w" else 1)
+		self.setEnPassantCellIndex(enPassantCellIndex)
+		self.halfMoveClock = int(moveClockFields[0])
+		self.fullMoveNumber = max(int(moveClockFields[1]), 1)
+
+		return 0
+
+	def toFen(self) -> str:
+		stringRows: list[str] = []
+
+		for y in range(self.cellHeight):
+			stringRow = ""
+			numberOfEmptyCells = 0
+			for x in range(self.cellWidth):
+				piece = self.getPieceFromCell(self.getCellIndexFromCoordinates([x, y]))
+				if piece is None:
+					numberOfEmptyCells += 1
+					continue
+
+				if numberOfEmptyCells > 0:
+					stringRow += str(numberOfEmptyCells)
+					numberOfEmptyCells = 0
+
+				stringRow += self.pieceSet.getCharacterFromPiece(piece)
+
+			if numberOfEmptyCells > 0:
+				stringRow += str(numberOfEmptyCells)
+
+			stringRows.append(stringRow)
+
+		return " ".join([
+			"/".join(stringRows),
+			"w" if self.turnTeamIndex == 0 else "b",
+			self.getCastlingRights(),
+			"-" if self.enPassantCellIndex < 0 else self.getCellNameFromIndex(self.enPassantCellIndex),
+			str(self.halfMoveClock),
+			str(self.fullMoveNumber)
+		])
+
+	def createUndoInfo(self, move: BoardMove) -> ChessBoardUndoInfo:
+		return ChessBoardUndoInfo(move, self.turnTeamIndex, self.enPassantCellIndex, self.halfMoveClock, self.fullMoveNumber)
+
+	# Besides moving pieces, passes the turn to the next team,
+	# records the cell skipped by a pawn advancing two cells and advances the move clocks.
+	def makeMove(self, move: BoardMove) -> ChessBoardUndoInfo:
+		undoInfo = super().makeMove(move)
+
+		movedPiece = undoInfo.movedPiece
+
+		enPassantCellIndex = -1
+		if abs(move.toCellIndex - move.fromCellIndex) == 2 * self.cellWidth and self.pieceSet.getTypeIdFromPiece(movedPiece) in self.pawnPieceTypeIds:
+			enPassantCellIndex = (move.fromCellIndex + move.toCellIndex) // 2
+
+		self.setEnPassantCellIndex(enPassantCellIndex)
+		self.setTurnTeamIndex(self.getNextTurnTeamIndex(movedPiece.teamIndex))
+
+		if undoInfo.capturedPiece is not None or self.pieceSet.getTypeIdFromPiece(movedPiece) in self.pawnPieceTypeIds:
+			self.halfMoveClock = 0
+		else:
+			self.halfMoveClock += 1
+
+		if movedPiece.teamIndex == self.NumberOfTeams - 1:
+			self.fullMoveNumber += 1
+
+		return undoInfo
+
+	def unmakeMove(self, undoInfo: ChessBoardUndoInfo = None) -> int:
+		if len(self.undoInfoStack) == 0:
+			return super().unmakeMove(undoInfo)
+
+		lastUndoInfo: ChessBoardUndoInfo = self.undoInfoStack[-1]
+
+		result = super().unmakeMove(undoInfo)
+		if result < 0:
+			return result
+
+		self.setEnPassantCellIndex(lastUndoInfo.previousEnPassantCellIndex)
+		self.setTurnTeamIndex(lastUndoInfo.previousTurnTeamIndex)
+		self.halfMoveClock = lastUndoInfo.previousHalfMoveClock
+		self.fullMoveNumber = lastUndoInfo.previousFullMoveNumber
+
+		return result
 
 	def getDifferenceBetweenCellCoordinates(self, cellCoordinatesA: List[int], cellCoordinatesB: List[int]) -> List[int]:
 		return [
@@ -43,20 +489,12 @@ class ChessBoard(Board):
 
 	def getCellsFromRay(self, sourceCellCoordinates: List[int], direction: List[int], distance: int = -1) -> List[int]:
 		cellIndices: list[int] = []
-		
-		if distance < 0:
-			distance = max(self.cellWidth, self.cellHeight)
-
-		cellCoordinates = sourceCellCoordinates.copy()
 
-		for offset in range(distance):
-			cellCoordinates[0] += direction[0]
-			cellCoordinates[1] += direction[1]
-			if not self.areCellCoordinatesOnBoard(cellCoordinates):
-				break
-
-			cellIndex = self.getCellIndexFromCoordinates(cellCoordinates)
+		rayCellIndices = self.cellRays[self.getCellIndexFromCoordinates(sourceCellCoordinates)][self.RayDirections.index(direction)]
+		if distance > -1:
+			rayCellIndices = rayCellIndices[:distance]
 
+		for cellIndex in rayCellIndices:
 			cellIndices.append(cellIndex)
 
 			# Stop after meeting a piece.
@@ -66,56 +504,161 @@ class ChessBoard(Board):
 		return cellIndices
 
 	def getAllPieceIndices(self) -> List[int]:
-		allPieceCellIndices: list[int] = []
+		allPieceCellIndices: set[int] = set()
 
-		for cellIndex in range(self.getNumberOfCells()):
-			if not self.isCellEmpty(cellIndex):
-				allPieceCellIndices.append(cellIndex)
+		for teamIndex in self.getTeamIndices():
+			allPieceCellIndices |= self.getTeamPieceCellIndices(teamIndex)
 
-		return allPieceCellIndices
+		return sorted(allPieceCellIndices)
 
 	def getAllTeamPieceIndices(self, teamIndex: int) -> List[int]:
-		return list(filter(lambda cellIndex: self.getPieceFromCell(cellIndex).teamIndex == teamIndex, self.getAllPieceIndices()))
+		return sorted(self.getTeamPieceCellIndices(teamIndex))
 
 	def getAllOpponentTeamPieceIndices(self, teamIndex: int) -> List[int]:
-		return list(filter(lambda cellIndex: self.getPieceFromCell(cellIndex).teamIndex != teamIndex, self.getAllPieceIndices()))
+		opponentTeamPieceCellIndices: set[int] = set()
 
-	def getAllKingIndices(self, teamIndex: int = -1) -> List[int]:
-		pieceIndices: list[int] = []
+		for opponentTeamIndex in self.getTeamIndices():
+			if opponentTeamIndex != teamIndex:
+				opponentTeamPieceCellIndices |= self.getTeamPieceCellIndices(opponentTeamIndex)
 
-		if teamIndex > -1:
-			pieceIndices = self.getAllTeamPieceIndices(teamIndex)
-		else:
-			pieceIndices = self.getAllPieceIndices()
+		return sorted(opponentTeamPieceCellIndices)
+
+	def getAllPieceTypeIndices(self, pieceTypeIds: List[int], teamIndex: int = -1) -> List[int]:
+		pieceCellIndices: set[int] = set()
+
+		teamIndices = [teamIndex] if teamIndex > -1 else self.getTeamIndices()
+		for pieceTeamIndex in teamIndices:
+			for pieceTypeId in pieceTypeIds:
+				pieceCellIndices |= self.getTeamPieceTypeCellIndices(pieceTeamIndex, pieceTypeId)
 
-		return list(filter(lambda cellIndex: isinstance(self.getPieceFromCell(cellIndex), chess.kingChessPiece.KingChessPiece), pieceIndices))
+		return sorted(pieceCellIndices)
+
+	def getAllKingIndices(self, teamIndex: int = -1) -> List[int]:
+		return self.getAllPieceTypeIndices(self.kingPieceTypeIds, teamIndex)
 	
 	def getAllRookIndices(self, teamIndex: int = -1) -> List[int]:
-		pieceIndices: list[int] = []
+		return self.getAllPieceTypeIndices(self.rookPieceTypeIds, teamIndex)
 
-		if teamIndex > -1:
-			pieceIndices = self.getAllTeamPieceIndices(teamIndex)
-		else:
-			pieceIndices = self.getAllPieceIndices()
+	# Returns the cell index of the team's only king, or -1 (no king, or several).
+	def getKingCellIndex(self, teamIndex: int) -> int:
+		teamKingCellIndices = self.getAllKingIndices(teamIndex)
+		if len(teamKingCellIndices) != 1:
+			return -1
 
-		return list(filter(lambda cellIndex: isinstance(self.getPieceFromCell(cellIndex), chess.rookChessPiece.RookChessPiece), pieceIndices))
+		return teamKingCellIndices[0]
 
-	def isKingInCheck(self, teamIndex: int) -> bool:
-		# Get combined list of all the valid attack based destination cell indices of all pieces on the other team.
-		allOpponentAttackCellIndices: list[int] = []
+	def doesPieceAttackAlongDirection(self, piece: Piece, directionIndex: int, distance: int) -> bool:
+		attackDistance = piece.getAttackDistance()
+		if attackDistance > -1 and distance > attackDistance:
+			return False
+
+		return directionIndex in piece.getAttackDirectionIndices()
+
+	# Returns the cells of the opponent pieces attacking a cell, as seen by a team.
+	# The piece at ignoredCellIndex is treated as absent (eg a king moving away from its attacker).
+	def getCellAttackerIndices(self, cellIndex: int, teamIndex: int, ignoredCellIndex: int = -1, findFirstOnly: bool = False) -> List[int]:
+		attackerCellIndices: list[int] = []
+
+		for (attackerCellIndex, attackOffset) in self.attackOffsetCells[cellIndex]:
+			if attackerCellIndex == ignoredCellIndex or not self.doesCellHaveOpponentPiece(attackerCellIndex, teamIndex):
+				continue
 
-		for opponentTeamPieceIndex in self.getAllOpponentTeamPieceIndices(teamIndex):
-			allOpponentAttackCellIndices += self.getValidAttackCellIndices(opponentTeamPieceIndex)
+			if attackOffset in self.getPieceFromCell(attackerCellIndex).getAttackOffsets():
+				attackerCellIndices.append(attackerCellIndex)
+				if findFirstOnly:
+					return attackerCellIndices
 
-		allOpponentAttackCellIndices = list(set(allOpponentAttackCellIndices))
+		cellRays = self.cellRays[cellIndex]
+		for directionIndex in range(len(cellRays)):
+			attackDirectionIndex = self.oppositeRayDirectionIndices[directionIndex]
+			distance = 0
 
-		# Is this king's cell index in this list?
+			for attackerCellIndex in cellRays[directionIndex]:
+				distance += 1
+
+				if attackerCellIndex == ignoredCellIndex or self.isCellEmpty(attackerCellIndex):
+					continue
+
+				attackerPiece = self.getPieceFromCell(attackerCellIndex)
+				if attackerPiece.teamIndex != teamIndex and self.doesPieceAttackAlongDirection(attackerPiece, attackDirectionIndex, distance):
+					attackerCellIndices.append(attackerCellIndex)
+					if findFirstOnly:
+						return attackerCellIndices
+
+				break
+
+		return attackerCellIndices
+
+	def isCellAttacked(self, cellIndex: int, teamIndex: int, ignoredCellIndex: int = -1) -> bool:
+		return len(self.getCellAttackerIndices(cellIndex, teamIndex, ignoredCellIndex, True)) > 0
+
+	def isKingInCheck(self, teamIndex: int) -> bool:
 		for teamKingCellIndex in self.getAllKingIndices(teamIndex):
-			if teamKingCellIndex in allOpponentAttackCellIndices:
+			if self.isCellAttacked(teamKingCellIndex, teamIndex):
 				return True
 
 		return False
 
+	# Returns None when the team does not have exactly one king,
+	# in which case legality is verified by temporarily making each move.
+	def getCheckInfo(self, teamIndex: int) -> ChessCheckInfo:
+		if teamIndex in self.checkInfos:
+			return self.checkInfos[teamIndex]
+
+		checkInfo: ChessCheckInfo = None
+
+		kingCellIndex = self.getKingCellIndex(teamIndex)
+		if kingCellIndex > -1:
+			checkInfo = self.createCheckInfo(kingCellIndex, teamIndex)
+
+		self.checkInfos[teamIndex] = checkInfo
+
+		return checkInfo
+
+	def createCheckInfo(self, kingCellIndex: int, teamIndex: int) -> ChessCheckInfo:
+		checkInfo = ChessCheckInfo(kingCellIndex)
+
+		for (attackerCellIndex, attackOffset) in self.attackOffsetCells[kingCellIndex]:
+			if not self.doesCellHaveOpponentPiece(attackerCellIndex, teamIndex):
+				continue
+
+			if attackOffset in self.getPieceFromCell(attackerCellIndex).getAttackOffsets():
+				checkInfo.checkerCellIndices.append(attackerCellIndex)
+				checkInfo.checkBlockCellIndices.add(attackerCellIndex)
+
+		# Walk out from the king, looking for a checking piece, or for an own piece
+		# with an opponent piece behind it that would attack the king otherwise (pin).
+		cellRays = self.cellRays[kingCellIndex]
+		for directionIndex in range(len(cellRays)):
+			attackDirectionIndex = self.oppositeRayDirectionIndices[directionIndex]
+			rayCellIndices: list[int] = []
+			pinnedCellIndex = -1
+
+			for rayCellIndex in cellRays[directionIndex]:
+				rayCellIndices.append(rayCellIndex)
+
+				if self.isCellEmpty(rayCellIndex):
+					continue
+
+				rayPiece = self.getPieceFromCell(rayCellIndex)
+				if rayPiece.teamIndex == teamIndex:
+					if pinnedCellIndex > -1:
+						break
+
+					pinnedCellIndex = rayCellIndex
+					continue
+
+				if self.doesPieceAttackAlongDirection(rayPiece, attackDirectionIndex, len(rayCellIndices)):
+					if pinnedCellIndex < 0:
+						checkInfo.checkerCellIndices.append(rayCellIndex)
+						checkInfo.checkBlockCellIndices.update(rayCellIndices)
+					else:
+						checkInfo.pinRayCellIndices[pinnedCellIndex] = set(rayCellIndices)
+
+				break
+
+		return checkInfo
+
 	def getCurrentMetEndOfGameCondition(self, currentTurnTeamIndex: int) -> int:
 		isKingInCheck = self.isKingInCheck(currentTurnTeamIndex)
 		areThereValidMoves = self.areThereValidMoves(currentTurnTeamIndex)
@@ -132,27 +675,84 @@ class ChessBoard(Board):
 		if piece is None:
 			print("getValidTargetCellIndices: Error")
 			return []
-		
-		validTargetCellIndices = super().getValidTargetCellIndices(cellIndex)
+
+		return self.getLegalTargetCellIndices(cellIndex, piece, False)
+
+	# Valid target cells which capture a piece or promote a pawn (eg for quiescence search).
+	def getValidCaptureTargetCellIndices(self, cellIndex: int) -> List[int]:
+		piece = self.getPieceFromCell(cellIndex)
+		if piece is None:
+			print("getValidCaptureTargetCellIndices: Error")
+			return []
+
+		return self.getLegalTargetCellIndices(cellIndex, piece, True)
+
+	def getLegalTargetCellIndices(self, cellIndex: int, piece: Piece, capturesOnly: bool) -> List[int]:
 		teamIndex = piece.teamIndex
 
-		return list(filter(lambda targetCellIndex: not self.doesTargetCellPutTeamKingIntoCheck(cellIndex, targetCellIndex, teamIndex), validTargetCellIndices))
+		if capturesOnly:
+			possibleTargetCellIndices = piece.getPossibleCaptureTargetCellIndices(self, cellIndex)
+		else:
+			possibleTargetCellIndices = None
+
+		checkInfo = self.getCheckInfo(teamIndex)
+		if checkInfo is None:
+			if possibleTargetCellIndices is None:
+				possibleTargetCellIndices = piece.getPossibleTargetCellIndices(self, cellIndex)
+
+			return list(filter(lambda targetCellIndex: not self.doesTargetCellPutTeamKingIntoCheck(cellIndex, targetCellIndex, teamIndex), possibleTargetCellIndices))
+
+		# The king cannot move into an attacked cell (looking through its current cell),
+		# and its castle targets already account for checks.
+		if cellIndex == checkInfo.kingCellIndex:
+			if capturesOnly:
+				return list(filter(lambda targetCellIndex: not self.isCellAttacked(targetCellIndex, teamIndex, cellIndex), possibleTargetCellIndices))
+
+			validTargetCellIndices = list(filter(lambda targetCellIndex: not self.isCellAttacked(targetCellIndex, teamIndex, cellIndex), piece.getPossibleMoveCellIndices(self, cellIndex)))
+			return validTargetCellIndices + piece.getPossibleCastleTargetCellIndices(self, cellIndex)
+
+		# Only the king can move out of a double check.
+		numberOfCheckers = len(checkInfo.checkerCellIndices)
+		if numberOfCheckers > 1:
+			return []
+
+		if possibleTargetCellIndices is None:
+			possibleTargetCellIndices = piece.getPossibleTargetCellIndices(self, cellIndex)
+
+		validTargetCellIndices: list[int] = []
+
+		specialTargetCellIndices = piece.getSpecialTargetCellIndices(self, cellIndex)
+		pinRayCellIndices = checkInfo.pinRayCellIndices.get(cellIndex, None)
+
+		for targetCellIndex in possibleTargetCellIndices:
+			if targetCellIndex in specialTargetCellIndices:
+				if not self.doesTargetCellPutTeamKingIntoCheck(cellIndex, targetCellIndex, teamIndex):
+					validTargetCellIndices.append(targetCellIndex)
+				continue
+
+			if pinRayCellIndices is not None and targetCellIndex not in pinRayCellIndices:
+				continue
+
+			if numberOfCheckers > 0 and targetCellIndex not in checkInfo.checkBlockCellIndices:
+				continue
+
+			validTargetCellIndices.append(targetCellIndex)
+
+		return validTargetCellIndices
 
 	def doesTargetCellPutTeamKingIntoCheck(self, activeCellIndex: int, targetCellIndex: int, teamIndex: int) -> bool:
 		# Temporarily make move.
-		pieceActions = self.performPieceAction(activeCellIndex, targetCellIndex)
+		undoInfo = self.makeMove(self.getMoveFromTargetCell(activeCellIndex, targetCellIndex))
 		
 		putsTeamKingIntoCheck = self.isKingInCheck(teamIndex)
 		
-		self.rollbackPieceActions(pieceActions)
+		self.unmakeMove(undoInfo)
 
 		return putsTeamKingIntoCheck
 	
 	def areThereValidMoves(self, teamIndex: int) -> bool:
-		allTeamValidTargetCellIndices: list[int] = []
-
 		for cellIndex in self.getAllTeamPieceIndices(teamIndex):
-			allTeamValidTargetCellIndices += self.getValidTargetCellIndices(cellIndex)
+			if len(self.getValidTargetCellIndices(cellIndex)) > 0:
+				return True
 
-		return (len(allTeamValidTargetCellIndices) > 0)
-	
\ No newline at end of file
+		return False
\ No newline at end of file
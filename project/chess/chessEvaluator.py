@@ -0,0 +1,400 @@
+from typing import Dict, List
+
+from chess.piece import Piece
+import chess.pawnChessPiece
+import chess.rookChessPiece
+import chess.knightChessPiece
+import chess.bishopChessPiece
+import chess.queenChessPiece
+import chess.kingChessPiece
+
+# Middlegame & endgame values and piece-square tables of a piece type.
+# Tables are laid out like the board, as seen by the first team (first row is the far rank).
+class ChessPieceTypeEvaluation:
+	def __init__(self, pieceType: type, middlegameValue: int, endgameValue: int, phaseWeight: int, middlegameTable: List[int], endgameTable: List[int] = None):
+		self.pieceType = pieceType
+		self.middlegameValue = middlegameValue
+		self.endgameValue = endgameValue
+		self.phaseWeight = phaseWeight
+		self.middlegameTable = middlegameTable
+		self.endgameTable = middlegameTable if endgameTable is None else endgameTable
+
+# Piece-square tables from the "Simplified Evaluation Function" (Tomasz Michniewski),
+# with an endgame table for kings (centralize) and pawns (advance).
+# Created on first use, as the piece modules import the board, which imports this module.
+def createPieceTypeEvaluations() -> List[ChessPieceTypeEvaluation]:
+	return [
+		ChessPieceTypeEvaluation(chess.pawnChessPiece.PawnChessPiece, 100, 120, 0, [
+			0, 0, 0, 0, 0, 0, 0, 0,
+			50, 50, 50, 50, 50, 50, 50, 50,
+			10, 10, 20, 30, 30, 20, 10, 10,
+			5, 5, 10, 25, 25, 10, 5, 5,
+			0, 0, 0, 20, 20, 0, 0, 0,
+			5, -5, -10, 0, 0, -10, -5, 5,
+			5, 10, 10, -20, -20, 10, 10, 5,
+			0, 0, 0, 0, 0, 0, 0, 0
+		], [
+			0, 0, 0, 0, 0, 0, 0, 0,
+			80, 80, 80, 80, 80, 80, 80, 80,
+			50, 50, 50, 50, 50, 50, 50, 50,
+			30, 30, 30, 30, 30, 30, 30, 30,
+			20, 20, 20, 20, 20, 20, 20, 20,
+			10, 10, 10, 10, 10, 10, 10, 10,
+			10, 10, 10, 10, 10, 10, 10, 10,
+			0, 0, 0, 0, 0, 0, 0, 0
+		]),
+		ChessPieceTypeEvaluation(chess.knightChessPiece.KnightChessPiece, 320, 300, 1, [
+			-50, -40, -30, -30, -30, -30, -40, -50,
+			-40, -20, 0, 0, 0, 0, -20, -40,
+			-30, 0, 10, 15, 15, 10, 0, -30,
+			-30, 5, 15, 20, 20, 15, 5, -30,
+			-30, 0, 15, 20, 20, 15, 0, -30,
+			-30, 5, 10, 15, 15, 10, 5, -30,
+			-40, -20, 0, 5, 5, 0, -20, -40,
+			-50, -40, -30, -30, -30, -30, -40, -50
+		]),
+		ChessPieceTypeEvaluation(chess.bishopChessPiece.BishopChessPiece, 330, 320, 1, [
+			-20, -10, -10, -10, -10, -10, -10, -20,
+			-10, 0, 0, 0, 0, 0, 0, -10,
+			-10, 0, 5, 10, 10, 5, 0, -10,
+			-10, 5, 5, 10, 10, 5, 5, -10,
+			-10, 0, 10, 10, 10, 10, 0, -10,
+			-10, 10, 10, 10, 10, 10, 10, -10,
+			-10, 5, 0, 0, 0, 0, 5, -10,
+			-20, -10, -10, -10, -10, -10, -10, -20
+		]),
+		ChessPieceTypeEvaluation(chess.rookChessPiece.RookChessPiece, 500, 520, 2, [
+			0, 0, 0, 0, 0, 0, 0, 0,
+			5, 10, 10, 10, 10, 10, 10, 5,
+			-5, 0, 0, 0, 0, 0, 0, -5,
+			-5, 0, 0, 0, 0, 0, 0, -5,
+			-5, 0, 0, 0, 0, 0, 0, -5,
+			-5, 0, 0, 0, 0, 0, 0, -5,
+			-5, 0, 0, 0, 0, 0, 0, -5,
+			0, 0, 0, 5, 5, 0, 0, 0
+		]),
+		ChessPieceTypeEvaluation(chess.queenChessPiece.QueenChessPiece, 900, 920, 4, [
+			-20, -10, -10, -5, -5, -10, -10, -20,
+			-10, 0, 0, 0, 0, 0, 0, -10,
+			-10, 0, 5, 5, 5, 5, 0, -10,
+			-5, 0, 5, 5, 5, 5, 0, -5,
+			0, 0, 5, 5, 5, 5, 0, -5,
+			-10, 5, 5, 5, 5, 5, 0, -10,
+			-10, 0, 5, 0, 0, 0, 0, -10,
+			-20, -10, -10, -5, -5, -10, -10, -20
+		]),
+		ChessPieceTypeEvaluation(chess.kingChessPiece.KingChessPiece, 0, 0, 0, [
+			-30, -40, -40, -50, -50, -40, -40, -30,
+			-30, -40, -40, -50, -50, -40, -40, -30,
+			-30, -40, -40, -50, -50, -40, -40, -30,
+			-30, -40, -40, -50, -50, -40, -40, -30,
+			-20, -30, -30, -40, -40, -30, -30, -20,
+			-10, -20, -20, -20, -20, -20, -20, -10,
+			20, 20, 0, 0, 0, 0, 20, 20,
+			20, 30, 10, 0, 0, 10, 30, 20
+		], [
+			-50, -40, -30, -20, -20, -30, -40, -50,
+			-30, -20, -10, 0, 0, -10, -20, -30,
+			-30, -10, 20, 30, 30, 20, -10, -30,
+			-30, -10, 30, 40, 40, 30, -10, -30,
+			-30, -10, 30, 40, 40, 30, -10, -30,
+			-30, -10, 20, 30, 30, 20, -10, -30,
+			-30, -30, 0, 0, 0, 0, -30, -30,
+			-50, -30, -30, -30, -30, -30, -30, -50
+		])
+	]
+
+# Material and piece-square evaluation, kept up to date by the board as pieces
+# are added to and removed from cells (moves, undos, captures, promotions, castling),
+# so that evaluating a position is O(1). Middlegame and endgame scores are blended
+# by the game phase, which goes from MaximumPhase (all pieces) down to 0.
+class ChessEvaluator():
+	MaximumPhase = 24
+
+	# Shared by all evaluators.
+	pieceTypeEvaluations: List[ChessPieceTypeEvaluation] = None
+
+	def __init__(self, board):
+		self.board = board
+
+		if ChessEvaluator.pieceTypeEvaluations is None:
+			ChessEvaluator.pieceTypeEvaluations = createPieceTypeEvaluations()
+
+		numberOfTeams = board.NumberOfTeams
+		numberOfPieceTypes = len(board.pieceSet.pieceTypes)
+		numberOfCells = board.getNumberOfCells()
+
+		# Per team index, piece type id and cell index: value including the piece-square bonus.
+		self.middlegameCellValues: list[list[list[int]]] = [[[0] * numberOfCells for pieceTypeId in range(numberOfPieceTypes)] for teamIndex in range(numberOfTeams)]
+		self.endgameCellValues: list[list[list[int]]] = [[[0] * numberOfCells for pieceTypeId in range(numberOfPieceTypes)] for teamIndex in range(numberOfTeams)]
+		self.pieceTypePhaseWeights: list[int] = [0] * numberOfPieceTypes
+
+		for pieceTypeEvaluation in self.pieceTypeEvaluations:
+			for pieceTypeId in board.getPieceTypeIdsFromBaseType(pieceTypeEvaluation.pieceType):
+				self.pieceTypePhaseWeights[pieceTypeId] = pieceTypeEvaluation.phaseWeight
+
+				for teamIndex in range(numberOfTeams):
+					for cellIndex in range(numberOfCells):
+						tableIndex = self.getTableIndex(cellIndex, teamIndex)
+						self.middlegameCellValues[teamIndex][pieceTypeId][cellIndex] = pieceTypeEvaluation.middlegameValue + pieceTypeEvaluation.middlegameTable[tableIndex]
+						self.endgameCellValues[teamIndex][pieceTypeId][cellIndex] = pieceTypeEvaluation.endgameValue + pieceTypeEvaluation.endgameTable[tableIndex]
+
+		self.middlegameScores: list[int] = [0] * numberOfTeams
+		self.endgameScores: list[int] = [0] * numberOfTeams
+		self.phase = 0
+
+	# Tables are as seen by the first team; the other team's are mirrored vertically.
+	def getTableIndex(self, cellIndex: int, teamIndex: int) -> int:
+		if teamIndex == 0:
+			return cellIndex
+
+		cellCoordinates = self.board.getCellCoordinatesFromIndex(cellIndex)
+		return self.board.getCellIndexFromCoordinates([cellCoordinates[0], self.board.cellHeight - 1 - cellCoordinates[1]])
+
+	def onPieceAddedToCell(self, cellIndex: int, piece: Piece) -> None:
+		pieceTypeId = self.board.pieceSet.getTypeIdFromPiece(piece)
+		teamIndex = piece.teamIndex
+
+		self.middlegameScores[teamIndex] += self.middlegameCellValues[teamIndex][pieceTypeId][cellIndex]
+		self.endgameScores[teamIndex] += self.endgameCellValues[teamIndex][pieceTypeId][cellIndex]
+		self.phase += self.pieceTypePhaseWeights[pieceTypeId]
+
+	def onPieceRemovedFromCell(self, cellIndex: int, piece: Piece) -> None:
+		pieceTypeId = self.board.pieceSet.getTypeIdFromPiece(piece)
+		teamIndex = piece.teamIndex
+
+		self.middlegameScores[teamIndex] -= self.middlegameCellValues[teamIndex][pieceTypeId][cellIndex]
+		self.endgameScores[teamIndex] -= self.endgameCellValues[teamIndex][pieceTypeId][cellIndex]
+		self.phase -= self.pieceTypePhaseWeights[pieceTypeId]
+
+	# Score of the position from the point of view of the given team, in centipawns.
+	def evaluate(self, teamIndex: int) -> int:
+		opponentTeamIndex = 1 - teamIndex
+
+		middlegameScore = self.middlegameScores[teamIndex] - self.middlegameScores[opponentTeamIndex]
+		endgameScore = self.endgameScores[teamIndex] - self.endgameScores[opponentTeamIndex]
+
+		phase = min(self.phase, self.MaximumPhase)
+		return (middlegameScore * phase + endgameScore * (self.MaximumPhase - phase)) // self.MaximumPhase
+
+	# Recomputes the scores from the pieces on the board, eg to verify the incremental ones.
+	def computeScores(self) -> tuple:
+		middlegameScores = [0] * len(self.middlegameScores)
+		endgameScores = [0] * len(self.endgameScores)
+		phase = 0
+
+		for cellIndex in self.board.getAllPieceIndices():
+			piece = self.board.getPieceFromCell(cellIndex)
+			pieceTypeId = self.board.pieceSet.getTypeIdFromPiece(piece)
+			middlegameScores[piece.teamIndex] += self.middlegameCellValues[piece.teamIndex][pieceTypeId][cellIndex]
+			endgameScores[piece.teamIndex] += self.endgameCellValues[piece.teamIndex][pieceTypeId][cellIndex]
+			phase += self.pieceTypePhaseWeights[pieceTypeId]
+
+		return (middlegameScores, endgameScores, phase)
+
+# Evaluates many positions at once with NumPy (imported on first use, as it is optional).
+# Positions are packed into a (K, 64) int8 array of cell codes: piece type id + 1 for
+# the first team's pieces, negated for the second team's, 0 for empty cells.
+# Terms are vectorized over the batch: material and piece-square (as ChessEvaluator),
+# mobility (pseudo-legal moves of knights, bishops, rooks and queens into cells not
+# occupied by their own team) and pawn structure (doubled, isolated and passed pawns).
+# Scores are from the first team's point of view, unless a team index is given.
+class ChessBatchEvaluator():
+	DoubledPawnPenalty = 15
+	IsolatedPawnPenalty = 12
+
+	# Per rank (from the first), of passed pawns.
+	PassedPawnBonuses = [0, 5, 10, 20, 35, 60, 100, 0]
+
+	def __init__(self, board):
+		try:
+			import numpy
+		except ImportError:
+			raise ImportError("ChessBatchEvaluator requires NumPy (python -m pip install numpy)")
+
+		self.numpy = numpy
+		self.board = board
+
+		evaluator: ChessEvaluator = board.evaluator
+		numberOfPieceTypes = len(board.pieceSet.pieceTypes)
+		numberOfCells = board.getNumberOfCells()
+
+		self.numberOfPieceTypes = numberOfPieceTypes
+		self.numberOfCells = numberOfCells
+		self.cellIndices = numpy.arange(numberOfCells)
+
+		# Lookup tables indexed by cell code + numberOfPieceTypes (and cell index), signed by team.
+		self.middlegameCodeTable = numpy.zeros((2 * numberOfPieceTypes + 1, numberOfCells), dtype = numpy.int32)
+		self.endgameCodeTable = numpy.zeros((2 * numberOfPieceTypes + 1, numberOfCells), dtype = numpy.int32)
+		self.phaseCodeTable = numpy.zeros(2 * numberOfPieceTypes + 1, dtype = numpy.int32)
+
+		for pieceTypeId in range(numberOfPieceTypes):
+			for teamIndex in range(2):
+				codeIndex = self.getCellCode(pieceTypeId, teamIndex) + numberOfPieceTypes
+				sign = 1 if teamIndex == 0 else -1
+				self.middlegameCodeTable[codeIndex] = sign * numpy.array(evaluator.middlegameCellValues[teamIndex][pieceTypeId])
+				self.endgameCodeTable[codeIndex] = sign * numpy.array(evaluator.endgameCellValues[teamIndex][pieceTypeId])
+				self.phaseCodeTable[codeIndex] = evaluator.pieceTypePhaseWeights[pieceTypeId]
+
+		# Mobility: per piece type id, its weight, jump matrix (from cell x to cell) and ray direction indices.
+		mobilityWeights = [
+			(chess.knightChessPiece.KnightChessPiece, 4),
+			(chess.bishopChessPiece.BishopChessPiece, 5),
+			(chess.rookChessPiece.RookChessPiece, 2),
+			(chess.queenChessPiece.QueenChessPiece, 1)
+		]
+
+		self.mobilityPieceTypes: list[tuple] = []
+		for (pieceType, mobilityWeight) in mobilityWeights:
+			for pieceTypeId in board.getPieceTypeIdsFromBaseType(pieceType):
+				concretePieceType = board.pieceSet.pieceTypes[pieceTypeId]
+
+				offsetMatrix = None
+				if concretePieceType in board.pieceOffsetTables:
+					offsetMatrix = numpy.zeros((numberOfCells, numberOfCells), dtype = numpy.int32)
+					for cellIndex in range(numberOfCells):
+						offsetMatrix[cellIndex, board.pieceOffsetTables[concretePieceType][cellIndex]] = 1
+
+				self.mobilityPieceTypes.append((pieceTypeId, mobilityWeight, offsetMatrix, concretePieceType.moveDirectionIndices))
+
+		# rayStepCells[directionIndex][step - 1][cellIndex]: cell at that distance along the ray, numberOfCells if off board.
+		maximumRayLength = max(board.cellWidth, board.cellHeight) - 1
+		self.rayStepCells = numpy.full((len(board.RayDirections), maximumRayLength, numberOfCells), numberOfCells, dtype = numpy.intp)
+		for cellIndex in range(numberOfCells):
+			for directionIndex in range(len(board.RayDirections)):
+				for (stepIndex, rayCellIndex) in enumerate(board.cellRays[cellIndex][directionIndex]):
+					self.rayStepCells[directionIndex, stepIndex, cellIndex] = rayCellIndex
+
+		# Pawn structure: passedPawnMasks[teamIndex][cellIndex] marks the cells in front of a pawn,
+		# on its file and both adjacent files, which must hold no opponent pawn.
+		self.pawnCodes = [self.getCellCode(pieceTypeId, teamIndex) for teamIndex in range(2) for pieceTypeId in board.pawnPieceTypeIds]
+		self.passedPawnMasks = numpy.zeros((2, numberOfCells, numberOfCells), dtype = numpy.int32)
+		self.passedPawnBonuses = numpy.zeros((2, numberOfCells), dtype = numpy.int32)
+		for teamIndex in range(2):
+			forwardStep = -1 if teamIndex == 0 else 1
+			for cellIndex in range(numberOfCells):
+				cellCoordinates = board.getCellCoordinatesFromIndex(cellIndex)
+				rank = board.cellHeight - cellCoordinates[1] if teamIndex == 0 else cellCoordinates[1] + 1
+				self.passedPawnBonuses[teamIndex, cellIndex] = self.PassedPawnBonuses[min(rank, len(self.PassedPawnBonuses)) - 1]
+
+				y = cellCoordinates[1] + forwardStep
+				while 0 <= y < board.cellHeight:
+					for x in range(cellCoordinates[0] - 1, cellCoordinates[0] + 2):
+						if 0 <= x < board.cellWidth:
+							self.passedPawnMasks[teamIndex, cellIndex, board.getCellIndexFromCoordinates([x, y])] = 1
+					y += forwardStep
+
+	def getCellCode(self, pieceTypeId: int, teamIndex: int) -> int:
+		return pieceTypeId + 1 if teamIndex == 0 else -(pieceTypeId + 1)
+
+	def getBoardCellCodes(self, board) -> List[int]:
+		cellCodes = [0] * self.numberOfCells
+
+		for cellIndex in board.getAllPieceIndices():
+			piece = board.getPieceFromCell(cellIndex)
+			cellCodes[cellIndex] = self.getCellCode(board.pieceSet.getTypeIdFromPiece(piece), piece.teamIndex)
+
+		return cellCodes
+
+	# Packs boards (or lists of cell codes) into a (K, 64) int8 array.
+	def packBoards(self, boards: List) -> object:
+		return self.numpy.array([board if isinstance(board, list) else self.getBoardCellCodes(board) for board in boards], dtype = self.numpy.int8).reshape((len(boards), self.numberOfCells))
+
+	# Unpacks cell codes into (K, 12, 64) int8 one-hot planes, indexed by team index * 6 + piece type id.
+	def getPiecePlanes(self, cellCodes: object) -> object:
+		numpy = self.numpy
+
+		piecePlanes = numpy.zeros((cellCodes.shape[0], 2 * self.numberOfPieceTypes, self.numberOfCells), dtype = numpy.int8)
+		for pieceTypeId in range(self.numberOfPieceTypes):
+			for teamIndex in range(2):
+				piecePlanes[:, teamIndex * self.numberOfPieceTypes + pieceTypeId, :] = cellCodes == self.getCellCode(pieceTypeId, teamIndex)
+
+		return piecePlanes
+
+	def getPieceSquareScores(self, cellCodes: object) -> object:
+		numpy = self.numpy
+
+		codeIndices = cellCodes.astype(numpy.intp) + self.numberOfPieceTypes
+		middlegameScores = self.middlegameCodeTable[codeIndices, self.cellIndices].sum(axis = 1)
+		endgameScores = self.endgameCodeTable[codeIndices, self.cellIndices].sum(axis = 1)
+		phases = numpy.minimum(self.phaseCodeTable[codeIndices].sum(axis = 1), ChessEvaluator.MaximumPhase)
+
+		return (middlegameScores * phases + endgameScores * (ChessEvaluator.MaximumPhase - phases)) // ChessEvaluator.MaximumPhase
+
+	def getMobilityScores(self, cellCodes: object) -> object:
+		numpy = self.numpy
+
+		numberOfBoards = cellCodes.shape[0]
+		blockedColumn = numpy.ones((numberOfBoards, 1), dtype = bool)
+
+		# Padded with an always occupied, always own cell, standing for off board.
+		occupiedCells = numpy.concatenate((cellCodes != 0, blockedColumn), axis = 1)
+		teamCells = [numpy.concatenate((cellCodes > 0, blockedColumn), axis = 1), numpy.concatenate((cellCodes < 0, blockedColumn), axis = 1)]
+
+		# Reachable (not own) cell counts per team, ray direction and origin cell.
+		rayMoveCounts = [[None] * len(self.rayStepCells) for teamIndex in range(2)]
+		for directionIndex in range(len(self.rayStepCells)):
+			for teamIndex in range(2):
+				isRayOpen = numpy.ones((numberOfBoards, self.numberOfCells), dtype = bool)
+				moveCounts = numpy.zeros((numberOfBoards, self.numberOfCells), dtype = numpy.int32)
+
+				for stepCells in self.rayStepCells[directionIndex]:
+					moveCounts += isRayOpen & ~teamCells[teamIndex][:, stepCells]
+					isRayOpen &= ~occupiedCells[:, stepCells]
+
+				rayMoveCounts[teamIndex][directionIndex] = moveCounts
+
+		mobilityScores = numpy.zeros(numberOfBoards, dtype = numpy.int32)
+		for (pieceTypeId, mobilityWeight, offsetMatrix, moveDirectionIndices) in self.mobilityPieceTypes:
+			for teamIndex in range(2):
+				pieceCells = cellCodes == self.getCellCode(pieceTypeId, teamIndex)
+				sign = 1 if teamIndex == 0 else -1
+
+				moveCounts = numpy.zeros(numberOfBoards, dtype = numpy.int32)
+				if offsetMatrix is not None:
+					moveCounts += ((pieceCells.astype(numpy.int32) @ offsetMatrix) * ~teamCells[teamIndex][:, :-1]).sum(axis = 1)
+
+				for directionIndex in moveDirectionIndices:
+					moveCounts += (rayMoveCounts[teamIndex][directionIndex] * pieceCells).sum(axis = 1)
+
+				mobilityScores += sign * mobilityWeight * moveCounts
+
+		return mobilityScores
+
+	def getPawnStructureScores(self, cellCodes: object) -> object:
+		numpy = self.numpy
+
+		numberOfBoards = cellCodes.shape[0]
+		numberOfPawnCodes = len(self.pawnCodes) // 2
+		pawnCells = [numpy.isin(cellCodes, self.pawnCodes[teamIndex * numberOfPawnCodes:(teamIndex + 1) * numberOfPawnCodes]) for teamIndex in range(2)]
+
+		pawnStructureScores = numpy.zeros(numberOfBoards, dtype = numpy.int32)
+		for teamIndex in range(2):
+			sign = 1 if teamIndex == 0 else -1
+
+			# Pawns per file, with empty files padded around for adjacency.
+			filePawnCounts = pawnCells[teamIndex].reshape((numberOfBoards, self.board.cellHeight, self.board.cellWidth)).sum(axis = 1)
+			paddedFilePawnCounts = numpy.pad(filePawnCounts, ((0, 0), (1, 1)))
+			adjacentFilePawnCounts = paddedFilePawnCounts[:, :-2] + paddedFilePawnCounts[:, 2:]
+
+			numberOfDoubledPawns = numpy.maximum(filePawnCounts - 1, 0).sum(axis = 1)
+			numberOfIsolatedPawns = (filePawnCounts * (adjacentFilePawnCounts == 0)).sum(axis = 1)
+
+			opponentPawnsInFront = pawnCells[1 - teamIndex].astype(numpy.int32) @ self.passedPawnMasks[teamIndex].T
+			passedPawnCells = pawnCells[teamIndex] & (opponentPawnsInFront == 0)
+			passedPawnBonus = (passedPawnCells * self.passedPawnBonuses[teamIndex]).sum(axis = 1)
+
+			pawnStructureScores += sign * (passedPawnBonus - self.DoubledPawnPenalty * numberOfDoubledPawns - self.IsolatedPawnPenalty * numberOfIsolatedPawns)
+
+		return pawnStructureScores
+
+	def getTermScores(self, cellCodes: object) -> Dict[str, object]:
+		return {
+			"pieceSquare": self.getPieceSquareScores(cellCodes),
+			"mobility": self.getMobilityScores(cellCodes),
+			"pawnStructure": self.getPawnStructureScores(cellCodes)
+		}
+
+	def evaluate(self, cellCodes: object, teamIndex: int = 0) -> object:
+		scores = sum(self.getTermScores(cellCodes).values())
+		return scores if teamIndex == 0 else -scores
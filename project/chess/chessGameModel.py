@@ -5,6 +5,7 @@ from engine.gameModel import GameModel
 from engine.gamePlayer import GamePlayer
 import chess.chessPieceSet
 import chess.chessBoard
+import chess.bitboardChessBoard
 
 class ChessPhaseId(Enum):
 	PLAY = 0
@@ -16,7 +17,8 @@ class ChessTurnStateId(Enum):
 class ChessGameModel(GameModel):
 	MaximumNumberOfPlayers = 2
 
-	def __init__(self):
+	# maximumHistoryLength and historyArchiveFilename limit the move history kept in memory (see Board).
+	def __init__(self, useBitboardBoard: bool = False, maximumHistoryLength: int = -1, historyArchiveFilename: str = None):
 		super().__init__()
 
 		self.signalHandlers["cellSelected"] = self.onCellSelected
@@ -26,30 +28,25 @@ class ChessGameModel(GameModel):
 			"Black"
 		]
 
-		self.board = chess.chessBoard.ChessBoard()
+		if useBitboardBoard:
+			self.board = chess.bitboardChessBoard.BitboardChessBoard(maximumHistoryLength, historyArchiveFilename)
+		else:
+			self.board = chess.chessBoard.ChessBoard(maximumHistoryLength, historyArchiveFilename)
 
 		self.currentTurnTeamIndex = -1
 		self.phaseId = ChessPhaseId.PLAY
 		self.turnStateId = ChessTurnStateId.PIECE_NOT_ACTIVE
 		self.activatedPieceCellIndex = -1
 
-	def initialize(self) -> int:
-		boardStringRowList = [
-			"rnbqkbnr",
-			"pppppppp",
-			"........",
-			"........",
-			"........",
-			"........",
-			"PPPPPPPP",
-			"RNBQKBNR"
-		]
-
-		self.board.loadFromStringRowList(boardStringRowList)
+	def initialize(self, fen: str = chess.chessBoard.ChessBoard.StartingFen) -> int:
+		result = self.board.loadFromFen(fen)
+		if result < 0:
+			return result
 
 		payload = {
 			"teamNames": self.teamNames.copy(),
-			"boardStringRowList": boardStringRowList.copy()
+			"boardStringRowList": self.board.getStringRowList(),
+			"fen": self.board.toFen()
 		}
 
 		self.notify("gameInitialized", payload)
@@ -95,7 +92,15 @@ class ChessGameModel(GameModel):
 
 		self.activatedPieceCellIndex = -1
 
-		self.notify("actionsMade", pieceActions)
+		# The move cells let views make the same move on their own board, keeping its
+		# en passant cell, move clocks and history (eg for an AI searching it).
+		payload = {
+			"activeCellIndex": activeCellIndex,
+			"targetCellIndex": targetCellIndex,
+			"pieceActions": pieceActions
+		}
+
+		self.notify("actionsMade", payload)
 
 		#self.board.print()
 
@@ -116,7 +121,7 @@ class ChessGameModel(GameModel):
 		self.startTurn()
 	
 	def startGame(self) -> None:
-		self.currentTurnTeamIndex = 0
+		self.currentTurnTeamIndex = self.board.turnTeamIndex
 		self.phaseId = ChessPhaseId.PLAY
 
 		self.notify("gameStarted")
@@ -131,7 +136,16 @@ class ChessGameModel(GameModel):
 
 		self.notify("gameEnded", winningTeamIndex)
 
+	# A selection can activate a piece or make a move, ending the turn and starting the next one
+	# (or ending the game): observers get the resulting signals together, once the model is up to date.
 	def onCellSelected(self, cellIndex: int) -> None:
+		self.beginTransaction()
+		try:
+			self.selectCell(cellIndex)
+		finally:
+			self.endTransaction()
+
+	def selectCell(self, cellIndex: int) -> None:
 		isValidCell = False
 		
 		if self.phaseId == ChessPhaseId.PLAY:
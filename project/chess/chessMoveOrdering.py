@@ -0,0 +1,125 @@
+from typing import List, Tuple
+import random
+
+from chess.chessBoard import ChessBoard
+
+# Orders moves for the search so that the ones most likely to cause a cutoff come first:
+# the hash move, then captures by most valuable victim / least valuable attacker,
+# then the two killer moves of the ply, then quiet moves by history score.
+# Moves are (activeCellIndex, targetCellIndex) tuples.
+class ChessMoveOrdering():
+	HashMoveScore = 1 << 30
+	CaptureScore = 1 << 28
+	KillerMoveScores = [1 << 27, (1 << 27) - 1]
+
+	# History scores are halved past this, to keep them below the killer scores.
+	MaximumHistoryScore = 1 << 20
+
+	NumberOfKillerMoves = 2
+
+	def __init__(self, board: ChessBoard, pieceTypeIdValues: List[int], maximumPly: int):
+		self.board = board
+		self.pieceTypeIdValues = pieceTypeIdValues
+
+		numberOfCells = board.getNumberOfCells()
+		self.numberOfCells = numberOfCells
+
+		# killerMoves[ply] holds quiet moves which caused a cutoff at that ply, most recent first.
+		self.killerMoves: list[list[Tuple[int, int]]] = [[None] * self.NumberOfKillerMoves for ply in range(maximumPly + 1)]
+
+		# Butterfly history table, indexed by activeCellIndex * numberOfCells + targetCellIndex.
+		self.historyScores: list[int] = [0] * (numberOfCells * numberOfCells)
+
+		# Shuffles moves before ordering, so that equally scored moves come in a random order.
+		self.moveOrderRandom: random.Random = None
+
+		# Static scores of the root moves, which then order the root instead (after the hash move).
+		self.rootMoveScores: dict[Tuple[int, int], int] = None
+
+		# Cutoff statistics: how often the first searched move was the one to cause a cutoff.
+		self.numberOfCutoffs = 0
+		self.numberOfFirstMoveCutoffs = 0
+
+	def startNewSearch(self) -> None:
+		for plyKillerMoves in self.killerMoves:
+			for killerMoveIndex in range(self.NumberOfKillerMoves):
+				plyKillerMoves[killerMoveIndex] = None
+
+		# Keep what was learned, but let the new search outweigh it.
+		self.historyScores = [historyScore >> 1 for historyScore in self.historyScores]
+
+		self.numberOfCutoffs = 0
+		self.numberOfFirstMoveCutoffs = 0
+
+	def getFirstMoveCutoffRate(self) -> float:
+		if self.numberOfCutoffs == 0:
+			return 0.0
+
+		return self.numberOfFirstMoveCutoffs / self.numberOfCutoffs
+
+	# Returns the value of the captured piece, -1 for quiet moves.
+	def getCapturedValue(self, move: Tuple[int, int]) -> int:
+		board = self.board
+
+		targetPiece = board.getPieceFromCell(move[1])
+		if targetPiece is not None:
+			if targetPiece.teamIndex == board.getPieceFromCell(move[0]).teamIndex:
+				# A king selecting its rook to castle.
+				return -1
+
+			return self.pieceTypeIdValues[board.pieceSet.getTypeIdFromPiece(targetPiece)]
+
+		if move[1] == board.enPassantCellIndex and board.pieceSet.getTypeIdFromPiece(board.getPieceFromCell(move[0])) in board.pawnPieceTypeIds:
+			return self.pieceTypeIdValues[board.pawnPieceTypeIds[0]]
+
+		return -1
+
+	def isQuietMove(self, move: Tuple[int, int]) -> bool:
+		return self.getCapturedValue(move) < 0
+
+	def getMoveScore(self, move: Tuple[int, int], hashMove: Tuple[int, int], plyKillerMoves: List[Tuple[int, int]]) -> int:
+		if move == hashMove:
+			return self.HashMoveScore
+
+		capturedValue = self.getCapturedValue(move)
+		if capturedValue > -1:
+			attackerValue = self.pieceTypeIdValues[self.board.pieceSet.getTypeIdFromPiece(self.board.getPieceFromCell(move[0]))]
+			return self.CaptureScore + capturedValue * 16 - attackerValue
+
+		for killerMoveIndex in range(self.NumberOfKillerMoves):
+			if move == plyKillerMoves[killerMoveIndex]:
+				return self.KillerMoveScores[killerMoveIndex]
+
+		return self.historyScores[move[0] * self.numberOfCells + move[1]]
+
+	def orderMoves(self, moves: List[Tuple[int, int]], hashMove: Tuple[int, int], ply: int) -> List[Tuple[int, int]]:
+		if self.moveOrderRandom is not None:
+			self.moveOrderRandom.shuffle(moves)
+
+		if ply == 0 and self.rootMoveScores is not None:
+			moves.sort(key = lambda move: self.HashMoveScore if move == hashMove else self.rootMoveScores.get(move, 0), reverse = True)
+			return moves
+
+		plyKillerMoves = self.killerMoves[ply]
+		moves.sort(key = lambda move: self.getMoveScore(move, hashMove, plyKillerMoves), reverse = True)
+
+		return moves
+
+	# Called with the move causing a beta cutoff, and its index in the ordered moves.
+	def onCutoff(self, move: Tuple[int, int], isQuietMove: bool, moveIndex: int, depth: int, ply: int) -> None:
+		self.numberOfCutoffs += 1
+		if moveIndex == 0:
+			self.numberOfFirstMoveCutoffs += 1
+
+		if not isQuietMove:
+			return
+
+		plyKillerMoves = self.killerMoves[ply]
+		if plyKillerMoves[0] != move:
+			plyKillerMoves[1] = plyKillerMoves[0]
+			plyKillerMoves[0] = move
+
+		historyIndex = move[0] * self.numberOfCells + move[1]
+		self.historyScores[historyIndex] += depth * depth
+		if self.historyScores[historyIndex] > self.MaximumHistoryScore:
+			self.historyScores = [historyScore >> 1 for historyScore in self.historyScores]
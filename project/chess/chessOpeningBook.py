@@ -0,0 +1,184 @@
+from typing import List, TextIO, Tuple
+import mmap
+import os
+import random
+import struct
+
+from chess.chessBoard import ChessBoard
+from chess.chessPgn import ChessPgnGame, ChessPgnReader
+from chess.chessSan import ChessSan
+
+# A book move of a position, and how often it should be played relative to the others.
+class ChessOpeningBookEntry:
+	__slots__ = (
+		"move",
+		"weight"
+	)
+
+	def __init__(self, move: Tuple[int, int], weight: int):
+		self.move = move
+		self.weight = weight
+
+# Opening book file, in the Polyglot layout: 16-byte big-endian entries (key, move, weight, learn),
+# sorted by key. The file is memory-mapped and binary-searched, so lookups read a few pages only.
+# Keys are the board's Zobrist hashes (ChessBoard.getHash) rather than the Polyglot ones,
+# so books come from ChessOpeningBookBuilder. Moves are Polyglot encoded: to file (bits 0-2),
+# to rank (bits 3-5), from file (bits 6-8), from rank (bits 9-11), promotion (bits 12-14, 4 for a queen),
+# ranks counted from the first team's side, castles being the king moving to its rook's cell.
+class ChessOpeningBook():
+	EntryStruct = struct.Struct(">QHHI")
+	KeyStruct = struct.Struct(">Q")
+	EntrySize = 16
+
+	PolyglotQueenPromotion = 4
+
+	def __init__(self, filePath: str):
+		self.file = open(filePath, "rb")
+		self.numberOfEntries = os.fstat(self.file.fileno()).st_size // self.EntrySize
+
+		# Empty files cannot be mapped.
+		self.data = b""
+		if self.numberOfEntries > 0:
+			self.data = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+
+	def close(self) -> None:
+		if isinstance(self.data, mmap.mmap):
+			self.data.close()
+
+		self.file.close()
+
+	@staticmethod
+	def encodeMove(board: ChessBoard, move: Tuple[int, int]) -> int:
+		activeCellCoordinates = board.getCellCoordinatesFromIndex(move[0])
+		targetCellCoordinates = board.getCellCoordinatesFromIndex(move[1])
+
+		bookMove = targetCellCoordinates[0] | ((board.cellHeight - 1 - targetCellCoordinates[1]) << 3)
+		bookMove |= (activeCellCoordinates[0] | ((board.cellHeight - 1 - activeCellCoordinates[1]) << 3)) << 6
+
+		boardMove = board.getMoveFromTargetCell(move[0], move[1])
+		if boardMove is not None and boardMove.promotionPieceTypeId > -1:
+			bookMove |= ChessOpeningBook.PolyglotQueenPromotion << 12
+
+		return bookMove
+
+	@staticmethod
+	def decodeMove(board: ChessBoard, bookMove: int) -> Tuple[int, int]:
+		activeCellIndex = board.getCellIndexFromCoordinates([(bookMove >> 6) & 0x7, board.cellHeight - 1 - ((bookMove >> 9) & 0x7)])
+		targetCellIndex = board.getCellIndexFromCoordinates([bookMove & 0x7, board.cellHeight - 1 - ((bookMove >> 3) & 0x7)])
+
+		return (activeCellIndex, targetCellIndex)
+
+	def getEntryKey(self, entryIndex: int) -> int:
+		return self.KeyStruct.unpack_from(self.data, entryIndex * self.EntrySize)[0]
+
+	# Index of the first entry with the given key (or a greater one).
+	def findFirstEntryIndex(self, key: int) -> int:
+		lowEntryIndex = 0
+		highEntryIndex = self.numberOfEntries
+
+		while lowEntryIndex < highEntryIndex:
+			middleEntryIndex = (lowEntryIndex + highEntryIndex) // 2
+			if self.getEntryKey(middleEntryIndex) < key:
+				lowEntryIndex = middleEntryIndex + 1
+			else:
+				highEntryIndex = middleEntryIndex
+
+		return lowEntryIndex
+
+	# Book moves of the board position, for the team to move. Moves which are not legal
+	# (from another position with the same hash) are left out.
+	def getEntries(self, board: ChessBoard) -> List[ChessOpeningBookEntry]:
+		key = board.getHash()
+
+		entries: list[ChessOpeningBookEntry] = []
+		for entryIndex in range(self.findFirstEntryIndex(key), self.numberOfEntries):
+			(entryKey, bookMove, weight, learn) = self.EntryStruct.unpack_from(self.data, entryIndex * self.EntrySize)
+			if entryKey != key:
+				break
+
+			move = self.decodeMove(board, bookMove)
+			piece = board.getPieceFromCell(move[0])
+			if piece is None or piece.teamIndex != board.turnTeamIndex or move[1] not in board.getValidTargetCellIndices(move[0]):
+				continue
+
+			entries.append(ChessOpeningBookEntry(move, weight))
+
+		return entries
+
+	# Picks one of the book moves at random, in proportion to their weights. None when out of book.
+	def chooseMove(self, board: ChessBoard, moveRandom: random.Random = None) -> Tuple[int, int]:
+		entries = [entry for entry in self.getEntries(board) if entry.weight > 0]
+		if len(entries) == 0:
+			return None
+
+		if moveRandom is None:
+			moveRandom = random
+
+		return moveRandom.choices([entry.move for entry in entries], [entry.weight for entry in entries])[0]
+
+# Builds an opening book from games: every move of the first maximumPly plies of each game
+# is weighted by the game result, for the team which played it (2 for a win, 1 for a draw
+# or an unknown result, 0 for a loss). Weights are scaled down to 16 bits when written.
+class ChessOpeningBookBuilder():
+	DefaultMaximumPly = 20
+
+	# Per result, the weights of the first and second team's moves.
+	ResultWeights = {
+		"1-0": [2, 0],
+		"0-1": [0, 2],
+		"1/2-1/2": [1, 1],
+		"*": [1, 1]
+	}
+
+	def __init__(self, board: ChessBoard, maximumPly: int = DefaultMaximumPly):
+		self.board = board
+		self.maximumPly = maximumPly
+
+		# (position hash, book move) -> weight
+		self.moveWeights: dict[tuple[int, int], int] = {}
+		self.numberOfGames = 0
+
+	# Replays the game from its start position (FEN header, or the standard one), up to an unresolved move.
+	def addGame(self, game: ChessPgnGame) -> int:
+		board = self.board
+
+		if board.loadFromFen(game.getStartFen()) < 0:
+			return -1
+
+		resultWeights = self.ResultWeights.get(game.result, self.ResultWeights["*"])
+		chessSan = ChessSan(board)
+
+		for san in game.sanMoves[:self.maximumPly]:
+			move = chessSan.getMoveFromSan(san)
+			if move is None:
+				break
+
+			moveKey = (board.getHash(), self.encodeMove(move))
+			self.moveWeights[moveKey] = self.moveWeights.get(moveKey, 0) + resultWeights[board.turnTeamIndex]
+
+			board.makeMove(board.getMoveFromTargetCell(move[0], move[1]))
+
+		self.numberOfGames += 1
+
+		return 0
+
+	def encodeMove(self, move: Tuple[int, int]) -> int:
+		return ChessOpeningBook.encodeMove(self.board, move)
+
+	def addPgn(self, stream: TextIO) -> None:
+		for game in ChessPgnReader(stream).readGames():
+			self.addGame(game)
+
+	# Writes the book, leaving out moves weighted less than minimumWeight. Returns the number of entries.
+	def write(self, filePath: str, minimumWeight: int = 1) -> int:
+		moveWeights = [(key, bookMove, weight) for ((key, bookMove), weight) in self.moveWeights.items() if weight >= minimumWeight]
+		moveWeights.sort(key = lambda moveWeight: (moveWeight[0], -moveWeight[2], moveWeight[1]))
+
+		maximumWeight = max([weight for (key, bookMove, weight) in moveWeights], default = 0)
+		weightDivisor = max(1, -(-maximumWeight // 0xFFFF))
+
+		with open(filePath, "wb") as file:
+			for (key, bookMove, weight) in moveWeights:
+				file.write(ChessOpeningBook.EntryStruct.pack(key, bookMove, max(weight // weightDivisor, 1), 0))
+
+		return len(moveWeights)
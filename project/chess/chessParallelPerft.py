@@ -0,0 +1,135 @@
+from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from array import array
+import os
+import time
+
+from chess.chessBoard import ChessBoard
+from chess.bitboardChessBoard import BitboardChessBoard
+from chess.chessPerft import ChessPerft
+from chess.chessPositionCodec import ChessPositionCodec
+from chess.chessWorkerBoards import getWorkerBoard
+
+# Runs in a worker process. Returns (process id, node count or leaf hashes, seconds).
+# Leaf hashes are returned as 64-bit words, which are much cheaper to send back than a set.
+def runWorkerTask(encodedPosition: bytes, depth: int, useBitboardBoard: bool, enumeratePositions: bool) -> tuple:
+	startTime = time.perf_counter()
+
+	board = getWorkerBoard(useBitboardBoard)
+	ChessPositionCodec(board).decodePosition(encodedPosition)
+
+	chessPerft = ChessPerft(board)
+	if enumeratePositions:
+		leafHashes: set[int] = set()
+		chessPerft.collectLeafHashes(depth, leafHashes)
+		result = array("Q", leafHashes).tobytes()
+	else:
+		result = chessPerft.countNodes(depth)
+
+	return (os.getpid(), result, time.perf_counter() - startTime)
+
+class ChessPerftWorkerStatistics:
+	def __init__(self, processId: int):
+		self.processId = processId
+		self.numberOfTasks = 0
+		self.numberOfNodes = 0
+		self.seconds = 0.0
+
+	def getNodesPerSecond(self) -> int:
+		return int(self.numberOfNodes / max(self.seconds, 0.001))
+
+# Perft and position enumeration split across worker processes.
+# The tree is expanded to splitDepth plies in this process, and each resulting position
+# is shipped to a worker encoded by ChessPositionCodec, to be searched for the remaining depth.
+class ChessParallelPerft():
+	def __init__(self, board: ChessBoard, numberOfWorkers: int = -1, splitDepth: int = 1):
+		self.board = board
+		self.numberOfWorkers = os.cpu_count() if numberOfWorkers < 1 else numberOfWorkers
+		self.splitDepth = max(splitDepth, 1)
+		self.useBitboardBoard = isinstance(board, BitboardChessBoard)
+
+		self.numberOfNodes = 0
+		self.milliseconds = 0
+		self.workerStatistics: dict[int, ChessPerftWorkerStatistics] = {}
+
+	# Returns (root move, encoded position) pairs for the positions at the split depth.
+	def createTasks(self, depth: int, rootMove: Tuple[int, int] = None) -> List[tuple]:
+		if depth == 0:
+			return [(rootMove, ChessPositionCodec(self.board).encodePosition())]
+
+		board = self.board
+		chessPerft = ChessPerft(board)
+
+		tasks: list[tuple] = []
+		for move in chessPerft.getMoves():
+			undoInfo = board.makeMove(board.getMoveFromTargetCell(move[0], move[1]))
+			tasks += self.createTasks(depth - 1, move if rootMove is None else rootMove)
+			board.unmakeMove(undoInfo)
+
+		return tasks
+
+	def runTasks(self, depth: int, enumeratePositions: bool) -> List[tuple]:
+		splitDepth = min(self.splitDepth, depth)
+		tasks = self.createTasks(splitDepth)
+
+		self.workerStatistics = {}
+
+		results: list[tuple] = []
+		with ProcessPoolExecutor(max_workers = self.numberOfWorkers) as executor:
+			futureRootMoves = {executor.submit(runWorkerTask, encodedPosition, depth - splitDepth, self.useBitboardBoard, enumeratePositions): rootMove for (rootMove, encodedPosition) in tasks}
+
+			for future in as_completed(futureRootMoves):
+				(processId, result, seconds) = future.result()
+				results.append((futureRootMoves[future], result))
+
+				if processId not in self.workerStatistics:
+					self.workerStatistics[processId] = ChessPerftWorkerStatistics(processId)
+
+				workerStatistics = self.workerStatistics[processId]
+				workerStatistics.numberOfTasks += 1
+				workerStatistics.numberOfNodes += len(result) // 8 if enumeratePositions else result
+				workerStatistics.seconds += seconds
+
+		return results
+
+	def perft(self, depth: int) -> int:
+		if depth == 0:
+			return 1
+
+		return sum(nodeCount for (move, nodeCount) in self.divide(depth))
+
+	def divide(self, depth: int) -> List[Tuple[Tuple[int, int], int]]:
+		startTime = time.perf_counter()
+
+		rootMoves: list[Tuple[int, int]] = ChessPerft(self.board).getMoves()
+		rootMoveNodeCounts: dict[Tuple[int, int], int] = {rootMove: 0 for rootMove in rootMoves}
+
+		if depth > 0:
+			for (rootMove, nodeCount) in self.runTasks(depth, False):
+				rootMoveNodeCounts[rootMove] += nodeCount
+
+		moveNodeCounts = [(rootMove, rootMoveNodeCounts[rootMove]) for rootMove in rootMoves]
+
+		self.numberOfNodes = sum(nodeCount for (move, nodeCount) in moveNodeCounts)
+		self.milliseconds = int((time.perf_counter() - startTime) * 1000)
+
+		return moveNodeCounts
+
+	# Hashes of the distinct positions reached at the given depth.
+	def enumeratePositions(self, depth: int) -> set:
+		startTime = time.perf_counter()
+
+		leafHashes: set[int] = set()
+		if depth == 0:
+			leafHashes.add(self.board.getHash())
+		else:
+			for (rootMove, rootMoveLeafHashes) in self.runTasks(depth, True):
+				leafHashes.update(memoryview(rootMoveLeafHashes).cast("Q"))
+
+		self.numberOfNodes = len(leafHashes)
+		self.milliseconds = int((time.perf_counter() - startTime) * 1000)
+
+		return leafHashes
+
+	def getNodesPerSecond(self) -> int:
+		return int(self.numberOfNodes * 1000 / max(self.milliseconds, 1))
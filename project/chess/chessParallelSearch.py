@@ -0,0 +1,128 @@
+from typing import Dict
+from concurrent.futures import ProcessPoolExecutor
+import random
+
+from chess.chessBoard import ChessBoard
+from chess.bitboardChessBoard import BitboardChessBoard
+from chess.chessSearch import ChessSearch, ChessSearchLimits, ChessSearchResult
+from chess.transpositionTable import TranspositionTable
+from chess.chessWorkerBoards import getWorkerBoard
+from chess.chessPositionCodec import ChessPositionCodec
+from chess.chessTablebase import ChessTablebases
+
+# Shared transposition table (by shared memory name) and tablebases (by directory path),
+# attached once per worker process, as workers are kept across searches.
+workerTranspositionTables: Dict[str, TranspositionTable] = {}
+workerTablebases: Dict[str, ChessTablebases] = {}
+
+# Runs in a worker process: searches the encoded position, sharing the transposition table by name
+# (and the tablebases by directory, their files being mapped again by every worker).
+def runSearchWorker(encodedPosition: bytes, useBitboardBoard: bool, sharedMemoryName: str, transpositionTableSizeMb: float, generation: int, limits: ChessSearchLimits, workerIndex: int, seed: int, tablebasesDirectoryPath: str = None) -> ChessSearchResult:
+	board = getWorkerBoard(useBitboardBoard)
+	ChessPositionCodec(board).decodePosition(encodedPosition)
+
+	if sharedMemoryName not in workerTranspositionTables:
+		workerTranspositionTables[sharedMemoryName] = TranspositionTable.attachShared(sharedMemoryName, transpositionTableSizeMb)
+
+	transpositionTable = workerTranspositionTables[sharedMemoryName]
+	transpositionTable.generation = generation
+
+	tablebases: ChessTablebases = None
+	if tablebasesDirectoryPath is not None:
+		if tablebasesDirectoryPath not in workerTablebases:
+			workerTablebases[tablebasesDirectoryPath] = ChessTablebases(tablebasesDirectoryPath)
+
+		tablebases = workerTablebases[tablebasesDirectoryPath]
+
+	chessSearch = ChessSearch(board, transpositionTable)
+	chessSearch.agesTranspositionTable = False
+	chessSearch.tablebases = tablebases
+	ChessParallelSearch.diversifySearch(chessSearch, workerIndex, seed)
+
+	return chessSearch.search(limits)
+
+# Lazy SMP search: every worker process searches the same root position, with
+# diversified depths and move orders, sharing results through a transposition
+# table in shared memory. The deepest completed result is played.
+# With a single worker, the search runs in this process on the given transposition table,
+# and is deterministic.
+# The worker processes and the shared transposition table (sized as the given table) are
+# created by the first search and kept across searches (eg of the board's next positions),
+# until closed.
+class ChessParallelSearch():
+	def __init__(self, board: ChessBoard, numberOfWorkers: int, transpositionTable: TranspositionTable = None, seed: int = 0):
+		self.board = board
+		self.numberOfWorkers = max(numberOfWorkers, 1)
+		self.seed = seed
+
+		if transpositionTable is None:
+			transpositionTable = TranspositionTable()
+
+		self.transpositionTable = transpositionTable
+
+		self.sharedTranspositionTable: TranspositionTable = None
+		self.executor: ProcessPoolExecutor = None
+
+		# When set (ChessTablebases), every search probes them.
+		self.tablebases: ChessTablebases = None
+
+		self.workerResults: list[ChessSearchResult] = []
+
+	# Worker 0 runs the plain search. Odd workers start one iteration deeper,
+	# and every helper orders moves with its own random generator.
+	@staticmethod
+	def diversifySearch(chessSearch: ChessSearch, workerIndex: int, seed: int) -> None:
+		if workerIndex == 0:
+			return
+
+		chessSearch.depthOffset = workerIndex % 2
+		chessSearch.moveOrdering.moveOrderRandom = random.Random(seed + workerIndex)
+
+	# Stops the worker processes and frees the shared transposition table.
+	def close(self) -> None:
+		if self.executor is not None:
+			self.executor.shutdown()
+			self.executor = None
+
+		if self.sharedTranspositionTable is not None:
+			self.sharedTranspositionTable.closeShared(True)
+			self.sharedTranspositionTable = None
+
+	def search(self, limits: ChessSearchLimits) -> ChessSearchResult:
+		if self.numberOfWorkers == 1:
+			chessSearch = ChessSearch(self.board, self.transpositionTable)
+			chessSearch.tablebases = self.tablebases
+			self.workerResults = [chessSearch.search(limits)]
+			return self.workerResults[0]
+
+		encodedPosition = ChessPositionCodec(self.board).encodePosition()
+		if encodedPosition is None:
+			return ChessSearchResult()
+
+		useBitboardBoard = isinstance(self.board, BitboardChessBoard)
+		tablebasesDirectoryPath = None if self.tablebases is None else self.tablebases.directoryPath
+
+		if self.sharedTranspositionTable is None:
+			self.sharedTranspositionTable = TranspositionTable.createShared(self.transpositionTable.sizeMb)
+			self.executor = ProcessPoolExecutor(max_workers = self.numberOfWorkers)
+
+		transpositionTable = self.sharedTranspositionTable
+		transpositionTable.startNewSearch()
+
+		futures = [self.executor.submit(runSearchWorker, encodedPosition, useBitboardBoard, transpositionTable.getSharedMemoryName(), transpositionTable.sizeMb, transpositionTable.generation, limits, workerIndex, self.seed, tablebasesDirectoryPath) for workerIndex in range(self.numberOfWorkers)]
+		self.workerResults = [future.result() for future in futures]
+
+		# Deepest completed iteration wins, the lowest worker index breaking ties.
+		result = ChessSearchResult()
+		for workerResult in self.workerResults:
+			if workerResult.bestMove[0] > -1 and workerResult.depth > result.depth:
+				result.bestMove = workerResult.bestMove
+				result.score = workerResult.score
+				result.depth = workerResult.depth
+				result.principalVariation = workerResult.principalVariation
+
+		result.numberOfNodes = sum(workerResult.numberOfNodes for workerResult in self.workerResults)
+		result.milliseconds = max(workerResult.milliseconds for workerResult in self.workerResults)
+		result.firstMoveCutoffRate = self.workerResults[0].firstMoveCutoffRate
+
+		return result
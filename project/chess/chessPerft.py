@@ -0,0 +1,126 @@
+from typing import List, Set, Tuple
+import time
+
+from chess.chessBoard import ChessBoard
+
+# Position to count the move tree of, along with its expected leaf node counts per depth (from depth 1).
+class ChessPerftPosition:
+	def __init__(self, name: str, fen: str, expectedNodeCounts: List[int]):
+		self.name = name
+		self.fen = fen
+		self.expectedNodeCounts = expectedNodeCounts
+
+	def loadIntoBoard(self, board: ChessBoard) -> None:
+		board.loadFromFen(self.fen)
+
+# Standard perft reference positions (see the Chess Programming Wiki "Perft Results" page).
+# Pawns only ever promote to a queen on this board, so counts including promotions
+# are those with under-promotions left out, and differ from the published ones.
+ReferencePositions = [
+	ChessPerftPosition("startpos", ChessBoard.StartingFen, [20, 400, 8902, 197281]),
+	ChessPerftPosition("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", [48, 2039, 97862, 4074224]),
+	ChessPerftPosition("position3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812, 43238, 674624]),
+	ChessPerftPosition("position4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", [6, 228, 8087, 320802]),
+	ChessPerftPosition("position5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", [41, 1373, 54007, 1806790]),
+	ChessPerftPosition("position6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10", [46, 2079, 89890, 3894594])
+]
+
+def getReferencePosition(name: str) -> ChessPerftPosition:
+	for position in ReferencePositions:
+		if position.name == name:
+			return position
+
+	return None
+
+# Counts the leaf nodes of the legal move tree of a board position, to a given depth,
+# as a correctness check and throughput benchmark of move generation.
+class ChessPerft():
+	def __init__(self, board: ChessBoard):
+		self.board = board
+
+		self.numberOfNodes = 0
+		self.milliseconds = 0
+
+	def getMoves(self) -> List[Tuple[int, int]]:
+		moves: list[Tuple[int, int]] = []
+
+		for cellIndex in self.board.getAllTeamPieceIndices(self.board.turnTeamIndex):
+			for targetCellIndex in self.board.getValidTargetCellIndices(cellIndex):
+				moves.append((cellIndex, targetCellIndex))
+
+		return moves
+
+	def countNodes(self, depth: int) -> int:
+		if depth == 0:
+			return 1
+
+		moves = self.getMoves()
+
+		# Leaves are counted without being made.
+		if depth == 1:
+			return len(moves)
+
+		board = self.board
+
+		numberOfNodes = 0
+		for move in moves:
+			undoInfo = board.makeMove(board.getMoveFromTargetCell(move[0], move[1]))
+			numberOfNodes += self.countNodes(depth - 1)
+			board.unmakeMove(undoInfo)
+
+		return numberOfNodes
+
+	# Collects the hashes of the distinct positions reached at the given depth.
+	def collectLeafHashes(self, depth: int, leafHashes: Set[int]) -> None:
+		board = self.board
+
+		if depth == 0:
+			leafHashes.add(board.getHash())
+			return
+
+		for move in self.getMoves():
+			undoInfo = board.makeMove(board.getMoveFromTargetCell(move[0], move[1]))
+			self.collectLeafHashes(depth - 1, leafHashes)
+			board.unmakeMove(undoInfo)
+
+	def perft(self, depth: int) -> int:
+		startTime = time.perf_counter()
+
+		self.numberOfNodes = self.countNodes(depth)
+		self.milliseconds = int((time.perf_counter() - startTime) * 1000)
+
+		return self.numberOfNodes
+
+	# Breaks the node count down per root move.
+	def divide(self, depth: int) -> List[Tuple[Tuple[int, int], int]]:
+		startTime = time.perf_counter()
+
+		board = self.board
+
+		moveNodeCounts: list[Tuple[Tuple[int, int], int]] = []
+		for move in self.getMoves():
+			undoInfo = board.makeMove(board.getMoveFromTargetCell(move[0], move[1]))
+			moveNodeCounts.append((move, self.countNodes(depth - 1)))
+			board.unmakeMove(undoInfo)
+
+		self.numberOfNodes = sum(nodeCount for (move, nodeCount) in moveNodeCounts)
+		self.milliseconds = int((time.perf_counter() - startTime) * 1000)
+
+		return moveNodeCounts
+
+	def enumeratePositions(self, depth: int) -> Set[int]:
+		startTime = time.perf_counter()
+
+		leafHashes: set[int] = set()
+		self.collectLeafHashes(depth, leafHashes)
+
+		self.numberOfNodes = len(leafHashes)
+		self.milliseconds = int((time.perf_counter() - startTime) * 1000)
+
+		return leafHashes
+
+	def getNodesPerSecond(self) -> int:
+		return int(self.numberOfNodes * 1000 / max(self.milliseconds, 1))
+
+	def getMoveName(self, move: Tuple[int, int]) -> str:
+		return self.board.getCellNameFromIndex(move[0]) + self.board.getCellNameFromIndex(move[1])
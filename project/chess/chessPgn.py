@@ -0,0 +1,289 @@
+from typing import Callable, Dict, Iterator, List, TextIO, Tuple
+import re
+
+from chess.chessBoard import ChessBoard
+from chess.chessSan import ChessSan
+from chess.pieceActionJournal import PieceActionJournal
+import chess.board
+
+# A game read from PGN: its tag pairs (headers), moves in SAN and result.
+class ChessPgnGame:
+	def __init__(self):
+		self.headers: dict[str, str] = {}
+		self.sanMoves: list[str] = []
+		self.result = "*"
+
+	def getStartFen(self) -> str:
+		return self.headers.get("FEN", ChessBoard.StartingFen)
+
+	# Plays the game on the board from its start position, resolving the SAN moves with the board's
+	# move generation. Returns the (activeCellIndex, targetCellIndex) moves, up to an unresolved one.
+	def getMoves(self, board: ChessBoard) -> List[Tuple[int, int]]:
+		if board.loadFromFen(self.getStartFen()) < 0:
+			return []
+
+		chessSan = ChessSan(board)
+
+		moves: list[tuple[int, int]] = []
+		for san in self.sanMoves:
+			move = chessSan.getMoveFromSan(san)
+			if move is None:
+				print("ChessPgnGame::getMoves - Unresolved move " + san)
+				break
+
+			board.performPieceAction(move[0], move[1])
+			moves.append(move)
+
+		return moves
+
+# Reads the games of a PGN text stream (eg an open file) one at a time, without loading the whole stream.
+# Comments, variations and numeric annotation glyphs are skipped.
+# With headersOnly, movetext is skipped without being split into moves (games then have no moves).
+# With a header filter, games whose headers it rejects are skipped the same way, and not returned.
+class ChessPgnReader():
+	ResultTokens = ["1-0", "0-1", "1/2-1/2", "*"]
+
+	MoveNumberPattern = re.compile(r"^\d+\.+")
+
+	# Movetext characters which change the comment or variation state.
+	MovetextStateCharacters = "{};()"
+
+	def __init__(self, stream: TextIO):
+		self.stream = stream
+
+		# Movetext state carried across lines.
+		self.isInComment = False
+		self.variationDepth = 0
+
+	def readGames(self, headersOnly: bool = False, headerFilter: Callable[[Dict[str, str]], bool] = None) -> Iterator[ChessPgnGame]:
+		game: ChessPgnGame = None
+		hasMovetext = False
+		isSkipped = False
+
+		for line in self.stream:
+			line = line.strip()
+
+			if not self.isInComment and line.startswith('['):
+				# Tag pairs after movetext start the next game (when the previous one had no result).
+				if game is not None and hasMovetext:
+					if not isSkipped:
+						yield game
+
+					game = None
+
+				if game is None:
+					game = ChessPgnGame()
+					hasMovetext = False
+
+				self.readHeader(line, game)
+				continue
+
+			if line.startswith('%') or len(line) == 0:
+				continue
+
+			if game is None:
+				game = ChessPgnGame()
+
+			if not hasMovetext:
+				hasMovetext = True
+				isSkipped = headerFilter is not None and not headerFilter(game.headers)
+
+			if headersOnly or isSkipped:
+				resultToken = self.skipMovetext(line)
+			else:
+				resultToken = None
+				for token in self.getMovetextTokens(line):
+					if token in self.ResultTokens:
+						resultToken = token
+						break
+
+					game.sanMoves.append(token)
+
+			if resultToken is not None:
+				game.result = resultToken
+				if not isSkipped:
+					yield game
+
+				game = None
+				hasMovetext = False
+				self.isInComment = False
+				self.variationDepth = 0
+
+		if game is not None:
+			if not hasMovetext:
+				isSkipped = headerFilter is not None and not headerFilter(game.headers)
+
+			if not isSkipped:
+				yield game
+
+	def readHeader(self, line: str, game: ChessPgnGame) -> None:
+		nameAndValue = line[1:].rstrip(']').split(' ', 1)
+		if len(nameAndValue) < 2:
+			return
+
+		value = nameAndValue[1].strip()
+		if value.startswith('"') and value.endswith('"'):
+			value = value[1:-1]
+
+		value = value.replace('\\"', '"').replace('\\\\', '\\')
+		game.headers[nameAndValue[0]] = value
+
+		if nameAndValue[0] == "Result":
+			game.result = value
+
+	# Fast path through a line of movetext: only lines with comments or variations are split into tokens.
+	# Returns the result token ending the game, None if the game goes on.
+	def skipMovetext(self, line: str) -> str:
+		if any(character in line for character in self.MovetextStateCharacters):
+			for token in self.getMovetextTokens(line):
+				if token in self.ResultTokens:
+					return token
+
+			return None
+
+		if self.isInComment or self.variationDepth > 0:
+			return None
+
+		lastToken = line.rsplit(None, 1)[-1]
+		return lastToken if lastToken in self.ResultTokens else None
+
+	# Splits a line of movetext into move (and result) tokens, leaving out move numbers,
+	# comments, variations and annotation glyphs.
+	def getMovetextTokens(self, line: str) -> List[str]:
+		tokens: list[str] = []
+
+		token = ""
+		for character in line + ' ':
+			if self.isInComment:
+				if character == '}':
+					self.isInComment = False
+				continue
+
+			if character in "{;()" or character.isspace():
+				token = self.MoveNumberPattern.sub("", token)
+				if len(token) > 0 and self.variationDepth == 0 and not token.startswith('$') and token != "e.p.":
+					tokens.append(token)
+
+				token = ""
+
+				if character == '{':
+					self.isInComment = True
+				elif character == ';':
+					break
+				elif character == '(':
+					self.variationDepth += 1
+				elif character == ')':
+					self.variationDepth = max(self.variationDepth - 1, 0)
+
+				continue
+
+			token += character
+
+		return tokens
+
+# Writes games as PGN to a text stream, one at a time. Games played on a board
+# are turned into SAN from its piece action history (see createGameFromHistory).
+class ChessPgnWriter():
+	# Tags written first, in this order (the seven tag roster).
+	RosterTagNames = ["Event", "Site", "Date", "Round", "White", "Black", "Result"]
+
+	MaximumLineLength = 80
+
+	def __init__(self, stream: TextIO):
+		self.stream = stream
+
+	def writeGame(self, game: ChessPgnGame) -> None:
+		headers = {**game.headers, "Result": game.result}
+
+		tagNames = [tagName for tagName in self.RosterTagNames if tagName in headers]
+		tagNames += [tagName for tagName in headers if tagName not in self.RosterTagNames]
+
+		for tagName in tagNames:
+			self.stream.write("[" + tagName + " \"" + headers[tagName].replace('\\', '\\\\').replace('"', '\\"') + "\"]\n")
+
+		self.stream.write("\n")
+
+		(startTeamIndex, startFullMoveNumber) = self.getStartMove(game)
+
+		line = ""
+		for moveIndex in range(len(game.sanMoves)):
+			plyIndex = startTeamIndex + moveIndex
+			moveNumber = str(startFullMoveNumber + plyIndex // 2)
+
+			tokens = [game.sanMoves[moveIndex]]
+			if plyIndex % 2 == 0:
+				tokens.insert(0, moveNumber + ".")
+			elif moveIndex == 0:
+				tokens.insert(0, moveNumber + "...")
+
+			for token in tokens:
+				line = self.writeToken(line, token)
+
+		line = self.writeToken(line, game.result)
+		self.stream.write(line + "\n\n")
+
+	# Appends the token to the line, writing the line out first when the token does not fit.
+	def writeToken(self, line: str, token: str) -> str:
+		if len(line) == 0:
+			return token
+
+		if len(line) + 1 + len(token) > self.MaximumLineLength:
+			self.stream.write(line + "\n")
+			return token
+
+		return line + " " + token
+
+	# Team to move and full-move number of the game's start position.
+	def getStartMove(self, game: ChessPgnGame) -> Tuple[int, int]:
+		fenFields = game.getStartFen().split()
+		startTeamIndex = 1 if len(fenFields) > 1 and fenFields[1] == "b" else 0
+		startFullMoveNumber = int(fenFields[5]) if len(fenFields) > 5 and fenFields[5].isdigit() else 1
+
+		return (startTeamIndex, startFullMoveNumber)
+
+	# Creates the game played from the start position with the piece actions of the history
+	# (eg board.pieceActionHistory), replaying them on a board of the same kind as the given one.
+	@staticmethod
+	def createGameFromHistory(board: ChessBoard, pieceActionHistory: PieceActionJournal, startFen: str = ChessBoard.StartingFen, headers: Dict[str, str] = None, result: str = "*") -> ChessPgnGame:
+		game = ChessPgnGame()
+		if headers is not None:
+			game.headers = headers.copy()
+
+		game.result = result
+
+		if startFen != ChessBoard.StartingFen:
+			game.headers["SetUp"] = "1"
+			game.headers["FEN"] = startFen
+
+		replayBoard: ChessBoard = type(board)()
+		if replayBoard.loadFromFen(startFen) < 0:
+			return game
+
+		chessSan = ChessSan(replayBoard)
+		for pieceActions in pieceActionHistory:
+			move = ChessPgnWriter.getMoveFromPieceActions(replayBoard, pieceActions)
+			if move is None:
+				print("ChessPgnWriter::createGameFromHistory - Piece actions do not match a valid move")
+				break
+
+			game.sanMoves.append(chessSan.getSanFromMove(move))
+			replayBoard.makeMove(replayBoard.getMoveFromTargetCell(move[0], move[1]))
+
+		return game
+
+	# The move made by the piece actions of a history entry: its last piece movement (a castling king's),
+	# and the target cell which makes it.
+	@staticmethod
+	def getMoveFromPieceActions(board: ChessBoard, pieceActions: List[dict]) -> Tuple[int, int]:
+		moveActions = [pieceAction for pieceAction in pieceActions if pieceAction["type"] == chess.board.BoardPieceActionType.MOVE_TO_CELL]
+		if len(moveActions) == 0:
+			return None
+
+		activeCellIndex = moveActions[-1]["fromCellIndex"]
+		toCellIndex = moveActions[-1]["toCellIndex"]
+
+		for targetCellIndex in board.getValidTargetCellIndices(activeCellIndex):
+			if board.getMoveFromTargetCell(activeCellIndex, targetCellIndex).toCellIndex == toCellIndex:
+				return (activeCellIndex, targetCellIndex)
+
+		return None
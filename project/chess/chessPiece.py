@@ -2,14 +2,92 @@ from typing import Dict, List
 import functools
 
 import chess.piece
+import chess.board
+import chess.boardMove
 import chess.chessBoard
 
 class ChessPiece(chess.piece.Piece):
+	# How this piece type moves and attacks: rays along moveDirections
+	# (at most moveDistance cells, or unlimited when negative) and
+	# single jumps by moveOffsets. Check detection relies on these.
+	moveDirections: list[list[int]] = []
+	moveDistance: int = -1
+	moveOffsets: list[list[int]] = []
+
+	# Indices of moveDirections into the board's ray tables (Board.RayDirections).
+	moveDirectionIndices: list[int] = []
+
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+
+		cls.moveDirectionIndices = [chess.board.Board.RayDirections.index(moveDirection) for moveDirection in cls.moveDirections]
+
 	def __init__(self, teamIndex: int = -1, moveCount = 0):
 		super().__init__(teamIndex, moveCount)
 	
 	def __copy__(self):
-		return ChessPiece(teamIndex = self.teamIndex, moveCount = self.moveCount)
+		# Keep the concrete piece type, as derived pieces take no constructor arguments.
+		pieceCopy = type(self)()
+		pieceCopy.teamIndex = self.teamIndex
+		pieceCopy.moveCount = self.moveCount
+
+		return pieceCopy
+
+	def getPossibleRayTargetCellIndices(self, _board, cellIndex: int) -> List[int]:
+		possibleTargetCellIndices: list[int] = []
+
+		board: chess.chessBoard.ChessBoard = _board
+		cellRays = board.cellRays[cellIndex]
+
+		for moveDirectionIndex in self.moveDirectionIndices:
+			rayCellIndices = cellRays[moveDirectionIndex]
+			if self.moveDistance > -1:
+				rayCellIndices = rayCellIndices[:self.moveDistance]
+
+			for rayCellIndex in rayCellIndices:
+				if board.isCellEmpty(rayCellIndex):
+					possibleTargetCellIndices.append(rayCellIndex)
+					continue
+
+				if board.doesCellHaveOpponentPiece(rayCellIndex, self.teamIndex):
+					possibleTargetCellIndices.append(rayCellIndex)
+
+				break
+
+		return possibleTargetCellIndices
+
+	def getPossibleOffsetTargetCellIndices(self, _board, cellIndex: int) -> List[int]:
+		board: chess.chessBoard.ChessBoard = _board
+		offsetCellIndices = board.pieceOffsetTables[type(self)][cellIndex]
+		return [offsetCellIndex for offsetCellIndex in offsetCellIndices if board.isCellEmpty(offsetCellIndex) or board.doesCellHaveOpponentPiece(offsetCellIndex, self.teamIndex)]
+
+	# Only looks at the first piece met along each ray.
+	def getPossibleRayCaptureCellIndices(self, _board, cellIndex: int) -> List[int]:
+		possibleCaptureCellIndices: list[int] = []
+
+		board: chess.chessBoard.ChessBoard = _board
+		cellRays = board.cellRays[cellIndex]
+
+		for moveDirectionIndex in self.moveDirectionIndices:
+			rayCellIndices = cellRays[moveDirectionIndex]
+			if self.moveDistance > -1:
+				rayCellIndices = rayCellIndices[:self.moveDistance]
+
+			for rayCellIndex in rayCellIndices:
+				if board.isCellEmpty(rayCellIndex):
+					continue
+
+				if board.doesCellHaveOpponentPiece(rayCellIndex, self.teamIndex):
+					possibleCaptureCellIndices.append(rayCellIndex)
+
+				break
+
+		return possibleCaptureCellIndices
+
+	def getPossibleOffsetCaptureCellIndices(self, _board, cellIndex: int) -> List[int]:
+		board: chess.chessBoard.ChessBoard = _board
+		offsetCellIndices = board.pieceOffsetTables[type(self)][cellIndex]
+		return [offsetCellIndex for offsetCellIndex in offsetCellIndices if board.doesCellHaveOpponentPiece(offsetCellIndex, self.teamIndex)]
 
 	# Most chess pieces will just use all possible target cells that have
 	# opponents in them, as most of them just move.	
@@ -18,6 +96,24 @@ class ChessPiece(chess.piece.Piece):
 		possibleTargetCellIndices = self.getPossibleTargetCellIndices(board, cellIndex)
 		return list(filter(lambda cellIndex: board.doesCellHaveOpponentPiece(cellIndex, self.teamIndex), possibleTargetCellIndices))
 
-	def getPieceActionsFromTargetCell(self, _board, activeCellIndex: int, targetCellIndex: int) -> List[dict]:
+	# Unless overridden, captures are the attacks, and pieces do not promote.
+	def getPossibleCaptureTargetCellIndices(self, _board, cellIndex: int) -> List[int]:
+		return self.getPossibleAttackCellIndices(_board, cellIndex)
+
+	def getAttackDirectionIndices(self) -> List[int]:
+		return self.moveDirectionIndices
+
+	def getAttackDistance(self) -> int:
+		return self.moveDistance
+
+	def getAttackOffsets(self) -> List[List[int]]:
+		return self.moveOffsets
+
+	# Target cells whose legality cannot be derived from checks and pins alone
+	# (eg en passant), and have to be verified by temporarily making the move.
+	def getSpecialTargetCellIndices(self, _board, cellIndex: int) -> List[int]:
+		return []
+
+	def getMoveFromTargetCell(self, _board, activeCellIndex: int, targetCellIndex: int) -> chess.boardMove.BoardMove:
 		board: chess.chessBoard.ChessBoard = _board
-		return board.getMovePieceActions(activeCellIndex, targetCellIndex)
+		return board.createMove(activeCellIndex, targetCellIndex)
@@ -3,14 +3,100 @@ from typing import Tuple
 import random
 
 from chess.chessBoard import ChessBoard
+from chess.bitboardChessBoard import BitboardChessBoard
+from chess.transpositionTable import TranspositionTable
+from chess.chessSearch import ChessSearch, ChessSearchLimits, ChessSearchResult
+from chess.chessParallelSearch import ChessParallelSearch
+from chess.chessOpeningBook import ChessOpeningBook
+from chess.chessTablebase import ChessTablebases
+from chess.chessEvaluator import ChessBatchEvaluator
 
 class ChessPlayerAi():
-	def __init__(self, chessBoard: ChessBoard, teamIndex: int):
+	DefaultSearchLimits = ChessSearchLimits(maximumMilliseconds = 1000)
+
+	# Without search limits, a random valid move is made.
+	# With an opening book, book moves are played without searching, while in book.
+	# With tablebases, the search scores the positions they cover exactly.
+	# With the batch evaluator (requires NumPy), root moves are ordered by the batch evaluation
+	# of the positions they lead to (single process searches only).
+	def __init__(self, chessBoard: ChessBoard, teamIndex: int, useBitboardBoard: bool = False, transpositionTable: TranspositionTable = None, searchLimits: ChessSearchLimits = DefaultSearchLimits, numberOfSearchWorkers: int = 1, openingBook: ChessOpeningBook = None, tablebases: ChessTablebases = None, useBatchEvaluator: bool = False):
 		self.chessBoard = chessBoard
 		self.teamIndex = teamIndex
+
+		# Search on bitboard backed copies, for faster move generation and check queries.
+		self.useBitboardBoard = useBitboardBoard
+
+		# Can be shared between players and kept across moves, to reuse previous search results.
+		if transpositionTable is None:
+			transpositionTable = TranspositionTable()
+
+		self.transpositionTable = transpositionTable
+
+		self.searchLimits = searchLimits
+		self.numberOfSearchWorkers = numberOfSearchWorkers
+		self.lastSearchResult: ChessSearchResult = None
+
+		# With several search workers, their processes and shared transposition table are kept across moves.
+		self.parallelSearch: ChessParallelSearch = None
+
+		self.openingBook = openingBook
+		self.tablebases = tablebases
+
+		# Created on first search, as its lookup tables are built from a board.
+		self.useBatchEvaluator = useBatchEvaluator
+		self.batchEvaluator: ChessBatchEvaluator = None
 	
 	def getPieceActionCells(self) -> Tuple[int]:
+		if self.openingBook is not None:
+			bookMove = self.openingBook.chooseMove(self.createPlayerBoard())
+			if bookMove is not None:
+				return bookMove
+
+		if self.searchLimits is not None:
+			pieceActionCells = self.getSearchPieceActionCells()
+			if pieceActionCells[0] > -1:
+				return pieceActionCells
+
 		return self.getRandomPieceActionCells()
+
+	# Stops the search worker processes, if any.
+	def close(self) -> None:
+		if self.parallelSearch is not None:
+			self.parallelSearch.close()
+			self.parallelSearch = None
+
+	# Copy of the current board position with this player to move, so that the given board is left untouched.
+	def createPlayerBoard(self) -> ChessBoard:
+		playerBoard: ChessBoard = BitboardChessBoard() if self.useBitboardBoard else type(self.chessBoard)()
+		playerBoard.loadFromBoard(self.chessBoard)
+		playerBoard.setTurnTeamIndex(self.teamIndex)
+
+		return playerBoard
+
+	def getSearchPieceActionCells(self) -> Tuple[int]:
+		searchBoard = self.createPlayerBoard()
+
+		if self.numberOfSearchWorkers > 1:
+			# Worker processes share a transposition table of the same size, in shared memory.
+			if self.parallelSearch is None:
+				self.parallelSearch = ChessParallelSearch(searchBoard, self.numberOfSearchWorkers, self.transpositionTable)
+
+			chessSearch = self.parallelSearch
+			chessSearch.board = searchBoard
+		else:
+			chessSearch = ChessSearch(searchBoard, self.transpositionTable)
+
+			if self.useBatchEvaluator:
+				if self.batchEvaluator is None:
+					self.batchEvaluator = ChessBatchEvaluator(searchBoard)
+
+				chessSearch.batchEvaluator = self.batchEvaluator
+
+		chessSearch.tablebases = self.tablebases
+
+		self.lastSearchResult = chessSearch.search(self.searchLimits)
+
+		return self.lastSearchResult.bestMove
 	
 	def getRandomPieceActionCells(self) -> Tuple[int]:
 		teamPieceIndices = self.chessBoard.getAllTeamPieceIndices(self.teamIndex)
@@ -0,0 +1,189 @@
+from typing import List, Tuple
+from array import array
+import sys
+
+from chess.chessBoard import ChessBoard
+
+# Compact binary encoding of chess positions and moves, for storage (dataset shards,
+# game logs) and for shipping positions to other processes instead of pickling boards.
+# A position takes PositionSize (32) bytes, so that positions can be laid out back to back:
+#   bytes 0-7   occupancy bitmap, bit n set when cell n holds a piece (little endian)
+#   bytes 8-23  4-bit codes of the pieces on the occupied cells, in cell order, low nibble first:
+#               piece type id + 1, team index at bit 3
+#   byte 24     team to move (bit 0), castling rights (bits 1-4, for K, Q, k and q)
+#   byte 25     en passant cell index, NoCell if none
+#   byte 26     half-move clock, capped at 255
+#   bytes 27-28 full-move number, capped at 65535 (little endian)
+#   bytes 29-31 zero
+# A move takes 16 bits: target cell index (bits 0-5), active cell index (bits 6-11),
+# as TranspositionTable.encodeMove, and promotion piece type id + 1 (bits 12-15, 0 if none).
+# Boards of more than 64 cells, and piece sets of more than 7 piece types, cannot be encoded.
+class ChessPositionCodec():
+	PositionSize = 32
+	MoveSize = 2
+
+	MaximumNumberOfPieces = 32
+	MaximumNumberOfCells = 64
+	MaximumNumberOfPieceTypes = 7
+	NoCell = 0xFF
+
+	CastlingCharacters = "KQkq"
+
+	OccupancyOffset = 0
+	PieceCodesOffset = 8
+	StateOffset = 24
+	EnPassantCellOffset = 25
+	HalfMoveClockOffset = 26
+	FullMoveNumberOffset = 27
+
+	def __init__(self, board: ChessBoard):
+		self.board = board
+
+	def encodePosition(self) -> bytes:
+		encodedPosition = bytearray(self.PositionSize)
+		if self.encodePositionInto(encodedPosition, 0) < 0:
+			return None
+
+		return bytes(encodedPosition)
+
+	# Writes the board position at the given offset of a writable buffer (eg a shard being filled).
+	def encodePositionInto(self, buffer, offset: int) -> int:
+		board = self.board
+
+		if board.getNumberOfCells() > self.MaximumNumberOfCells:
+			print("ChessPositionCodec::encodePositionInto - Too many cells")
+			return -1
+
+		if len(board.pieceSet.pieceTypes) > self.MaximumNumberOfPieceTypes:
+			print("ChessPositionCodec::encodePositionInto - Too many piece types")
+			return -1
+
+		pieceCellIndices = sorted(board.getAllPieceIndices())
+		if len(pieceCellIndices) > self.MaximumNumberOfPieces:
+			print("ChessPositionCodec::encodePositionInto - Too many pieces")
+			return -1
+
+		buffer[offset:offset + self.PositionSize] = bytes(self.PositionSize)
+
+		occupancy = 0
+		for pieceIndex in range(len(pieceCellIndices)):
+			cellIndex = pieceCellIndices[pieceIndex]
+			piece = board.getPieceFromCell(cellIndex)
+
+			occupancy |= 1 << cellIndex
+			pieceCode = (board.pieceSet.getTypeIdFromPiece(piece) + 1) | (piece.teamIndex << 3)
+			buffer[offset + self.PieceCodesOffset + (pieceIndex >> 1)] |= pieceCode << ((pieceIndex & 1) * 4)
+
+		buffer[offset + self.OccupancyOffset:offset + self.OccupancyOffset + 8] = occupancy.to_bytes(8, "little")
+
+		state = board.turnTeamIndex
+		castlingRights = board.getCastlingRights()
+		for castlingIndex in range(len(self.CastlingCharacters)):
+			if self.CastlingCharacters[castlingIndex] in castlingRights:
+				state |= 1 << (castlingIndex + 1)
+
+		buffer[offset + self.StateOffset] = state
+		buffer[offset + self.EnPassantCellOffset] = self.NoCell if board.enPassantCellIndex < 0 else board.enPassantCellIndex
+		buffer[offset + self.HalfMoveClockOffset] = min(board.halfMoveClock, 0xFF)
+		buffer[offset + self.FullMoveNumberOffset:offset + self.FullMoveNumberOffset + 2] = min(board.fullMoveNumber, 0xFFFF).to_bytes(2, "little")
+
+		return 0
+
+	# Replaces the board position (dropping its history) with the one at the given offset.
+	# Reads straight from the data (bytes, bytearray, memoryview or mmap), without copying it.
+	# Pieces are created with a move count of 0, and only the kings' and rooks' move counts
+	# are then restored, as far as the castling rights tell (see ChessBoard.setCastlingRights):
+	# move counts of the encoded board's other pieces are not kept.
+	def decodePosition(self, data, offset: int = 0) -> int:
+		board = self.board
+
+		if board.getNumberOfCells() > self.MaximumNumberOfCells:
+			print("ChessPositionCodec::decodePosition - Too many cells")
+			return -1
+
+		if len(data) < offset + self.PositionSize:
+			print("ChessPositionCodec::decodePosition - Data too short")
+			return -1
+
+		occupancy = int.from_bytes(data[offset + self.OccupancyOffset:offset + self.OccupancyOffset + 8], "little")
+
+		pieceIndex = 0
+		for cellIndex in range(board.getNumberOfCells()):
+			if (occupancy >> cellIndex) & 1 == 0:
+				board.setCellContents(cellIndex, [])
+				continue
+
+			pieceCode = (data[offset + self.PieceCodesOffset + (pieceIndex >> 1)] >> ((pieceIndex & 1) * 4)) & 0xF
+			pieceIndex += 1
+
+			piece = board.pieceSet.createPieceFromTypeId((pieceCode & 0x7) - 1)
+			piece.teamIndex = pieceCode >> 3
+			board.setCellContents(cellIndex, [piece])
+
+		board.clearHistory()
+
+		state = data[offset + self.StateOffset]
+		board.setCastlingRights("".join(self.CastlingCharacters[castlingIndex] for castlingIndex in range(len(self.CastlingCharacters)) if (state >> (castlingIndex + 1)) & 1))
+		board.setTurnTeamIndex(state & 1)
+
+		enPassantCellIndex = data[offset + self.EnPassantCellOffset]
+		board.setEnPassantCellIndex(-1 if enPassantCellIndex == self.NoCell else enPassantCellIndex)
+
+		board.halfMoveClock = data[offset + self.HalfMoveClockOffset]
+		board.fullMoveNumber = max(int.from_bytes(data[offset + self.FullMoveNumberOffset:offset + self.FullMoveNumberOffset + 2], "little"), 1)
+
+		return 0
+
+	@staticmethod
+	def getNumberOfPositions(data) -> int:
+		return len(data) // ChessPositionCodec.PositionSize
+
+	@staticmethod
+	def encodeMove(activeCellIndex: int, targetCellIndex: int, promotionPieceTypeId: int = -1) -> int:
+		if max(activeCellIndex, targetCellIndex) >= ChessPositionCodec.MaximumNumberOfCells:
+			print("ChessPositionCodec::encodeMove - Cell index out of range")
+			return -1
+
+		return ((promotionPieceTypeId + 1) << 12) | (activeCellIndex << 6) | targetCellIndex
+
+	# Returns the (activeCellIndex, targetCellIndex) move.
+	@staticmethod
+	def decodeMove(encodedMove: int) -> Tuple[int, int]:
+		return ((encodedMove >> 6) & 0x3F, encodedMove & 0x3F)
+
+	@staticmethod
+	def getPromotionPieceTypeId(encodedMove: int) -> int:
+		return (encodedMove >> 12) - 1
+
+	# Encodes a move of the board's current position, along with the promotion the board makes for it.
+	# Returns -1 when the move does not fit (see encodeMove).
+	def encodeBoardMove(self, activeCellIndex: int, targetCellIndex: int) -> int:
+		boardMove = self.board.getMoveFromTargetCell(activeCellIndex, targetCellIndex)
+		return self.encodeMove(activeCellIndex, targetCellIndex, boardMove.promotionPieceTypeId)
+
+	# Moves back to back, 16 bits each (little endian). Moves are (activeCellIndex, targetCellIndex)
+	# pairs, or (activeCellIndex, targetCellIndex, promotionPieceTypeId) for promotions.
+	# Returns None when a move does not fit (see encodeMove).
+	@staticmethod
+	def encodeMoves(moves: List[Tuple[int, ...]]) -> bytes:
+		encodedMoveList = [ChessPositionCodec.encodeMove(*move) for move in moves]
+		if min(encodedMoveList, default = 0) < 0:
+			return None
+
+		encodedMoves = array("H", encodedMoveList)
+		if sys.byteorder == "big":
+			encodedMoves.byteswap()
+
+		return encodedMoves.tobytes()
+
+	# With includePromotions set, moves are (activeCellIndex, targetCellIndex, promotionPieceTypeId), -1 if none.
+	@staticmethod
+	def decodeMoves(data, includePromotions: bool = False) -> List[Tuple[int, ...]]:
+		encodedMoves = memoryview(data).cast("B").cast("H")
+		if sys.byteorder == "big":
+			encodedMoves = [((encodedMove & 0xFF) << 8) | (encodedMove >> 8) for encodedMove in encodedMoves]
+
+		if includePromotions:
+			return [ChessPositionCodec.decodeMove(encodedMove) + (ChessPositionCodec.getPromotionPieceTypeId(encodedMove),) for encodedMove in encodedMoves]
+
+		return [ChessPositionCodec.decodeMove(encodedMove) for encodedMove in encodedMoves]
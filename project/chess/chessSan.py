@@ -0,0 +1,163 @@
+from typing import Tuple
+
+from chess.chessBoard import ChessBoard
+
+# Standard Algebraic Notation (eg "Nf3", "exd5", "O-O", "e8=Q+") of moves, for the team to move on the board.
+# Moves are read from SAN (getMoveFromSan) and written as SAN (getSanFromMove).
+# Moves are (activeCellIndex, targetCellIndex) tuples, castles being the king selecting its rook's cell.
+# Pawns only promote to a queen on this board, so under-promotions do not resolve.
+class ChessSan():
+	PawnCharacter = 'P'
+
+	# Suffixes which do not change the move: check, mate and annotations.
+	IgnoredSuffixCharacters = "+#!?"
+
+	def __init__(self, board: ChessBoard):
+		self.board = board
+
+		# Piece type ids per (upper case) SAN piece character.
+		self.characterPieceTypeIds: dict[str, list[int]] = {}
+		for pieceType in board.pieceSet.pieceTypes:
+			character = board.pieceSet.getCharacterFromPieceType(pieceType)
+			if character not in self.characterPieceTypeIds:
+				self.characterPieceTypeIds[character] = []
+
+			self.characterPieceTypeIds[character].append(board.pieceSet.getTypeIdFromPieceType(pieceType))
+
+	# Returns the legal move written as the given SAN, None if there is no such move (or it is ambiguous).
+	def getMoveFromSan(self, san: str) -> Tuple[int, int]:
+		board = self.board
+		teamIndex = board.turnTeamIndex
+
+		san = san.rstrip(self.IgnoredSuffixCharacters)
+		if len(san) < 2:
+			return None
+
+		if san in ["O-O", "0-0", "O-O-O", "0-0-0"]:
+			homeRow = board.getHomeRow(teamIndex)
+			rookCellIndex = board.getCellIndexFromCoordinates([board.cellWidth - 1 if len(san) == 3 else 0, homeRow])
+
+			for kingCellIndex in board.getAllKingIndices(teamIndex):
+				if rookCellIndex in board.getValidTargetCellIndices(kingCellIndex):
+					return (kingCellIndex, rookCellIndex)
+
+			return None
+
+		promotionCharacter = None
+		if '=' in san:
+			(san, promotionCharacter) = san.split('=', 1)
+		elif san[-1].isalpha() and san[-1].isupper() and len(san) > 2 and san[-2].isdigit():
+			(san, promotionCharacter) = (san[:-1], san[-1])
+
+		if promotionCharacter is not None and promotionCharacter != 'Q':
+			return None
+
+		pieceCharacter = self.PawnCharacter
+		if san[0].isupper():
+			pieceCharacter = san[0]
+			san = san[1:]
+
+		san = san.replace('x', '').replace('-', '')
+		if len(san) < 2 or pieceCharacter not in self.characterPieceTypeIds:
+			return None
+
+		targetCellIndex = board.getCellIndexFromName(san[-2:])
+		if targetCellIndex < 0:
+			return None
+
+		# Disambiguation, by the active piece's file and/or rank.
+		disambiguation = san[:-2]
+		activeFile = -1
+		activeRank = -1
+		for character in disambiguation:
+			if character.isdigit():
+				activeRank = int(character)
+			elif character.islower():
+				activeFile = ord(character) - ord('a')
+			else:
+				return None
+
+		move: Tuple[int, int] = None
+		for activeCellIndex in board.getAllPieceTypeIndices(self.characterPieceTypeIds[pieceCharacter], teamIndex):
+			activeCellCoordinates = board.getCellCoordinatesFromIndex(activeCellIndex)
+			if activeFile > -1 and activeCellCoordinates[0] != activeFile:
+				continue
+
+			if activeRank > -1 and board.cellHeight - activeCellCoordinates[1] != activeRank:
+				continue
+
+			if targetCellIndex not in board.getValidTargetCellIndices(activeCellIndex):
+				continue
+
+			if move is not None:
+				return None
+
+			move = (activeCellIndex, targetCellIndex)
+
+		return move
+
+	# Returns the SAN of a legal move, with its check or mate suffix.
+	def getSanFromMove(self, move: Tuple[int, int]) -> str:
+		board = self.board
+		teamIndex = board.turnTeamIndex
+
+		boardMove = board.getMoveFromTargetCell(move[0], move[1])
+		if boardMove is None:
+			return None
+
+		piece = board.getPieceFromCell(move[0])
+		pieceCharacter = board.pieceSet.getCharacterFromPiece(piece).upper()
+
+		if boardMove.secondaryFromCellIndex > -1 and board.pieceSet.getTypeIdFromPiece(piece) in board.kingPieceTypeIds:
+			san = "O-O" if boardMove.secondaryFromCellIndex > boardMove.fromCellIndex else "O-O-O"
+		else:
+			activeCellName = board.getCellNameFromIndex(move[0])
+			isCapture = boardMove.captureCellIndex > -1
+
+			san = ""
+			if pieceCharacter == self.PawnCharacter:
+				if isCapture:
+					san = activeCellName[0]
+			else:
+				san = pieceCharacter + self.getDisambiguation(move, pieceCharacter)
+
+			if isCapture:
+				san += 'x'
+
+			san += board.getCellNameFromIndex(boardMove.toCellIndex)
+
+			if boardMove.promotionPieceTypeId > -1:
+				san += '=' + board.pieceSet.getCharacterFromPieceType(board.pieceSet.pieceTypes[boardMove.promotionPieceTypeId]).upper()
+
+		undoInfo = board.makeMove(boardMove)
+		try:
+			if board.isKingInCheck(1 - teamIndex):
+				san += '+' if board.areThereValidMoves(1 - teamIndex) else '#'
+		finally:
+			board.unmakeMove(undoInfo)
+
+		return san
+
+	# File, rank or both of the active cell, when other pieces of the same kind can move to the same cell.
+	def getDisambiguation(self, move: Tuple[int, int], pieceCharacter: str) -> str:
+		board = self.board
+
+		otherActiveCellIndices: list[int] = []
+		for activeCellIndex in board.getAllPieceTypeIndices(self.characterPieceTypeIds[pieceCharacter], board.turnTeamIndex):
+			if activeCellIndex != move[0] and move[1] in board.getValidTargetCellIndices(activeCellIndex):
+				otherActiveCellIndices.append(activeCellIndex)
+
+		if len(otherActiveCellIndices) == 0:
+			return ""
+
+		activeCellName = board.getCellNameFromIndex(move[0])
+		activeCellCoordinates = board.getCellCoordinatesFromIndex(move[0])
+		otherActiveCellCoordinates = [board.getCellCoordinatesFromIndex(cellIndex) for cellIndex in otherActiveCellIndices]
+
+		if all(cellCoordinates[0] != activeCellCoordinates[0] for cellCoordinates in otherActiveCellCoordinates):
+			return activeCellName[0]
+
+		if all(cellCoordinates[1] != activeCellCoordinates[1] for cellCoordinates in otherActiveCellCoordinates):
+			return activeCellName[1:]
+
+		return activeCellName
@@ -0,0 +1,409 @@
+from typing import Callable, List, Tuple
+import time
+
+from chess.chessBoard import ChessBoard
+from chess.transpositionTable import TranspositionTable
+from chess.chessMoveOrdering import ChessMoveOrdering
+from chess.chessTablebase import ChessTablebase
+import chess.pawnChessPiece
+import chess.rookChessPiece
+import chess.knightChessPiece
+import chess.bishopChessPiece
+import chess.queenChessPiece
+
+# Limits of a search, -1 meaning unlimited. The search stops at whichever limit is reached first.
+class ChessSearchLimits:
+	__slots__ = (
+		"maximumDepth",
+		"maximumNodes",
+		"maximumMilliseconds"
+	)
+
+	def __init__(self, maximumDepth: int = -1, maximumNodes: int = -1, maximumMilliseconds: int = -1):
+		self.maximumDepth = maximumDepth
+		self.maximumNodes = maximumNodes
+		self.maximumMilliseconds = maximumMilliseconds
+
+# Outcome of the last completed iteration of a search.
+# Moves are (activeCellIndex, targetCellIndex) tuples, and the score is from the point of view of the team to move.
+class ChessSearchResult:
+	__slots__ = (
+		"bestMove",
+		"score",
+		"depth",
+		"numberOfNodes",
+		"milliseconds",
+		"principalVariation",
+		"firstMoveCutoffRate"
+	)
+
+	def __init__(self):
+		self.bestMove: Tuple[int, int] = (-1, -1)
+		self.score = 0
+		self.depth = 0
+		self.numberOfNodes = 0
+		self.milliseconds = 0
+		self.principalVariation: list[Tuple[int, int]] = []
+		self.firstMoveCutoffRate = 0.0
+
+	def getNodesPerSecond(self) -> int:
+		return int(self.numberOfNodes * 1000 / max(self.milliseconds, 1))
+
+	def isMateScore(self) -> bool:
+		return abs(self.score) >= ChessSearch.MateScore - ChessSearch.MaximumPly
+
+class ChessSearchStopped(Exception):
+	pass
+
+# Negamax alpha-beta search with iterative deepening, over a chess board
+# whose turnTeamIndex is the team to search for. Moves are made and unmade in place.
+class ChessSearch():
+	InfinityScore = 32000
+	MateScore = 31000
+	MaximumPly = 128
+
+	# Checking limits on every node would cost more than the nodes themselves.
+	NumberOfNodesBetweenLimitChecks = 256
+
+	# Quiescence search skips captures which cannot raise alpha, even winning this much more.
+	DeltaPruningMargin = 200
+
+	PieceTypeValues = [
+		(chess.pawnChessPiece.PawnChessPiece, 100),
+		(chess.knightChessPiece.KnightChessPiece, 320),
+		(chess.bishopChessPiece.BishopChessPiece, 330),
+		(chess.rookChessPiece.RookChessPiece, 500),
+		(chess.queenChessPiece.QueenChessPiece, 900)
+	]
+
+	def __init__(self, board: ChessBoard, transpositionTable: TranspositionTable = None):
+		self.board = board
+
+		if transpositionTable is None:
+			transpositionTable = TranspositionTable()
+
+		self.transpositionTable = transpositionTable
+
+		# Material value per piece type id, for move ordering (kings are never captured, so they are worth nothing).
+		self.pieceTypeIdValues: list[int] = [0] * len(board.pieceSet.pieceTypes)
+		for (pieceType, value) in self.PieceTypeValues:
+			for pieceTypeId in board.getPieceTypeIdsFromBaseType(pieceType):
+				self.pieceTypeIdValues[pieceTypeId] = value
+
+		self.moveOrdering = ChessMoveOrdering(board, self.pieceTypeIdValues, self.MaximumPly)
+
+		# Diversification, for helper searches sharing a transposition table with others:
+		# skip the first depthOffset iterations (move order can be randomized through moveOrdering).
+		self.depthOffset = 0
+
+		# Searches sharing a table age it once, from the process starting them.
+		self.agesTranspositionTable = True
+
+		# When set (a ChessBatchEvaluator), the root moves are ordered by the batch evaluation of the positions they lead to.
+		self.batchEvaluator = None
+
+		# When set (ChessTablebases), positions with a table are scored from it instead of being searched.
+		self.tablebases = None
+
+		self.limits = ChessSearchLimits()
+		self.numberOfNodes = 0
+		self.startTime = 0.0
+		self.nextLimitCheckNodeCount = 0
+
+		# Hashes of the positions on the current search path, for repetition detection.
+		self.pathHashes: list[int] = []
+
+		# principalVariations[ply] is the best line found from the node at that ply.
+		self.principalVariations: list[list[Tuple[int, int]]] = []
+
+	# Boards of more cells than transposition table moves can hold are not searched (no best move).
+	def search(self, limits: ChessSearchLimits, onIterationCompleted: Callable[[ChessSearchResult], None] = None) -> ChessSearchResult:
+		if self.board.getNumberOfCells() > TranspositionTable.MaximumNumberOfCells:
+			print("ChessSearch::search - Too many cells")
+			return ChessSearchResult()
+
+		self.limits = limits
+		self.numberOfNodes = 0
+		self.startTime = time.perf_counter()
+		self.nextLimitCheckNodeCount = self.NumberOfNodesBetweenLimitChecks
+		self.pathHashes = []
+		self.principalVariations = [[] for ply in range(self.MaximumPly + 1)]
+
+		if self.agesTranspositionTable:
+			self.transpositionTable.startNewSearch()
+
+		self.moveOrdering.startNewSearch()
+		self.moveOrdering.rootMoveScores = None if self.batchEvaluator is None else self.scoreRootMoves()
+
+		result = ChessSearchResult()
+
+		maximumDepth = self.MaximumPly if limits.maximumDepth < 0 else min(limits.maximumDepth, self.MaximumPly)
+		for depth in range(min(1 + self.depthOffset, maximumDepth), maximumDepth + 1):
+			try:
+				score = self.searchNode(depth, -self.InfinityScore, self.InfinityScore, 0)
+			except ChessSearchStopped:
+				break
+
+			principalVariation = self.principalVariations[0].copy()
+			if len(principalVariation) == 0:
+				# No legal move at the root.
+				result.score = score
+				break
+
+			result.bestMove = principalVariation[0]
+			result.score = score
+			result.depth = depth
+			result.principalVariation = principalVariation
+			result.numberOfNodes = self.numberOfNodes
+			result.milliseconds = self.getElapsedMilliseconds()
+			result.firstMoveCutoffRate = self.moveOrdering.getFirstMoveCutoffRate()
+
+			if onIterationCompleted is not None:
+				onIterationCompleted(result)
+
+			# A forced mate will not get any shorter with a deeper search.
+			if result.isMateScore():
+				break
+
+		result.numberOfNodes = self.numberOfNodes
+		result.milliseconds = self.getElapsedMilliseconds()
+
+		return result
+
+	def getElapsedMilliseconds(self) -> int:
+		return int((time.perf_counter() - self.startTime) * 1000)
+
+	def checkLimits(self) -> None:
+		self.nextLimitCheckNodeCount = self.numberOfNodes + self.NumberOfNodesBetweenLimitChecks
+
+		if self.limits.maximumNodes > -1 and self.numberOfNodes >= self.limits.maximumNodes:
+			raise ChessSearchStopped()
+
+		if self.limits.maximumMilliseconds > -1 and self.getElapsedMilliseconds() >= self.limits.maximumMilliseconds:
+			raise ChessSearchStopped()
+
+	def searchNode(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+		board = self.board
+
+		self.numberOfNodes += 1
+		if self.numberOfNodes >= self.nextLimitCheckNodeCount:
+			self.checkLimits()
+
+		self.principalVariations[ply] = []
+
+		positionHash = board.getHash()
+		if ply > 0 and positionHash in self.pathHashes:
+			return 0
+
+		if ply >= self.MaximumPly:
+			return self.evaluate()
+
+		if ply > 0 and self.tablebases is not None:
+			tablebaseScore = self.getTablebaseScore(ply)
+			if tablebaseScore is not None:
+				return tablebaseScore
+
+		if depth <= 0:
+			return self.searchQuiescence(alpha, beta, ply)
+
+		originalAlpha = alpha
+
+		# Cut off with a previous result of at least this depth, except at the root which needs a move.
+		hashMove: Tuple[int, int] = None
+		entry = self.transpositionTable.probe(positionHash)
+		if entry is not None:
+			if entry.move != 0:
+				hashMove = TranspositionTable.decodeMove(entry.move)
+
+			if ply > 0 and entry.depth >= depth:
+				entryScore = self.getScoreFromTranspositionTable(entry.score, ply)
+				if entry.bound == TranspositionTable.BoundExact:
+					return entryScore
+				elif entry.bound == TranspositionTable.BoundLower and entryScore >= beta:
+					return entryScore
+				elif entry.bound == TranspositionTable.BoundUpper and entryScore <= alpha:
+					return entryScore
+
+		moves = self.getMoves(board.turnTeamIndex)
+		if len(moves) == 0:
+			if board.isKingInCheck(board.turnTeamIndex):
+				return -self.MateScore + ply
+
+			return 0
+
+		moves = self.moveOrdering.orderMoves(moves, hashMove, ply)
+
+		bestScore = -self.InfinityScore
+		bestMove: Tuple[int, int] = None
+
+		self.pathHashes.append(positionHash)
+
+		try:
+			for moveIndex in range(len(moves)):
+				move = moves[moveIndex]
+				undoInfo = board.makeMove(board.getMoveFromTargetCell(move[0], move[1]))
+				try:
+					score = -self.searchNode(depth - 1, -beta, -alpha, ply + 1)
+				finally:
+					board.unmakeMove(undoInfo)
+
+				if score > bestScore:
+					bestScore = score
+					bestMove = move
+
+					if score > alpha:
+						alpha = score
+						self.principalVariations[ply] = [move] + self.principalVariations[ply + 1]
+
+						if alpha >= beta:
+							self.moveOrdering.onCutoff(move, self.moveOrdering.isQuietMove(move), moveIndex, depth, ply)
+							break
+		finally:
+			self.pathHashes.pop()
+
+		if bestScore >= beta:
+			bound = TranspositionTable.BoundLower
+		elif bestScore > originalAlpha:
+			bound = TranspositionTable.BoundExact
+		else:
+			bound = TranspositionTable.BoundUpper
+
+		self.transpositionTable.store(positionHash, depth, bound, self.getScoreForTranspositionTable(bestScore, ply), TranspositionTable.encodeMove(bestMove[0], bestMove[1]))
+
+		return bestScore
+
+	# Searches captures and promotions only, until the position is quiet, so that
+	# leaves are not evaluated in the middle of an exchange. The team to move can
+	# also stand pat (keep the static evaluation), unless in check.
+	def searchQuiescence(self, alpha: int, beta: int, ply: int) -> int:
+		board = self.board
+
+		self.numberOfNodes += 1
+		if self.numberOfNodes >= self.nextLimitCheckNodeCount:
+			self.checkLimits()
+
+		if ply >= self.MaximumPly:
+			return self.evaluate()
+
+		teamIndex = board.turnTeamIndex
+
+		# In check, every evasion is searched.
+		isInCheck = board.isKingInCheck(teamIndex)
+		if isInCheck:
+			moves = self.getMoves(teamIndex)
+			if len(moves) == 0:
+				return -self.MateScore + ply
+
+			bestScore = -self.InfinityScore
+			standPatScore = -self.InfinityScore
+		else:
+			standPatScore = self.evaluate()
+			if standPatScore >= beta:
+				return standPatScore
+
+			if standPatScore > alpha:
+				alpha = standPatScore
+
+			bestScore = standPatScore
+			moves = self.getCaptureMoves(teamIndex)
+
+		moves = self.moveOrdering.orderMoves(moves, None, ply)
+
+		for move in moves:
+			boardMove = board.getMoveFromTargetCell(move[0], move[1])
+
+			if not isInCheck:
+				# Delta pruning.
+				materialGain = max(self.moveOrdering.getCapturedValue(move), 0)
+				if boardMove.promotionPieceTypeId > -1:
+					materialGain += self.pieceTypeIdValues[boardMove.promotionPieceTypeId] - self.pieceTypeIdValues[board.pieceSet.getTypeIdFromPiece(board.getPieceFromCell(move[0]))]
+
+				if standPatScore + materialGain + self.DeltaPruningMargin <= alpha:
+					continue
+
+			undoInfo = board.makeMove(boardMove)
+			try:
+				score = -self.searchQuiescence(-beta, -alpha, ply + 1)
+			finally:
+				board.unmakeMove(undoInfo)
+
+			if score > bestScore:
+				bestScore = score
+
+				if score > alpha:
+					alpha = score
+
+					if alpha >= beta:
+						break
+
+		return bestScore
+
+	# Mate scores are stored relative to the node, rather than to the root.
+	def getScoreForTranspositionTable(self, score: int, ply: int) -> int:
+		if score >= self.MateScore - self.MaximumPly:
+			return score + ply
+		elif score <= -self.MateScore + self.MaximumPly:
+			return score - ply
+
+		return score
+
+	def getScoreFromTranspositionTable(self, score: int, ply: int) -> int:
+		if score >= self.MateScore - self.MaximumPly:
+			return score - ply
+		elif score <= -self.MateScore + self.MaximumPly:
+			return score + ply
+
+		return score
+
+	# Exact score of the position from the tablebases, None when there is no table for it.
+	def getTablebaseScore(self, ply: int) -> int:
+		value = self.tablebases.probe(self.board)
+		if value is None:
+			return None
+
+		if ChessTablebase.isWinValue(value):
+			return self.MateScore - ply - (value - 1)
+		elif ChessTablebase.isLossValue(value):
+			return -self.MateScore + ply + (value - 1)
+
+		return 0
+
+	def getMoves(self, teamIndex: int) -> List[Tuple[int, int]]:
+		moves: list[Tuple[int, int]] = []
+
+		for cellIndex in self.board.getAllTeamPieceIndices(teamIndex):
+			for targetCellIndex in self.board.getValidTargetCellIndices(cellIndex):
+				moves.append((cellIndex, targetCellIndex))
+
+		return moves
+
+	# Evaluates the positions after every root move in one batch, from the point of view of the team to move.
+	def scoreRootMoves(self) -> dict:
+		board = self.board
+		teamIndex = board.turnTeamIndex
+
+		moves = self.getMoves(teamIndex)
+		if len(moves) == 0:
+			return {}
+
+		moveCellCodes: list[list[int]] = []
+		for move in moves:
+			undoInfo = board.makeMove(board.getMoveFromTargetCell(move[0], move[1]))
+			moveCellCodes.append(self.batchEvaluator.getBoardCellCodes(board))
+			board.unmakeMove(undoInfo)
+
+		scores = self.batchEvaluator.evaluate(self.batchEvaluator.packBoards(moveCellCodes), teamIndex)
+		return {moves[moveIndex]: int(scores[moveIndex]) for moveIndex in range(len(moves))}
+
+	def getCaptureMoves(self, teamIndex: int) -> List[Tuple[int, int]]:
+		moves: list[Tuple[int, int]] = []
+
+		for cellIndex in self.board.getAllTeamPieceIndices(teamIndex):
+			for targetCellIndex in self.board.getValidCaptureTargetCellIndices(cellIndex):
+				moves.append((cellIndex, targetCellIndex))
+
+		return moves
+
+	# From the point of view of the team to move, kept up to date by the board.
+	def evaluate(self) -> int:
+		return self.board.evaluator.evaluate(self.board.turnTeamIndex)
@@ -0,0 +1,241 @@
+from typing import Dict, TextIO, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+import random
+import time
+
+from engine.observer import Observer
+from engine.gamePlayer import GamePlayer, GamePlayerTypeId
+from chess.chessGameModel import ChessGameModel
+from chess.chessGameController import ChessGameController
+from chess.chessBoard import ChessBoard
+from chess.chessSearch import ChessSearchLimits
+from chess.chessPlayerAi import ChessPlayerAi
+from chess.chessOpeningBook import ChessOpeningBook
+from chess.chessTablebase import ChessTablebases
+from chess.transpositionTable import TranspositionTable
+from chess.chessPgn import ChessPgnGame, ChessPgnWriter
+
+# AI settings and game rules of self-play games.
+class ChessSelfPlaySettings:
+	__slots__ = (
+		"searchLimits",
+		"useBitboardBoard",
+		"useBatchEvaluator",
+		"transpositionTableSizeMb",
+		"openingBookPath",
+		"tablebasesDirectoryPath",
+		"startFen",
+		"numberOfRandomPlies",
+		"maximumPlies"
+	)
+
+	def __init__(self, searchLimits: ChessSearchLimits = ChessPlayerAi.DefaultSearchLimits, useBitboardBoard: bool = False):
+		self.searchLimits = searchLimits
+		self.useBitboardBoard = useBitboardBoard
+		self.useBatchEvaluator = False
+		self.transpositionTableSizeMb = TranspositionTable.DefaultSizeMb
+		self.openingBookPath: str = None
+		self.tablebasesDirectoryPath: str = None
+		self.startFen = ChessBoard.StartingFen
+
+		# Random moves opening every game, so that games differ from one another.
+		self.numberOfRandomPlies = 4
+
+		# Games reaching this length are adjudicated a draw.
+		self.maximumPlies = 300
+
+# Outcome of a self-play game, with the played game for PGN output.
+class ChessSelfPlayResult:
+	def __init__(self, gameIndex: int):
+		self.gameIndex = gameIndex
+		self.result = "*"
+		self.termination = ""
+		self.numberOfPlies = 0
+
+		# Time spent choosing moves (random opening moves included).
+		self.moveMilliseconds = 0.0
+
+		self.game: ChessPgnGame = None
+
+# Plays one AI against AI game without views: drives the model through the controller
+# with the same cellSelected signals as a view would, and follows it through its signals.
+# Besides checkmate and stalemate (ended by the model), games are drawn by threefold
+# repetition, the fifty-move rule or reaching the maximum number of plies.
+class ChessSelfPlayGame(Observer):
+	TeamResults = ["1-0", "0-1"]
+
+	def __init__(self, gameIndex: int, settings: ChessSelfPlaySettings, seed: int = 0):
+		super().__init__()
+
+		self.settings = settings
+		self.moveRandom = random.Random(seed + gameIndex)
+		self.result = ChessSelfPlayResult(gameIndex)
+
+		self.signalHandlers["gameEnded"] = self.onGameEnded
+
+		self.gameModel = ChessGameModel(settings.useBitboardBoard)
+		self.chessGameController = ChessGameController(self.gameModel)
+
+		self.attach(self.chessGameController, "playerJoinRequested")
+		self.attach(self.chessGameController, "cellSelected")
+
+		self.gameModel.attach(self, "gameEnded")
+
+		self.running = False
+		self.positionCounts: dict[int, int] = {}
+
+	def selectCell(self, cellIndex: int) -> None:
+		self.notify("cellSelected", cellIndex)
+
+	def play(self, openingBook: ChessOpeningBook = None, tablebases: ChessTablebases = None) -> ChessSelfPlayResult:
+		settings = self.settings
+		gameModel = self.gameModel
+
+		if gameModel.initialize(settings.startFen) < 0:
+			self.result.termination = "invalid start position"
+			return self.result
+
+		board = gameModel.board
+
+		# Both players share the transposition table, kept across the game's moves.
+		transpositionTable = TranspositionTable(settings.transpositionTableSizeMb)
+		chessPlayerAis = [ChessPlayerAi(board, teamIndex, settings.useBitboardBoard, transpositionTable, settings.searchLimits, openingBook = openingBook, tablebases = tablebases, useBatchEvaluator = settings.useBatchEvaluator) for teamIndex in range(len(gameModel.teamNames))]
+
+		self.running = True
+		for teamIndex in range(len(gameModel.teamNames)):
+			player = GamePlayer()
+			player.typeId = GamePlayerTypeId.AI.value
+			player.teamIndex = teamIndex
+			player.name = "AI " + str(teamIndex)
+			self.notify("playerJoinRequested", player)
+
+		self.positionCounts[board.getHash()] = 1
+
+		while self.running:
+			moveStartTime = time.perf_counter()
+
+			if self.result.numberOfPlies < settings.numberOfRandomPlies:
+				(activeCellIndex, targetCellIndex) = self.getRandomMove(board)
+			else:
+				(activeCellIndex, targetCellIndex) = chessPlayerAis[gameModel.currentTurnTeamIndex].getPieceActionCells()
+
+			self.result.moveMilliseconds += (time.perf_counter() - moveStartTime) * 1000.0
+
+			if activeCellIndex < 0 or targetCellIndex < 0:
+				self.endGame("*", "no move")
+				break
+
+			self.selectCell(activeCellIndex)
+			self.selectCell(targetCellIndex)
+
+			self.result.numberOfPlies += 1
+			if self.running:
+				self.adjudicate(board)
+
+		self.result.game = ChessPgnWriter.createGameFromHistory(board, board.pieceActionHistory, settings.startFen, self.getHeaders(), self.result.result)
+
+		return self.result
+
+	def getRandomMove(self, board: ChessBoard) -> Tuple[int, int]:
+		moves = [(activeCellIndex, targetCellIndex) for activeCellIndex in board.getAllTeamPieceIndices(board.turnTeamIndex) for targetCellIndex in board.getValidTargetCellIndices(activeCellIndex)]
+		if len(moves) == 0:
+			return (-1, -1)
+
+		return self.moveRandom.choice(moves)
+
+	# Draws the game when a position occurs for the third time, or by the move limits.
+	def adjudicate(self, board: ChessBoard) -> None:
+		positionHash = board.getHash()
+		self.positionCounts[positionHash] = self.positionCounts.get(positionHash, 0) + 1
+
+		if self.positionCounts[positionHash] >= 3:
+			self.endGame("1/2-1/2", "threefold repetition")
+		elif board.halfMoveClock >= 100:
+			self.endGame("1/2-1/2", "fifty-move rule")
+		elif self.result.numberOfPlies >= self.settings.maximumPlies:
+			self.endGame("1/2-1/2", "maximum plies")
+
+	def endGame(self, result: str, termination: str) -> None:
+		self.result.result = result
+		self.result.termination = termination
+		self.running = False
+
+	def onGameEnded(self, winningTeamIndex: int) -> None:
+		if winningTeamIndex > -1:
+			self.endGame(self.TeamResults[winningTeamIndex], "checkmate")
+		else:
+			self.endGame("1/2-1/2", "stalemate")
+
+	def getHeaders(self) -> Dict[str, str]:
+		searchLimits = self.settings.searchLimits
+		playerName = "chessmod" if searchLimits is None else "chessmod depth " + str(searchLimits.maximumDepth) + " ms " + str(searchLimits.maximumMilliseconds) + " nodes " + str(searchLimits.maximumNodes)
+
+		return {
+			"Event": "Self-play",
+			"Round": str(self.result.gameIndex + 1),
+			"White": playerName,
+			"Black": playerName,
+			"Termination": self.result.termination,
+			"PlyCount": str(self.result.numberOfPlies)
+		}
+
+# Opening book and tablebases, opened once per worker process.
+workerResources: Dict[Tuple[str, str], tuple] = {}
+
+# Runs in a worker process: plays one game.
+def runSelfPlayWorker(gameIndex: int, settings: ChessSelfPlaySettings, seed: int) -> ChessSelfPlayResult:
+	resourcesKey = (settings.openingBookPath, settings.tablebasesDirectoryPath)
+	if resourcesKey not in workerResources:
+		openingBook = None if settings.openingBookPath is None else ChessOpeningBook(settings.openingBookPath)
+		tablebases = None if settings.tablebasesDirectoryPath is None else ChessTablebases(settings.tablebasesDirectoryPath)
+		workerResources[resourcesKey] = (openingBook, tablebases)
+
+	(openingBook, tablebases) = workerResources[resourcesKey]
+
+	return ChessSelfPlayGame(gameIndex, settings, seed).play(openingBook, tablebases)
+
+# Plays self-play games across worker processes, writing each game as PGN once finished
+# (in the order games finish), so that results do not pile up in memory.
+class ChessSelfPlayRunner():
+	def __init__(self, settings: ChessSelfPlaySettings, numberOfWorkers: int = -1, seed: int = 0):
+		self.settings = settings
+		self.numberOfWorkers = os.cpu_count() if numberOfWorkers < 1 else numberOfWorkers
+		self.seed = seed
+
+		self.numberOfGames = 0
+		self.numberOfPlies = 0
+		self.moveMilliseconds = 0.0
+		self.milliseconds = 0
+
+		# Number of games per result ("1-0", "0-1", "1/2-1/2", "*").
+		self.resultCounts: dict[str, int] = {}
+
+	def getGamesPerSecond(self) -> float:
+		return self.numberOfGames / max(self.milliseconds / 1000.0, 0.001)
+
+	def getAverageMoveMilliseconds(self) -> float:
+		return self.moveMilliseconds / max(self.numberOfPlies, 1)
+
+	def run(self, numberOfGames: int, pgnStream: TextIO = None) -> int:
+		startTime = time.perf_counter()
+
+		pgnWriter = None if pgnStream is None else ChessPgnWriter(pgnStream)
+
+		with ProcessPoolExecutor(max_workers = self.numberOfWorkers) as executor:
+			futures = [executor.submit(runSelfPlayWorker, gameIndex, self.settings, self.seed) for gameIndex in range(numberOfGames)]
+			for future in as_completed(futures):
+				self.addResult(future.result(), pgnWriter)
+
+		self.milliseconds = int((time.perf_counter() - startTime) * 1000)
+
+		return self.numberOfGames
+
+	def addResult(self, result: ChessSelfPlayResult, pgnWriter: ChessPgnWriter) -> None:
+		self.numberOfGames += 1
+		self.numberOfPlies += result.numberOfPlies
+		self.moveMilliseconds += result.moveMilliseconds
+		self.resultCounts[result.result] = self.resultCounts.get(result.result, 0) + 1
+
+		if pgnWriter is not None and result.game is not None:
+			pgnWriter.writeGame(result.game)
@@ -0,0 +1,310 @@
+from typing import List
+from array import array
+import mmap
+import os
+
+from chess.chessBoard import ChessBoard
+
+# Endgame tablebase of a king and one piece against a lone king (eg KQK), by retrograde analysis.
+# Positions are from the point of view of the team with the piece (the strong team), as the first team;
+# positions with the second team as strong team are probed mirrored vertically.
+# A table holds one byte per position, indexed by getPositionIndex:
+#   0      draw (or illegal position)
+#   n > 0  mate in n - 1 plies, a win for the team to move when n - 1 is odd, a loss when even
+# Kings and rooks have no castling rights, and pawns only promote to a queen, as on the board.
+class ChessTablebase():
+	NumberOfTurns = 2
+
+	def __init__(self, name: str, values):
+		self.name = name
+
+		# The table bytes (bytes, bytearray or mmap).
+		self.values = values
+
+	@staticmethod
+	def getNumberOfPositions(numberOfCells: int) -> int:
+		return ChessTablebase.NumberOfTurns * numberOfCells * numberOfCells * numberOfCells
+
+	# isStrongTeamTurn: whether the team with the piece is to move.
+	@staticmethod
+	def getPositionIndex(numberOfCells: int, isStrongTeamTurn: bool, strongKingCellIndex: int, weakKingCellIndex: int, pieceCellIndex: int) -> int:
+		return (((0 if isStrongTeamTurn else 1) * numberOfCells + strongKingCellIndex) * numberOfCells + weakKingCellIndex) * numberOfCells + pieceCellIndex
+
+	@staticmethod
+	def isWinValue(value: int) -> bool:
+		return value > 0 and (value - 1) % 2 == 1
+
+	@staticmethod
+	def isLossValue(value: int) -> bool:
+		return value > 0 and (value - 1) % 2 == 0
+
+	def getValue(self, positionIndex: int) -> int:
+		return self.values[positionIndex]
+
+	def close(self) -> None:
+		if isinstance(self.values, mmap.mmap):
+			self.values.close()
+
+# The tablebase files of a directory (eg "KQK.tb"), memory-mapped, and probed for board positions.
+class ChessTablebases():
+	FileExtension = ".tb"
+
+	MaximumNumberOfPieces = 3
+
+	def __init__(self, directoryPath: str):
+		self.directoryPath = directoryPath
+
+		# Per name, eg "KQK".
+		self.tablebases: dict[str, ChessTablebase] = {}
+
+		if not os.path.isdir(directoryPath):
+			return
+
+		for fileName in sorted(os.listdir(directoryPath)):
+			if fileName.endswith(self.FileExtension):
+				self.loadTablebase(os.path.join(directoryPath, fileName))
+
+	def loadTablebase(self, filePath: str) -> int:
+		with open(filePath, "rb") as file:
+			if os.fstat(file.fileno()).st_size == 0:
+				print("ChessTablebases::loadTablebase - Empty file " + filePath)
+				return -1
+
+			# The mapping stays valid once the file is closed.
+			values = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+
+		name = os.path.basename(filePath)[:-len(self.FileExtension)]
+		self.tablebases[name] = ChessTablebase(name, values)
+
+		return 0
+
+	def close(self) -> None:
+		for tablebase in self.tablebases.values():
+			tablebase.close()
+
+		self.tablebases.clear()
+
+	# Returns the table value of the board position (see ChessTablebase), None when there is no table for it.
+	def probe(self, board: ChessBoard) -> int:
+		pieceCellIndices = board.getAllPieceIndices()
+		if len(pieceCellIndices) != self.MaximumNumberOfPieces:
+			return None
+
+		kingCellIndices: list[int] = [-1] * board.NumberOfTeams
+		pieceCellIndex = -1
+		for cellIndex in pieceCellIndices:
+			piece = board.getPieceFromCell(cellIndex)
+			if board.pieceSet.getTypeIdFromPiece(piece) in board.kingPieceTypeIds:
+				kingCellIndices[piece.teamIndex] = cellIndex
+			else:
+				pieceCellIndex = cellIndex
+
+		if pieceCellIndex < 0 or min(kingCellIndices) < 0:
+			return None
+
+		piece = board.getPieceFromCell(pieceCellIndex)
+		tablebase = self.tablebases.get("K" + board.pieceSet.getCharacterFromPieceType(type(piece)) + "K", None)
+		if tablebase is None or board.getCastlingRights() != "-":
+			return None
+
+		strongTeamIndex = piece.teamIndex
+		strongKingCellIndex = kingCellIndices[strongTeamIndex]
+		weakKingCellIndex = kingCellIndices[1 - strongTeamIndex]
+
+		if strongTeamIndex != 0:
+			strongKingCellIndex = self.getMirroredCellIndex(board, strongKingCellIndex)
+			weakKingCellIndex = self.getMirroredCellIndex(board, weakKingCellIndex)
+			pieceCellIndex = self.getMirroredCellIndex(board, pieceCellIndex)
+
+		return tablebase.getValue(ChessTablebase.getPositionIndex(board.getNumberOfCells(), board.turnTeamIndex == strongTeamIndex, strongKingCellIndex, weakKingCellIndex, pieceCellIndex))
+
+	@staticmethod
+	def getMirroredCellIndex(board: ChessBoard, cellIndex: int) -> int:
+		cellCoordinates = board.getCellCoordinatesFromIndex(cellIndex)
+		return board.getCellIndexFromCoordinates([cellCoordinates[0], board.cellHeight - 1 - cellCoordinates[1]])
+
+# Generates the table of a king and one piece (given by its character) against a lone king,
+# using the board's own move generation. Every legal position is set up once, to list
+# its moves; the results then spread backwards from the mates, level by level:
+# a position is won when one move leads to a lost position, and lost when all do.
+# Captures of the piece draw; pawn promotions continue in the given queen table.
+class ChessTablebaseGenerator():
+	def __init__(self, board: ChessBoard):
+		self.board = board
+
+		numberOfCells = board.getNumberOfCells()
+		self.numberOfCells = numberOfCells
+		self.numberOfPositions = ChessTablebase.getNumberOfPositions(numberOfCells)
+
+	def generate(self, pieceCharacter: str, promotionTablebase: ChessTablebase = None) -> bytearray:
+		board = self.board
+		numberOfCells = self.numberOfCells
+		numberOfPositions = self.numberOfPositions
+
+		strongKing = board.pieceSet.createPieceFromCharacter('K')
+		weakKing = board.pieceSet.createPieceFromCharacter('k')
+		piece = board.pieceSet.createPieceFromCharacter(pieceCharacter.upper())
+		isPawn = board.pieceSet.getTypeIdFromPiece(piece) in board.pawnPieceTypeIds
+		for tablePiece in [strongKing, weakKing, piece]:
+			# No castling rights.
+			tablePiece.moveCount = 1
+
+		if isPawn and promotionTablebase is None:
+			print("ChessTablebaseGenerator::generate - Pawn tables need the queen table")
+			return None
+
+		values = bytearray(numberOfPositions)
+		isLegal = bytearray(numberOfPositions)
+
+		# Moves staying in the table: the position indices they lead to, in a flat list, per position.
+		successorStarts = array("I", [0]) * numberOfPositions
+		successorEnds = array("I", [0]) * numberOfPositions
+		successors = array("I")
+
+		# Positions with a move out of the table which does not lose (a capture or promotion).
+		hasEscape = bytearray(numberOfPositions)
+
+		# Promotions into a lost position for the defending team: (plies to mate, position index).
+		promotionWins: list[tuple[int, int]] = []
+
+		mates: list[int] = []
+
+		for cellIndex in range(numberOfCells):
+			board.setCellContents(cellIndex, [])
+
+		board.clearHistory()
+		board.setEnPassantCellIndex(-1)
+
+		for positionIndex in range(numberOfPositions // ChessTablebase.NumberOfTurns):
+			pieceCellIndex = positionIndex % numberOfCells
+			weakKingCellIndex = (positionIndex // numberOfCells) % numberOfCells
+			strongKingCellIndex = positionIndex // (numberOfCells * numberOfCells)
+
+			if weakKingCellIndex == strongKingCellIndex or pieceCellIndex == strongKingCellIndex or pieceCellIndex == weakKingCellIndex:
+				continue
+
+			pieceRow = board.getCellCoordinatesFromIndex(pieceCellIndex)[1]
+			if isPawn and (pieceRow == 0 or pieceRow == board.cellHeight - 1):
+				continue
+
+			self.placePieces([(strongKingCellIndex, strongKing), (weakKingCellIndex, weakKing), (pieceCellIndex, piece)])
+
+			for isStrongTeamTurn in [True, False]:
+				turnTeamIndex = 0 if isStrongTeamTurn else 1
+				turnPositionIndex = ChessTablebase.getPositionIndex(numberOfCells, isStrongTeamTurn, strongKingCellIndex, weakKingCellIndex, pieceCellIndex)
+
+				# The team which just moved cannot be in check.
+				if board.isKingInCheck(1 - turnTeamIndex):
+					continue
+
+				successorStarts[turnPositionIndex] = len(successors)
+
+				isLegal[turnPositionIndex] = 1
+				board.setTurnTeamIndex(turnTeamIndex)
+
+				numberOfMoves = 0
+				for activeCellIndex in board.getAllTeamPieceIndices(turnTeamIndex):
+					for targetCellIndex in board.getValidTargetCellIndices(activeCellIndex):
+						numberOfMoves += 1
+
+						if not isStrongTeamTurn:
+							if targetCellIndex == pieceCellIndex:
+								hasEscape[turnPositionIndex] = 1
+							else:
+								successors.append(ChessTablebase.getPositionIndex(numberOfCells, True, strongKingCellIndex, targetCellIndex, pieceCellIndex))
+						elif activeCellIndex == strongKingCellIndex:
+							successors.append(ChessTablebase.getPositionIndex(numberOfCells, False, targetCellIndex, weakKingCellIndex, pieceCellIndex))
+						elif isPawn and board.getCellCoordinatesFromIndex(targetCellIndex)[1] == 0:
+							promotionValue = promotionTablebase.getValue(ChessTablebase.getPositionIndex(numberOfCells, False, strongKingCellIndex, weakKingCellIndex, targetCellIndex))
+							if ChessTablebase.isLossValue(promotionValue):
+								promotionWins.append((promotionValue, turnPositionIndex))
+							else:
+								hasEscape[turnPositionIndex] = 1
+						else:
+							successors.append(ChessTablebase.getPositionIndex(numberOfCells, False, strongKingCellIndex, weakKingCellIndex, targetCellIndex))
+
+				successorEnds[turnPositionIndex] = len(successors)
+
+				if numberOfMoves == 0 and board.isKingInCheck(turnTeamIndex):
+					mates.append(turnPositionIndex)
+
+		(predecessorStarts, predecessors) = self.createPredecessors(successorStarts, successorEnds, successors)
+
+		# Moves left which do not lead to a won position for the opponent, -1 if some move does not lose.
+		remainingMoveCounts = array("i", [successorEnds[positionIndex] - successorStarts[positionIndex] if isLegal[positionIndex] and not hasEscape[positionIndex] else -1 for positionIndex in range(numberOfPositions)])
+
+		# promotionWinLevels[plies]: positions won by promoting, in that many plies.
+		promotionWinLevels: dict[int, list[int]] = {}
+		for (promotionValue, positionIndex) in promotionWins:
+			promotionWinLevels.setdefault(promotionValue, []).append(positionIndex)
+			remainingMoveCounts[positionIndex] = -1
+
+		for positionIndex in mates:
+			values[positionIndex] = 1
+
+		maximumPlies = max(promotionWinLevels.keys(), default = 0)
+		plies = 0
+		levelPositionIndices = mates
+		while (len(levelPositionIndices) > 0 or plies < maximumPlies) and plies < 0xFE:
+			nextLevelPositionIndices: list[int] = []
+
+			for positionIndex in levelPositionIndices:
+				for predecessorIndex in range(predecessorStarts[positionIndex], predecessorStarts[positionIndex + 1]):
+					predecessorPositionIndex = predecessors[predecessorIndex]
+					if values[predecessorPositionIndex] != 0:
+						continue
+
+					if plies % 2 == 0:
+						# One move into a lost position wins.
+						values[predecessorPositionIndex] = plies + 2
+						nextLevelPositionIndices.append(predecessorPositionIndex)
+					elif remainingMoveCounts[predecessorPositionIndex] > 0:
+						remainingMoveCounts[predecessorPositionIndex] -= 1
+						if remainingMoveCounts[predecessorPositionIndex] == 0:
+							values[predecessorPositionIndex] = plies + 2
+							nextLevelPositionIndices.append(predecessorPositionIndex)
+
+			plies += 1
+
+			for positionIndex in promotionWinLevels.get(plies, []):
+				if values[positionIndex] == 0:
+					values[positionIndex] = plies + 1
+					nextLevelPositionIndices.append(positionIndex)
+
+			levelPositionIndices = nextLevelPositionIndices
+
+		return values
+
+	# Moves the table pieces into the given cells, leaving the pieces already in place untouched.
+	def placePieces(self, cellPieces: List[tuple]) -> None:
+		board = self.board
+
+		for (cellIndex, piece) in cellPieces:
+			for pieceCellIndex in board.getAllPieceIndices():
+				if board.getPieceFromCell(pieceCellIndex) is piece and pieceCellIndex != cellIndex:
+					board.clearCellContents(pieceCellIndex)
+
+		for (cellIndex, piece) in cellPieces:
+			if board.getPieceFromCell(cellIndex) is not piece:
+				board.setCellContents(cellIndex, [piece])
+
+	# Inverts the successor lists, by counting the predecessors of every position first.
+	def createPredecessors(self, successorStarts: array, successorEnds: array, successors: array) -> tuple:
+		numberOfPositions = self.numberOfPositions
+
+		predecessorStarts = array("I", [0]) * (numberOfPositions + 1)
+		for successorPositionIndex in successors:
+			predecessorStarts[successorPositionIndex + 1] += 1
+
+		for positionIndex in range(numberOfPositions):
+			predecessorStarts[positionIndex + 1] += predecessorStarts[positionIndex]
+
+		predecessors = array("I", [0]) * len(successors)
+		predecessorEnds = array("I", predecessorStarts)
+		for positionIndex in range(numberOfPositions):
+			for successorIndex in range(successorStarts[positionIndex], successorEnds[positionIndex]):
+				successorPositionIndex = successors[successorIndex]
+				predecessors[predecessorEnds[successorPositionIndex]] = positionIndex
+				predecessorEnds[successorPositionIndex] += 1
+
+		return (predecessorStarts, predecessors)
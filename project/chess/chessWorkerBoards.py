@@ -0,0 +1,13 @@
+from typing import Dict
+
+from chess.chessBoard import ChessBoard
+from chess.bitboardChessBoard import BitboardChessBoard
+
+# Boards are costly to construct (lookup tables), so each worker process keeps one per board type.
+workerBoards: Dict[bool, ChessBoard] = {}
+
+def getWorkerBoard(useBitboardBoard: bool) -> ChessBoard:
+	if useBitboardBoard not in workerBoards:
+		workerBoards[useBitboardBoard] = BitboardChessBoard() if useBitboardBoard else ChessBoard()
+
+	return workerBoards[useBitboardBoard]
@@ -1,17 +1,22 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, TextIO
+import sys
 
 from engine.gameView import GameView
-from engine.gamePlayer import GamePlayer
+from engine.gamePlayer import GamePlayer, GamePlayerTypeId
 
 from chess.chessGameModel import ChessGameModel
 from chess.chessBoard import ChessBoard
 
 from chess.chessGameController import ChessGameController
 
+# Text view of the game. Alongside another view, it only reports the game's events.
+# When interactive, it runs the game itself: moves are read from the input stream as
+# cell names (eg "e2 e4" or "e2e4"), other lines being text commands (eg "quit",
+# "player_type 1 -1" to let the AI play the second team), and AI players move on their turn.
 class ClChessGameView(GameView):
 	from chess.board import Board
 	
-	def __init__(self, chessGameModel: ChessGameModel, chessGameController: ChessGameController):
+	def __init__(self, chessGameModel: ChessGameModel, chessGameController: ChessGameController, isInteractive: bool = False, inputStream: TextIO = sys.stdin):
 		super().__init__(chessGameModel, chessGameController)
 
 		self.signalHandlers["gameInitialized"] = self.onGameInitialized
@@ -24,6 +29,8 @@ class ClChessGameView(GameView):
 		self.signalHandlers["actionsMade"] = self.onActionsMade
 
 		self.attach(chessGameModel, "cellSelected")
+		self.attach(chessGameController, "playerJoinRequested")
+		self.attach(chessGameController, "textCommandIssued")
 
 		chessGameModel.attach(self, "gameInitialized")
 		chessGameModel.attach(self, "gameEnded")
@@ -37,30 +44,114 @@ class ClChessGameView(GameView):
 		self.board: ChessBoard = None
 		self.teamNames: list[str] = []
 
+		self.isInteractive = isInteractive
+		self.inputStream = inputStream
+
+		self.players: list[GamePlayer] = []
+		self.currentTurnTeamIndex = -1
+
+		# AI player per team index (ChessPlayerAi), kept across moves along with its transposition table.
+		self.chessPlayerAis: dict[int, Any] = {}
+
 	def __del__(self):
 		super().__del__()
 	
+	def loop(self) -> int:
+		self.running = True
+
+		while self.running:
+			activePlayer = self.getActivePlayer()
+			if activePlayer is not None and activePlayer.typeId == GamePlayerTypeId.AI.value:
+				self.makePlayerAiAction(self.currentTurnTeamIndex)
+				continue
+
+			line = self.inputStream.readline()
+			if len(line) == 0:
+				self.notify("textCommandIssued", "quit")
+				break
+
+			self.processLine(line.strip())
+
+		return 0
+
+	def getActivePlayer(self) -> GamePlayer:
+		if self.currentTurnTeamIndex < 0 or self.currentTurnTeamIndex >= len(self.players):
+			return None
+
+		return self.players[self.currentTurnTeamIndex]
+
+	def processLine(self, line: str) -> None:
+		if len(line) == 0:
+			return
+
+		cellNames = line.replace(' ', '')
+		cellIndices = [self.board.getCellIndexFromName(cellNames[index:index + 2]) for index in range(0, len(cellNames), 2)] if len(cellNames) in [2, 4] and cellNames[-1].isdigit() else []
+		if len(cellIndices) == 0 or min(cellIndices) < 0:
+			self.notify("textCommandIssued", line)
+			return
+
+		for cellIndex in cellIndices:
+			self.selectCell(cellIndex)
+
+	def selectCell(self, cellIndex: int) -> None:
+		self.notify("cellSelected", cellIndex)
+
+	def makePlayerAiAction(self, teamIndex: int) -> None:
+		if teamIndex not in self.chessPlayerAis:
+			# Imported on first use, to keep the start up of text sessions short.
+			from chess.chessPlayerAi import ChessPlayerAi
+
+			self.chessPlayerAis[teamIndex] = ChessPlayerAi(self.board, teamIndex)
+
+		(activeCellIndex, targetCellIndex) = self.chessPlayerAis[teamIndex].getPieceActionCells()
+		if activeCellIndex < 0 or targetCellIndex < 0:
+			self.running = False
+			return
+
+		self.selectCell(activeCellIndex)
+		self.selectCell(targetCellIndex)
+
 	def draw(self) -> None:
 		self.drawBoard(self.board)
 
 	def drawBoard(self, board: ChessBoard) -> None:
-		for y in range(0, board.cellHeight):
-			for x in range(0, board.cellWidth):
-				cellIndex = board.getCellIndexFromCoordinates([x, y])
+		board.print()
 
 	def onGameInitialized(self, payload: Dict[str, Any]) -> None:
 		self.board = ChessBoard()
-		self.board.loadFromStringRowList(payload["boardStringRowList"])
+		self.board.loadFromFen(payload["fen"])
+		self.chessPlayerAis.clear()
 
 		self.teamNames = payload["teamNames"].copy()
 
+		if not self.isInteractive:
+			return
+
+		for teamIndex in range(len(payload["teamNames"])):
+			player = GamePlayer()
+			player.typeId = GamePlayerTypeId.LOCAL.value
+			player.teamIndex = teamIndex
+			player.name = "Player " + str(teamIndex)
+			self.notify("playerJoinRequested", player)
+
+	def onGameQuit(self, payload: None) -> None:
+		self.running = False
+
 	def onPlayerAdded(self, player: GamePlayer) -> None:
+		self.players.append(player.copy())
+
 		print("Player Added: " + player.name)
 
 	def onPlayerTypeUpdated(self, payload: Dict[str, Any]) -> None:
+		playerIndex = payload["index"]
+		if playerIndex < len(self.players):
+			self.players[playerIndex].typeId = payload["value"]
+
 		print("Player Type Updated: " + str(payload["index"]) + " " + str(payload["value"]))
 
 	def onGameEnded(self, winningTeamIndex: int) -> None:
+		self.running = False
+
 		print("Game Ended")
 		if winningTeamIndex > -1:
 			print("Winner: " + self.teamNames[winningTeamIndex])
@@ -68,8 +159,11 @@ class ClChessGameView(GameView):
 			print("Draw")
 
 	def onTurnStarted(self, currentTurnTeamIndex: int) -> None:
-		#print("Turn: " + self.chessGameModel.teamNames[self.chessGameModel.currentTurnTeamIndex])
-		pass
+		self.currentTurnTeamIndex = currentTurnTeamIndex
+
+		if self.isInteractive:
+			self.draw()
+			print("Turn: " + self.teamNames[currentTurnTeamIndex])
 
 	def onTurnEnded(self, payload: None) -> None:
 		pass
@@ -86,7 +180,6 @@ class ClChessGameView(GameView):
 	def onInvalidCellSelected(self, cellIndex: int) -> None:
 		print("Invalid Selection: " + str(cellIndex))
 
-	def onActionsMade(self, pieceActions: List[dict]) -> None:
-		#print("Moved Piece")
-		pass
+	def onActionsMade(self, payload: Dict[str, Any]) -> None:
+		self.board.performPieceAction(payload["activeCellIndex"], payload["targetCellIndex"])
 	
\ No newline at end of file
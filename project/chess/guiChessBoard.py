@@ -35,6 +35,17 @@ class GuiChessBoard(GuiNode):
 		self.boardOverlaySurface.fill((0, 0, 0, 0))
 
 		self.boardOverlayCellStates = [0] * self.board.getNumberOfCells()
+		self.boardOverlayOutlineWidth = 4
+
+		# Pieces are drawn at the top left of their cell, and their icons can reach into the next cells.
+		self.pieceIconDimensions = [
+			max(pieceIconSurface.get_width() for teamPieceIconSurfaces in self.pieceIconSurfaces for pieceIconSurface in teamPieceIconSurfaces),
+			max(pieceIconSurface.get_height() for teamPieceIconSurfaces in self.pieceIconSurfaces for pieceIconSurface in teamPieceIconSurfaces)
+		]
+
+		# Cells to render again, rather than the whole board (see invalidateCells).
+		self.dirtyCellIndices: set[int] = set()
+		self.isFullRenderOutdated = False
 
 		self.surface = pygame.Surface([self.board.cellWidth * self.cellPixelWidth, self.board.cellHeight * self.cellPixelHeight])
 
@@ -53,18 +64,100 @@ class GuiChessBoard(GuiNode):
 		for validCellIndex in validCellIndices:
 			self.boardOverlayCellStates[validCellIndex] = 2
 		
-		self.renderBoardOverlay()
-		self.render()
+		self.invalidateCells([activeCellIndex] + validCellIndices)
 	
 	def clearHighlightedCells(self) -> None:
+		highlightedCellIndices = [cellIndex for cellIndex in range(len(self.boardOverlayCellStates)) if self.boardOverlayCellStates[cellIndex] != 0]
+		if len(highlightedCellIndices) == 0:
+			return
+
 		self.boardOverlayCellStates = [0] * self.board.getNumberOfCells()
 
-		self.renderBoardOverlay()
-		self.render()
+		self.invalidateCells(highlightedCellIndices)
+
+	def invalidate(self) -> None:
+		super().invalidate()
+
+		self.isFullRenderOutdated = True
+
+	# Renders the given cells again when next drawn, along with the cells their highlight outlines
+	# and piece icons reach into.
+	def invalidateCells(self, cellIndices: List[int]) -> None:
+		for cellIndex in cellIndices:
+			self.dirtyCellIndices.update(self.getCellIndicesInRect(self.getCellReachRect(cellIndex)))
+
+		super().invalidate()
+
+	# Invalidates the cells changed by piece actions (see Board.getPieceActionsFromMove).
+	def invalidatePieceActionCells(self, pieceActions: List[dict]) -> None:
+		cellIndices: list[int] = []
+		for pieceAction in pieceActions:
+			for cellIndexKey in ["cellIndex", "fromCellIndex", "toCellIndex"]:
+				if cellIndexKey in pieceAction:
+					cellIndices.append(pieceAction[cellIndexKey])
+
+		self.invalidateCells(cellIndices)
+
+	def getCellRect(self, cellX: int, cellY: int) -> pygame.Rect:
+		return pygame.Rect(cellX * self.cellPixelWidth, cellY * self.cellPixelHeight, self.cellPixelWidth, self.cellPixelHeight)
+
+	# Area that drawing the cell can change: the cell, its highlight outline and its piece icon.
+	def getCellReachRect(self, cellIndex: int) -> pygame.Rect:
+		cellCoordinates = self.board.getCellCoordinatesFromIndex(cellIndex)
+		cellRect = self.getCellRect(cellCoordinates[0], cellCoordinates[1])
+		pieceIconRect = pygame.Rect(cellRect.topleft, self.pieceIconDimensions)
+
+		return cellRect.inflate(self.boardOverlayOutlineWidth * 2, self.boardOverlayOutlineWidth * 2).union(pieceIconRect)
+
+	def getCellIndicesInRect(self, rect: pygame.Rect) -> List[int]:
+		firstCellX = max(rect.left // self.cellPixelWidth, 0)
+		lastCellX = min((rect.right - 1) // self.cellPixelWidth, self.board.cellWidth - 1)
+		firstCellY = max(rect.top // self.cellPixelHeight, 0)
+		lastCellY = min((rect.bottom - 1) // self.cellPixelHeight, self.board.cellHeight - 1)
+
+		return [self.board.getCellIndexFromCoordinates([x, y]) for y in range(firstCellY, lastCellY + 1) for x in range(firstCellX, lastCellX + 1)]
+
+	def render(self) -> None:
+		if self.isFullRenderOutdated or len(self.dirtyCellIndices) == 0:
+			self.isFullRenderOutdated = False
+			self.dirtyCellIndices.clear()
+
+			super().render()
+			return
+
+		self.isRenderOutdated = False
+
+		for cellIndex in sorted(self.dirtyCellIndices):
+			self.renderCell(cellIndex)
+
+		self.dirtyCellIndices.clear()
 
 	def renderOnSelf(self) -> None:
+		self.renderBoardOverlay()
+
 		self.drawBoard(self.board)
 		self.drawPieces(self.board)
+
+	# Renders one cell as a full render would, drawing within the cell only:
+	# overlapping outlines and piece icons of the neighbouring cells are drawn again.
+	def renderCell(self, cellIndex: int) -> None:
+		cellCoordinates = self.board.getCellCoordinatesFromIndex(cellIndex)
+		cellRect = self.getCellRect(cellCoordinates[0], cellCoordinates[1])
+
+		self.boardOverlaySurface.set_clip(cellRect)
+		self.renderBoardOverlayBody(cellCoordinates[0], cellCoordinates[1])
+		for neighbourCellIndex in self.getCellIndicesInRect(cellRect.inflate(self.cellPixelWidth * 2, self.cellPixelHeight * 2)):
+			neighbourCellCoordinates = self.board.getCellCoordinatesFromIndex(neighbourCellIndex)
+			self.renderBoardOverlayOutline(neighbourCellCoordinates[0], neighbourCellCoordinates[1])
+		self.boardOverlaySurface.set_clip(None)
+
+		self.surface.set_clip(cellRect)
+		self.drawCell(cellCoordinates[0], cellCoordinates[1])
+		self.surface.blit(self.boardOverlaySurface, cellRect.topleft, cellRect)
+		self.drawPieces(self.board, cellRect)
+		self.surface.set_clip(None)
+
+		self.markDirty(cellRect)
 	
 	def renderPieceIconSurfaces(self, font: pygame.font) -> List[List[pygame.Surface]]:
 		pieceIconSurfaces = []
@@ -89,58 +182,70 @@ class GuiChessBoard(GuiNode):
 	def renderBoardOverlayBodies(self) -> None:
 		for y in range(0, self.board.cellHeight):
 			for x in range(0, self.board.cellWidth):
-				cellIndex = self.board.getCellIndexFromCoordinates([x, y])
-				
-				cellColor = None
-				boardOverlayCellState = self.boardOverlayCellStates[cellIndex]
-				if boardOverlayCellState == 1:
-					cellColor = (64, 64, 64, 255)
-				elif boardOverlayCellState == 2:
-					cellColor = (96, 96, 96, 255)
-				else:
-					cellColor = (0, 0, 0, 0)
-				
-				rectangle = pygame.Rect(x * self.cellPixelWidth, y * self.cellPixelHeight, self.cellPixelWidth, self.cellPixelHeight)
-				pygame.draw.rect(self.boardOverlaySurface, cellColor, rectangle)
+				self.renderBoardOverlayBody(x, y)
+
+	def renderBoardOverlayBody(self, x: int, y: int) -> None:
+		cellIndex = self.board.getCellIndexFromCoordinates([x, y])
+		
+		cellColor = None
+		boardOverlayCellState = self.boardOverlayCellStates[cellIndex]
+		if boardOverlayCellState == 1:
+			cellColor = (64, 64, 64, 255)
+		elif boardOverlayCellState == 2:
+			cellColor = (96, 96, 96, 255)
+		else:
+			cellColor = (0, 0, 0, 0)
+		
+		pygame.draw.rect(self.boardOverlaySurface, cellColor, self.getCellRect(x, y))
 		
 	def renderBoardOverlayOutlines(self) -> None:
 		for y in range(0, self.board.cellHeight):
 			for x in range(0, self.board.cellWidth):
-				cellIndex = self.board.getCellIndexFromCoordinates([x, y])
-
-				if self.boardOverlayCellStates[cellIndex] != 0:
-					rectangle = pygame.Rect(x * self.cellPixelWidth, y * self.cellPixelHeight, self.cellPixelWidth, self.cellPixelHeight)
-					linesPointCoordinates = [
-						rectangle.topleft,
-						rectangle.topright,
-						rectangle.bottomright,
-						rectangle.bottomleft
-					]
-					pygame.draw.lines(self.boardOverlaySurface, (32, 32, 32), True, linesPointCoordinates, 4)
+				self.renderBoardOverlayOutline(x, y)
+
+	def renderBoardOverlayOutline(self, x: int, y: int) -> None:
+		cellIndex = self.board.getCellIndexFromCoordinates([x, y])
+
+		if self.boardOverlayCellStates[cellIndex] != 0:
+			rectangle = self.getCellRect(x, y)
+			linesPointCoordinates = [
+				rectangle.topleft,
+				rectangle.topright,
+				rectangle.bottomright,
+				rectangle.bottomleft
+			]
+			pygame.draw.lines(self.boardOverlaySurface, (32, 32, 32), True, linesPointCoordinates, self.boardOverlayOutlineWidth)
 
 	def drawBoard(self, board: Board) -> None:
 		for y in range(0, board.cellHeight):
 			for x in range(0, board.cellWidth):
-				cellIndex = self.board.getCellIndexFromCoordinates([x, y])
-				
-				cellColor = None
-				if (cellIndex % 2) == (y % 2):
-					cellColor = self.cellColors[0]
-				else:
-					cellColor = self.cellColors[1]
-
-				pygame.draw.rect(self.surface, cellColor, pygame.Rect(x * self.cellPixelWidth, y * self.cellPixelHeight, self.cellPixelWidth, self.cellPixelHeight))
+				self.drawCell(x, y)
 		
 		self.drawBoardOverlays()
 
+	def drawCell(self, x: int, y: int) -> None:
+		cellIndex = self.board.getCellIndexFromCoordinates([x, y])
+		
+		cellColor = None
+		if (cellIndex % 2) == (y % 2):
+			cellColor = self.cellColors[0]
+		else:
+			cellColor = self.cellColors[1]
+
+		pygame.draw.rect(self.surface, cellColor, self.getCellRect(x, y))
+
 	def drawBoardOverlays(self) -> None:
 		self.surface.blit(self.boardOverlaySurface, (0, 0))
 
-	def drawPieces(self, board: Board) -> None:
+	# Draws the pieces, or only those whose icons reach into the given area.
+	def drawPieces(self, board: Board, rect: pygame.Rect = None) -> None:
 		for y in range(0, board.cellHeight):
 			for x in range(0, board.cellWidth):
 				cellIndex = board.getCellIndexFromCoordinates([x, y])
 
+				if rect is not None and not rect.colliderect(pygame.Rect(self.getCellRect(x, y).topleft, self.pieceIconDimensions)):
+					continue
+
 				if not board.isCellEmpty(cellIndex):
 					cellPieceType = board.pieceSet.getTypeIdFromPieceType(type(board.getPieceFromCell(cellIndex)))
 					teamIndex = board.getPieceFromCell(cellIndex).teamIndex
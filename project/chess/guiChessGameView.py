@@ -39,6 +39,9 @@ class GuiChessGameView(GuiGameView):
 		self.guiCommandLine: GuiCommandLine = None
 		self.guiChessBoard: GuiChessBoard = None
 		self.guiPlayerList: GuiPlayerList = None
+
+		# AI player per team index, kept across moves along with its transposition table.
+		self.chessPlayerAis: dict[int, ChessPlayerAi] = {}
 	
 	def __del__(self):
 		super().__del__()
@@ -59,8 +62,10 @@ class GuiChessGameView(GuiGameView):
 	def makePlayerAiAction(self, teamIndex: int) -> None:
 		activeCellIndex: int = -1
 		targetCellIndex: int = -1
-		chessPlayerAi = ChessPlayerAi(self.guiChessBoard.board, self.guiPlayerList.activePlayerIndex)
-		(activeCellIndex, targetCellIndex) = chessPlayerAi.getPieceActionCells()
+		if teamIndex not in self.chessPlayerAis:
+			self.chessPlayerAis[teamIndex] = ChessPlayerAi(self.guiChessBoard.board, teamIndex)
+
+		(activeCellIndex, targetCellIndex) = self.chessPlayerAis[teamIndex].getPieceActionCells()
 
 		if activeCellIndex > -1 and targetCellIndex > -1:
 			self.selectCell(activeCellIndex)
@@ -68,8 +73,9 @@ class GuiChessGameView(GuiGameView):
 
 	def onGameInitialized(self, payload: Dict[str, Any]) -> None:
 		board = ChessBoard()
-		board.loadFromStringRowList(payload["boardStringRowList"])
+		board.loadFromFen(payload["fen"])
 		self.guiChessBoard = GuiChessBoard([0, 0], board)
+		self.chessPlayerAis.clear()
 		self.guiNodes.append(self.guiChessBoard)
 
 		guiChessBoardDimensions = self.guiChessBoard.getDimensions()
@@ -80,7 +86,7 @@ class GuiChessGameView(GuiGameView):
 		self.guiCommandLine.attach(self, "commandLineEntered")
 		self.guiNodes.append(self.guiCommandLine)
 
-		self.draw()
+		self.invalidate()
 
 		for teamIndex in range(len(payload["teamNames"])):
 			player = GamePlayer()
@@ -103,32 +109,35 @@ class GuiChessGameView(GuiGameView):
 		self.guiChessBoard.clearHighlightedCells()
 		self.guiPlayerList.setActivePlayerIndex(currentTurnTeamIndex)
 
-		self.draw()
+		self.invalidate()
 
 	def onTurnEnded(self, currentTurnTeamIndex: int) -> None:
 		self.guiChessBoard.clearHighlightedCells()
 
-		self.draw()
+		self.invalidate()
 	
 	def onPieceActivated(self, payload: Dict[str, Any]) -> None:
 		self.guiChessBoard.setHighlightedCells(payload["activatedCellIndex"], payload["validCellIndices"])
 
-		self.draw()
+		self.invalidate()
 
 	def onPieceDeactivated(self, cellIndex: int) -> None:
 		self.guiChessBoard.clearHighlightedCells()
 
-		self.draw()
+		self.invalidate()
 	
-	def onActionsMade(self, pieceActions: List[dict]) -> None:
-		self.guiChessBoard.board.executePieceActions(pieceActions)
+	def onActionsMade(self, payload: Dict[str, Any]) -> None:
+		# Making the move (rather than only executing its piece actions) keeps the en passant cell,
+		# move clocks and history of the board the AI players search.
+		pieceActions = self.guiChessBoard.board.performPieceAction(payload["activeCellIndex"], payload["targetCellIndex"])
+		self.guiChessBoard.invalidatePieceActionCells(pieceActions)
 
-		self.draw()
+		self.invalidate()
 	
 	def onKeyDown(self, keyCode: int, character: str) -> None:
 		self.guiCommandLine.onKeyDown(keyCode, character)
 
-		self.draw()
+		self.invalidate()
 
 	def onPointerDown(self, position: List[int]) -> None:
 		activePlayerTypeId = self.guiPlayerList.getActivePlayer().typeId
@@ -1,11 +1,25 @@
 from typing import Dict, List
 import functools
 
+import chess.boardMove
 import chess.chessPiece
 import chess.rookChessPiece
 import chess.chessBoard
 
 class KingChessPiece(chess.chessPiece.ChessPiece):
+	moveDirections = [
+		[0, -1],
+		[1, 0],
+		[0, 1],
+		[-1, 0],
+		[-1, -1],
+		[1, -1],
+		[-1, 1],
+		[1, 1]
+	]
+
+	moveDistance = 1
+
 	def __init__(self):
 		super().__init__()
 
@@ -15,44 +29,24 @@ class KingChessPiece(chess.chessPiece.ChessPiece):
 		return possibleTargetCellIndices
 
 	def getPossibleMoveCellIndices(self, _board, cellIndex: int) -> List[int]:
-		possibleMoveCellIndices: list[int] = []
-
 		board: chess.chessBoard.ChessBoard = _board
-		cellCoordinates = board.getCellCoordinatesFromIndex(cellIndex)
-
-		moveDistance = 1
-
-		moveDirections = [
-			[0, -1],
-			[1, 0],
-			[0, 1],
-			[-1, 0],
-			[-1, -1],
-			[1, -1],
-			[-1, 1],
-			[1, 1]
-		]
-
-		for moveDirection in moveDirections:
-			rayCells = board.getCellsFromRay(cellCoordinates, moveDirection, moveDistance)
-			possibleMoveCellIndices += list(filter(lambda cellIndex: board.isCellEmpty(cellIndex) or board.doesCellHaveOpponentPiece(cellIndex, self.teamIndex), rayCells))
+		moveCellIndices = board.kingMoveCellIndices[cellIndex]
 		
 		# TODO: Should result castle move cells be reported here?
 
-		return possibleMoveCellIndices
+		return [moveCellIndex for moveCellIndex in moveCellIndices if board.isCellEmpty(moveCellIndex) or board.doesCellHaveOpponentPiece(moveCellIndex, self.teamIndex)]
 
 	def getPossibleAttackCellIndices(self, _board, cellIndex: int) -> List[int]:
 		board: chess.chessBoard.ChessBoard = _board
-		possibleMoveCellIndices = self.getPossibleMoveCellIndices(board, cellIndex)
-		return list(filter(lambda cellIndex: board.doesCellHaveOpponentPiece(cellIndex, self.teamIndex), possibleMoveCellIndices))
+		return [moveCellIndex for moveCellIndex in board.kingMoveCellIndices[cellIndex] if board.doesCellHaveOpponentPiece(moveCellIndex, self.teamIndex)]
 
-	def getPieceActionsFromTargetCell(self, _board, activeCellIndex: int, targetCellIndex: int) -> List[dict]:
+	def getMoveFromTargetCell(self, _board, activeCellIndex: int, targetCellIndex: int) -> chess.boardMove.BoardMove:
 		board: chess.chessBoard.ChessBoard = _board
 
 		if self.isValidCastleTargetCell(board, activeCellIndex, targetCellIndex):
-			return self.getPieceActionsFromCastle(board, activeCellIndex, targetCellIndex)
+			return self.getMoveFromCastle(board, activeCellIndex, targetCellIndex)
 
-		return super().getPieceActionsFromTargetCell(board, activeCellIndex, targetCellIndex)
+		return super().getMoveFromTargetCell(board, activeCellIndex, targetCellIndex)
 
 	def getPossibleCastleTargetCellIndices(self, _board, cellIndex: int) -> List[int]:
 		possibleTargetCellIndices: list[int] = []
@@ -83,6 +77,10 @@ class KingChessPiece(chess.chessPiece.ChessPiece):
 		
 		if targetPiece.moveCount > 0:
 			return False
+
+		# Cannot castle out of check.
+		if board.isCellAttacked(cellIndex, piece.teamIndex):
+			return False
 		
 		kingCellCoordinates = board.getCellCoordinatesFromIndex(cellIndex)
 		rookCellCoordinates = board.getCellCoordinatesFromIndex(targetCellIndex)
@@ -104,12 +102,12 @@ class KingChessPiece(chess.chessPiece.ChessPiece):
 		
 		rayCellIndices = rayCellIndices[:2]
 		for rayCellIndex in rayCellIndices:
-			if board.doesTargetCellPutTeamKingIntoCheck(cellIndex, rayCellIndex, piece.teamIndex):
+			if board.isCellAttacked(rayCellIndex, piece.teamIndex, cellIndex):
 				return False
 
 		return True
 
-	def getPieceActionsFromCastle(self, _board, activeCellIndex: int, targetCellIndex: int) -> List[dict]:
+	def getMoveFromCastle(self, _board, activeCellIndex: int, targetCellIndex: int) -> chess.boardMove.BoardMove:
 		board: chess.chessBoard.ChessBoard = _board
 
 		# NOTE: Assumes a castle is possible (isValidCastleTargetCell is True).
@@ -124,8 +122,5 @@ class KingChessPiece(chess.chessPiece.ChessPiece):
 		rookToCellIndex = board.getCellIndexFromCoordinates(rookCellCoordinates)
 		kingToCellIndex = board.getCellIndexFromCoordinates(kingCellCoordinates)
 
-		kingMovePieceActions = board.getMovePieceActions(activeCellIndex, kingToCellIndex)
-		rookMovePieceActions = board.getMovePieceActions(targetCellIndex, rookToCellIndex)
-
-		return rookMovePieceActions + kingMovePieceActions
+		return chess.boardMove.BoardMove(activeCellIndex, kingToCellIndex, targetCellIndex = targetCellIndex, secondaryFromCellIndex = targetCellIndex, secondaryToCellIndex = rookToCellIndex)
 	
\ No newline at end of file
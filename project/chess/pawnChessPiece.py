@@ -3,11 +3,17 @@ import functools
 
 import chess.chessBoard
 
+import chess.board
+import chess.boardMove
 import chess.chessPiece
 import chess.queenChessPiece
 import chess.chessBoard
 
 class PawnChessPiece(chess.chessPiece.ChessPiece):
+	# Ray direction indices per team index, for moving forward and for attacking.
+	forwardDirectionIndices = [chess.board.Board.RayDirections.index(direction) for direction in [[0, -1], [0, 1]]]
+	attackDirectionIndices = [[chess.board.Board.RayDirections.index(direction) for direction in teamAttackDirections] for teamAttackDirections in [[[-1, -1], [1, -1]], [[-1, 1], [1, 1]]]]
+
 	def __init__(self):
 		super().__init__()
 
@@ -16,24 +22,19 @@ class PawnChessPiece(chess.chessPiece.ChessPiece):
 
 		board: chess.chessBoard.ChessBoard = _board
 		cellCoordinates = board.getCellCoordinatesFromIndex(cellIndex)
+		cellRays = board.cellRays[cellIndex]
 
 		# Move forward
-		moveDirection = self.getPrimaryDirection()
-		
 		moveDistance = 2 if self.getRank(board, cellCoordinates) == 2 else 1
 
-		rayCells = board.getCellsFromRay(cellCoordinates, moveDirection, moveDistance)
-		possibleTargetCellIndices += list(filter(lambda cellIndex: board.isCellEmpty(cellIndex), rayCells))
-		
-		# Attack forward left
-		moveDirection[0] = -1
-		rayCells = board.getCellsFromRay(cellCoordinates, moveDirection, 1)
-		possibleTargetCellIndices += list(filter(lambda cellIndex: board.doesCellHaveOpponentPiece(cellIndex, self.teamIndex), rayCells))
+		for rayCellIndex in cellRays[self.forwardDirectionIndices[self.teamIndex]][:moveDistance]:
+			if not board.isCellEmpty(rayCellIndex):
+				break
 
-		# Attack forward right
-		moveDirection[0] = 1
-		rayCells = board.getCellsFromRay(cellCoordinates, moveDirection, 1)
-		possibleTargetCellIndices += list(filter(lambda cellIndex: board.doesCellHaveOpponentPiece(cellIndex, self.teamIndex), rayCells))
+			possibleTargetCellIndices.append(rayCellIndex)
+		
+		# Attack forward left & right
+		possibleTargetCellIndices += self.getPossibleAttackCellIndices(board, cellIndex)
 
 		# Check for en passant.
 		enPassantTargetCellIndex = self.getEnPassantTargetCellIndex(_board, cellCoordinates)
@@ -41,19 +42,65 @@ class PawnChessPiece(chess.chessPiece.ChessPiece):
 			possibleTargetCellIndices.append(enPassantTargetCellIndex)
 
 		return possibleTargetCellIndices
+
+	def getPossibleAttackCellIndices(self, _board, cellIndex: int) -> List[int]:
+		possibleAttackCellIndices: list[int] = []
+
+		board: chess.chessBoard.ChessBoard = _board
+		cellRays = board.cellRays[cellIndex]
+
+		for attackDirectionIndex in self.attackDirectionIndices[self.teamIndex]:
+			rayCellIndices = cellRays[attackDirectionIndex]
+			if len(rayCellIndices) > 0 and board.doesCellHaveOpponentPiece(rayCellIndices[0], self.teamIndex):
+				possibleAttackCellIndices.append(rayCellIndices[0])
+
+		return possibleAttackCellIndices
+
+	# Attacks, en passant, and moving forward into promotion.
+	def getPossibleCaptureTargetCellIndices(self, _board, cellIndex: int) -> List[int]:
+		board: chess.chessBoard.ChessBoard = _board
+		cellCoordinates = board.getCellCoordinatesFromIndex(cellIndex)
+
+		possibleCaptureTargetCellIndices = self.getPossibleAttackCellIndices(board, cellIndex)
+
+		enPassantTargetCellIndex = self.getEnPassantTargetCellIndex(board, cellCoordinates)
+		if enPassantTargetCellIndex > -1:
+			possibleCaptureTargetCellIndices.append(enPassantTargetCellIndex)
+
+		if self.getRank(board, cellCoordinates) == 7:
+			forwardRayCellIndices = board.cellRays[cellIndex][self.forwardDirectionIndices[self.teamIndex]]
+			if len(forwardRayCellIndices) > 0 and board.isCellEmpty(forwardRayCellIndices[0]):
+				possibleCaptureTargetCellIndices.append(forwardRayCellIndices[0])
+
+		return possibleCaptureTargetCellIndices
 	
-	def getPieceActionsFromTargetCell(self, _board, activeCellIndex: int, targetCellIndex: int) -> List[dict]:
+	def getMoveFromTargetCell(self, _board, activeCellIndex: int, targetCellIndex: int) -> chess.boardMove.BoardMove:
 		board: chess.chessBoard.ChessBoard = _board
 
 		if targetCellIndex == self.getEnPassantTargetCellIndex(board, board.getCellCoordinatesFromIndex(activeCellIndex)):
-			return self.getPieceActionsFromEnPassant(board, activeCellIndex, targetCellIndex)
+			return self.getMoveFromEnPassant(board, activeCellIndex, targetCellIndex)
 
 		# Check for promotion.
-		pieceActions = board.getMovePieceActions(activeCellIndex, targetCellIndex)
+		move = board.createMove(activeCellIndex, targetCellIndex)
 		if self.getRank(board, board.getCellCoordinatesFromIndex(targetCellIndex)) == 8:
-			pieceActions += self.getPieceActionsFromPawnPromotion(board, targetCellIndex)
+			move.promotionPieceTypeId = board.pieceSet.getTypeIdFromPieceType(chess.queenChessPiece.QueenChessPiece)
 				
-		return pieceActions
+		return move
+
+	def getAttackDirectionIndices(self) -> List[int]:
+		return self.attackDirectionIndices[self.teamIndex]
+
+	def getAttackDistance(self) -> int:
+		return 1
+
+	def getSpecialTargetCellIndices(self, _board, cellIndex: int) -> List[int]:
+		board: chess.chessBoard.ChessBoard = _board
+
+		enPassantTargetCellIndex = self.getEnPassantTargetCellIndex(board, board.getCellCoordinatesFromIndex(cellIndex))
+		if enPassantTargetCellIndex > -1:
+			return [enPassantTargetCellIndex]
+
+		return []
 
 	def getPrimaryDirection(self) -> List[int]:
 		direction = [0, 1]
@@ -68,54 +115,26 @@ class PawnChessPiece(chess.chessPiece.ChessPiece):
 
 	def getEnPassantTargetCellIndex(self, _board, cellCoordinates: List[int]) -> int:
 		board: chess.chessBoard.ChessBoard = _board
-		
-		# Get last piece to move.
-		numberOfPieceActionsInHistory = len(board.pieceActionHistory)
-		if numberOfPieceActionsInHistory == 0:
-			return -1
-		
-		lastPieceAction = board.pieceActionHistory[numberOfPieceActionsInHistory - 1]
-		
-		if lastPieceAction["type"] != chess.chessBoard.BoardPieceActionType.MOVE_TO_CELL:
-			return -1
-
-		# It needs to be a pawn.
-		lastMovedPieceTypeId = lastPieceAction["pieceTypeId"]
-		if lastMovedPieceTypeId != board.pieceSet.getTypeIdFromPieceType(PawnChessPiece):
-			return -1
 
-		# It cannot have moved more than once.
-		lastMovedPieceCellIndex = lastPieceAction["toCellIndex"]
-		lastMovedPawn: PawnChessPiece = board.getPieceFromCell(lastMovedPieceCellIndex)
-		if lastMovedPawn.moveCount > 1:
+		# The board tracks the cell skipped by a pawn which just advanced two cells.
+		enPassantCellIndex = board.enPassantCellIndex
+		if enPassantCellIndex < 0:
 			return -1
 
-		# It needs to be at rank 4.
-		# TODO: Is it better to make sure its only moved 2 cells at once
-		# (checking fromCellIndex and vertical distance),
-		# in order to allow for alternate starting piece formations?
-		# Would want to change associated logic with first move rules to match.
-		lastMovedPieceCellCoordinates = board.getCellCoordinatesFromIndex(lastMovedPieceCellIndex)
-		if lastMovedPawn.getRank(board, lastMovedPieceCellCoordinates) != 4:
+		# It needs to be diagonally in front of this pawn.
+		cellRays = board.cellRays[board.getCellIndexFromCoordinates(cellCoordinates)]
+		if not any(len(cellRays[attackDirectionIndex]) > 0 and cellRays[attackDirectionIndex][0] == enPassantCellIndex for attackDirectionIndex in self.attackDirectionIndices[self.teamIndex]):
 			return -1
 
-		# It needs to be directly to the left or right of this pawn.
-		distance = board.getDistanceBetweenCellCoordinates(cellCoordinates, lastMovedPieceCellCoordinates)
-		if distance[1] > 0 or distance[0] > 1:
+		# The pawn to capture needs to be directly to the left or right of this pawn.
+		otherPawnCellIndex = board.getCellIndexFromCoordinates([board.getCellCoordinatesFromIndex(enPassantCellIndex)[0], cellCoordinates[1]])
+		otherPawn = board.getPieceFromCell(otherPawnCellIndex)
+		if not isinstance(otherPawn, PawnChessPiece) or otherPawn.teamIndex == self.teamIndex:
 			return -1
 
-		# Pawn move & en passant rules implicate that the cell directly behind
-		# the captured pawn will be empty.
-		# Assume it's a legit cell that can be moved into.
-		primaryDirection = self.getPrimaryDirection()
-		enPassantToCoordinates = [
-			lastMovedPieceCellCoordinates[0],
-			lastMovedPieceCellCoordinates[1] + primaryDirection[1]
-		]
-		
-		return board.getCellIndexFromCoordinates(enPassantToCoordinates)
+		return enPassantCellIndex
 
-	def getPieceActionsFromEnPassant(self, _board, activeCellIndex: int, targetCellIndex: int) -> List[dict]:
+	def getMoveFromEnPassant(self, _board, activeCellIndex: int, targetCellIndex: int) -> chess.boardMove.BoardMove:
 		board: chess.chessBoard.ChessBoard = _board
 		
 		# NOTE: Assumes en passant is possible.
@@ -126,20 +145,4 @@ class PawnChessPiece(chess.chessPiece.ChessPiece):
 			pawnFromCellCoordinates[1]
 		]
 
-		otherPawnRemovePieceActions = board.getRemovePieceActions(board.getCellIndexFromCoordinates(otherPawnCellCoordinates))
-		movePawnPieceActions = board.getMovePieceActions(activeCellIndex, targetCellIndex)
-
-		return otherPawnRemovePieceActions + movePawnPieceActions
-
-	def getPieceActionsFromPawnPromotion(self, _board, cellIndex: int) -> List[dict]:
-		board: chess.chessBoard.ChessBoard = _board
-
-		pieceActions = board.getRemovePieceActions(cellIndex, board.pieceSet.getTypeIdFromPieceType(type(self)))
-		
-		pieceAttributes = {
-				"teamIndex": self.teamIndex
-			}
-		
-		pieceActions += board.getAddPieceActions(cellIndex, board.pieceSet.getTypeIdFromPieceType(chess.queenChessPiece.QueenChessPiece), pieceAttributes)
-
-		return pieceActions
+		return chess.boardMove.BoardMove(activeCellIndex, targetCellIndex, captureCellIndex = board.getCellIndexFromCoordinates(otherPawnCellCoordinates))
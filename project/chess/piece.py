@@ -26,6 +26,13 @@ class Piece:
 	
 	def getPossibleAttackCellIndices(self, _board, cellIndex: int) -> List[int]:
 		return []
+
+	# Target cells capturing a piece or promoting this piece, a subset of the possible target cells.
+	def getPossibleCaptureTargetCellIndices(self, _board, cellIndex: int) -> List[int]:
+		return []
 	
+	def getMoveFromTargetCell(self, _board, activeCellIndex: int, targetCellIndex: int):
+		return None
+
 	def getPieceActionsFromTargetCell(self, _board, activeCellIndex: int, targetCellIndex: int) -> List[dict]:
-		return []
+		return _board.getPieceActionsFromMove(self.getMoveFromTargetCell(_board, activeCellIndex, targetCellIndex))
@@ -0,0 +1,90 @@
+from typing import Any, Dict, Iterator, List
+from collections import deque
+import json
+
+# Board history, with one entry (list of piece actions) per performed move.
+# Pushing and popping entries is O(1), regardless of game length.
+# Optionally, only the most recent maximumLength entries are kept in memory,
+# with older ones being dropped or appended to an archive file (JSON lines).
+# The archive file is emptied when the journal is created or cleared.
+class PieceActionJournal():
+	def __init__(self, maximumLength: int = -1, archiveFilename: str = None):
+		self.entries: deque[list[dict]] = deque()
+
+		self.maximumLength = maximumLength
+		self.archiveFilename = archiveFilename
+		self.numberOfArchivedEntries = 0
+
+		self.clear()
+
+	def __len__(self) -> int:
+		return self.numberOfArchivedEntries + len(self.entries)
+
+	def __iter__(self) -> Iterator[List[dict]]:
+		yield from self.getArchivedEntries()
+		yield from self.entries
+
+	def copy(self):
+		# Copies do not share the archive file: the archived entries are read back into the copy's memory.
+		if self.archiveFilename is None:
+			journalCopy = PieceActionJournal(self.maximumLength)
+			journalCopy.entries = deque(self.entries)
+		else:
+			journalCopy = PieceActionJournal()
+			journalCopy.entries = deque(self)
+
+		return journalCopy
+
+	# Drops all entries, keeping the maximum length and archive file.
+	def clear(self) -> None:
+		self.entries.clear()
+		self.numberOfArchivedEntries = 0
+
+		if self.archiveFilename is not None:
+			open(self.archiveFilename, "w").close()
+
+	def push(self, pieceActions: List[dict]) -> None:
+		self.entries.append(pieceActions)
+
+		if self.maximumLength > -1 and len(self.entries) > self.maximumLength:
+			self.archiveEntry(self.entries.popleft())
+
+	def pop(self) -> List[dict]:
+		if len(self.entries) == 0:
+			print("PieceActionJournal::pop - No entries in memory")
+			return []
+
+		return self.entries.pop()
+
+	# Without an archive file, the entry is dropped.
+	def archiveEntry(self, pieceActions: List[dict]) -> None:
+		if self.archiveFilename is None:
+			return
+
+		self.numberOfArchivedEntries += 1
+
+		with open(self.archiveFilename, "a") as file:
+			file.write(json.dumps([self.getSerializablePieceAction(pieceAction) for pieceAction in pieceActions]) + "\n")
+
+	def getArchivedEntries(self) -> Iterator[List[dict]]:
+		if self.archiveFilename is None or self.numberOfArchivedEntries == 0:
+			return
+
+		with open(self.archiveFilename, "r") as file:
+			for line in file:
+				yield [self.getPieceActionFromSerializable(pieceAction) for pieceAction in json.loads(line)]
+
+	def getSerializablePieceAction(self, pieceAction: Dict[str, Any]) -> Dict[str, Any]:
+		serializablePieceAction = pieceAction.copy()
+		serializablePieceAction["type"] = pieceAction["type"].name
+
+		return serializablePieceAction
+
+	def getPieceActionFromSerializable(self, serializablePieceAction: Dict[str, Any]) -> Dict[str, Any]:
+		# Imported here, as the board module imports this one.
+		from chess.board import BoardPieceActionType
+
+		pieceAction = serializablePieceAction.copy()
+		pieceAction["type"] = BoardPieceActionType[serializablePieceAction["type"]]
+
+		return pieceAction
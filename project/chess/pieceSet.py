@@ -6,11 +6,16 @@ class PieceSet():
 	def __init__(self):
 		self.pieceTypes: list[Piece] = []
 		self.pieceTypeCharacters: Dict[Piece, str] = {}
+		self.pieceTypeIds: Dict[Piece, int] = {}
 
 	def getTypeIdFromPieceType(self, pieceType: Piece) -> int:
-		return self.pieceTypes.index(pieceType)
+		return self.pieceTypeIds[pieceType]
+
+	def getTypeIdFromPiece(self, piece: Piece) -> int:
+		return self.pieceTypeIds[type(piece)]
 
 	def addPieceType(self, pieceType: Piece, character: str) -> None:
+		self.pieceTypeIds[pieceType] = len(self.pieceTypes)
 		self.pieceTypes.append(pieceType)
 		self.pieceTypeCharacters[pieceType] = character
 
@@ -0,0 +1,190 @@
+from multiprocessing.shared_memory import SharedMemory
+
+# Search results of previously visited positions, indexed by position hash.
+class TranspositionTableEntry:
+	__slots__ = (
+		"depth",
+		"bound",
+		"score",
+		"move"
+	)
+
+	def __init__(self, depth: int, bound: int, score: int, move: int):
+		self.depth = depth
+		self.bound = bound
+		self.score = score
+		self.move = move
+
+# Fixed-size transposition table, backed by a flat buffer of 64-bit words
+# so that its memory use is set by the given budget, whatever the number of stores.
+# The buffer can be shared memory, for searches running in several processes.
+# Each bucket holds two entries: a depth-preferred slot, which keeps the deepest
+# result of the current search, and an always-replace slot for everything else.
+# An entry is two words: the position hash XORed with the data, and the packed data.
+# Entries are written without locks; a torn write from another process fails
+# the XOR check on probe, and is treated as a miss. The packed data is:
+#   bits 0-15  move (see encodeMove), 0 if none
+#   bits 16-31 score, offset by ScoreOffset
+#   bits 32-39 depth
+#   bits 40-41 bound
+#   bits 42-49 generation (search number), for aging out old entries
+class TranspositionTable():
+	BoundNone = 0
+	BoundExact = 1
+	BoundLower = 2
+	BoundUpper = 3
+
+	DefaultSizeMb = 16
+
+	NumberOfEntriesPerBucket = 2
+	NumberOfWordsPerEntry = 2
+	NumberOfWordsPerBucket = NumberOfEntriesPerBucket * NumberOfWordsPerEntry
+	NumberOfBytesPerBucket = NumberOfWordsPerBucket * 8
+
+	ScoreOffset = 1 << 15
+	MaximumDepth = (1 << 8) - 1
+	MaximumGeneration = (1 << 8) - 1
+
+	# Moves take 6 bits per cell index.
+	MaximumNumberOfCells = 64
+
+	# With a shared memory block, the table uses it as buffer instead of allocating one.
+	def __init__(self, sizeMb: float = DefaultSizeMb, sharedMemory: SharedMemory = None):
+		self.numberOfBuckets = self.getNumberOfBucketsFromSize(sizeMb)
+		self.bucketIndexMask = self.numberOfBuckets - 1
+
+		numberOfBytes = self.numberOfBuckets * self.NumberOfBytesPerBucket
+
+		self.sizeMb = sizeMb
+		self.sharedMemory = sharedMemory
+		if sharedMemory is None:
+			self.bytes = memoryview(bytearray(numberOfBytes))
+		else:
+			self.bytes = sharedMemory.buf[:numberOfBytes]
+
+		self.words = self.bytes.cast("Q")
+
+		self.generation = 0
+
+	# Rounds the number of buckets down to a power of two, so the bucket index is a mask of the hash.
+	@staticmethod
+	def getNumberOfBucketsFromSize(sizeMb: float) -> int:
+		maximumNumberOfBuckets = max(1, int(sizeMb * 1024 * 1024) // TranspositionTable.NumberOfBytesPerBucket)
+		return 1 << (maximumNumberOfBuckets.bit_length() - 1)
+
+	# Creates a table in a new shared memory block, which other processes can attach to by name.
+	@staticmethod
+	def createShared(sizeMb: float = DefaultSizeMb):
+		numberOfBytes = TranspositionTable.getNumberOfBucketsFromSize(sizeMb) * TranspositionTable.NumberOfBytesPerBucket
+
+		transpositionTable = TranspositionTable(sizeMb, SharedMemory(create = True, size = numberOfBytes))
+		transpositionTable.clear()
+
+		return transpositionTable
+
+	@staticmethod
+	def attachShared(sharedMemoryName: str, sizeMb: float):
+		return TranspositionTable(sizeMb, SharedMemory(name = sharedMemoryName))
+
+	def getSharedMemoryName(self) -> str:
+		if self.sharedMemory is None:
+			return None
+
+		return self.sharedMemory.name
+
+	# Releases the shared memory block (and frees it, when unlink is set, from the creating process).
+	def closeShared(self, unlink: bool = False) -> None:
+		if self.sharedMemory is None:
+			return
+
+		self.words.release()
+		self.bytes.release()
+		self.sharedMemory.close()
+		if unlink:
+			self.sharedMemory.unlink()
+
+		self.sharedMemory = None
+
+	@staticmethod
+	def encodeMove(fromCellIndex: int, toCellIndex: int) -> int:
+		if max(fromCellIndex, toCellIndex) >= TranspositionTable.MaximumNumberOfCells:
+			print("TranspositionTable::encodeMove - Cell index out of range")
+			return -1
+
+		return (fromCellIndex << 6) | toCellIndex
+
+	@staticmethod
+	def decodeMove(move: int) -> tuple:
+		return (move >> 6, move & 0x3F)
+
+	def getSizeInBytes(self) -> int:
+		return len(self.bytes)
+
+	def clear(self) -> None:
+		self.bytes[:] = bytes(len(self.bytes))
+		self.generation = 0
+
+	# Called once per search, so that entries from previous searches get replaced first.
+	def startNewSearch(self) -> None:
+		self.generation = (self.generation + 1) & self.MaximumGeneration
+
+	def getWordIndex(self, positionHash: int) -> int:
+		return (positionHash & self.bucketIndexMask) * self.NumberOfWordsPerBucket
+
+	def probe(self, positionHash: int) -> TranspositionTableEntry:
+		words = self.words
+		wordIndex = self.getWordIndex(positionHash)
+
+		for entryWordIndex in range(wordIndex, wordIndex + self.NumberOfWordsPerBucket, self.NumberOfWordsPerEntry):
+			data = words[entryWordIndex + 1]
+			if words[entryWordIndex] ^ data == positionHash:
+				bound = (data >> 40) & 0x3
+				if bound != self.BoundNone:
+					return TranspositionTableEntry((data >> 32) & 0xFF, bound, ((data >> 16) & 0xFFFF) - self.ScoreOffset, data & 0xFFFF)
+
+		return None
+
+	def store(self, positionHash: int, depth: int, bound: int, score: int, move: int = 0) -> None:
+		words = self.words
+		wordIndex = self.getWordIndex(positionHash)
+
+		data = (
+			(move & 0xFFFF) |
+			(((score + self.ScoreOffset) & 0xFFFF) << 16) |
+			(min(max(depth, 0), self.MaximumDepth) << 32) |
+			(bound << 40) |
+			(self.generation << 42)
+		)
+
+		# Keep the previous best move, when the position is searched again without finding one.
+		if move == 0:
+			for entryWordIndex in range(wordIndex, wordIndex + self.NumberOfWordsPerBucket, self.NumberOfWordsPerEntry):
+				storedData = words[entryWordIndex + 1]
+				if words[entryWordIndex] ^ storedData == positionHash:
+					data |= storedData & 0xFFFF
+					break
+
+		# Depth-preferred slot: taken by at least as deep results, or when it is stale.
+		storedData = words[wordIndex + 1]
+		storedDepth = (storedData >> 32) & 0xFF
+		storedGeneration = (storedData >> 42) & 0xFF
+		if words[wordIndex] ^ storedData == positionHash or depth >= storedDepth or storedGeneration != self.generation:
+			words[wordIndex] = positionHash ^ data
+			words[wordIndex + 1] = data
+			return
+
+		# Always-replace slot.
+		words[wordIndex + 2] = positionHash ^ data
+		words[wordIndex + 3] = data
+
+	# Permille of depth-preferred slots used in the current search.
+	def getHashFull(self) -> int:
+		numberOfSampledBuckets = min(1000, self.numberOfBuckets)
+
+		numberOfUsedBuckets = 0
+		for bucketIndex in range(numberOfSampledBuckets):
+			data = self.words[bucketIndex * self.NumberOfWordsPerBucket + 1]
+			if (data >> 40) & 0x3 != self.BoundNone and (data >> 42) & 0xFF == self.generation:
+				numberOfUsedBuckets += 1
+
+		return numberOfUsedBuckets * 1000 // numberOfSampledBuckets
@@ -0,0 +1,22 @@
+import random
+
+# Random 64-bit keys for Zobrist hashing a board position.
+# A position's hash is the XOR of the keys of everything present in it,
+# so the hash can be updated incrementally as pieces are added and removed.
+# Keys are generated from a fixed seed, so hashes are stable across boards and runs.
+class ZobristKeys():
+	DefaultSeed = 0x5A0B2157
+
+	def __init__(self, numberOfTeams: int, numberOfPieceTypes: int, numberOfCells: int, seed: int = DefaultSeed):
+		randomGenerator = random.Random(seed)
+
+		# pieceKeys[teamIndex][pieceTypeId][cellIndex]
+		self.pieceKeys: list[list[list[int]]] = [[[randomGenerator.getrandbits(64) for cellIndex in range(numberOfCells)] for pieceTypeId in range(numberOfPieceTypes)] for teamIndex in range(numberOfTeams)]
+
+		# Castling rights, per cell of a rook which can still castle.
+		self.castlingKeys: list[int] = [randomGenerator.getrandbits(64) for cellIndex in range(numberOfCells)]
+
+		# The first team's key is zero, so that it is its turn when no turn key is present.
+		self.turnKeys: list[int] = [0] + [randomGenerator.getrandbits(64) for teamIndex in range(1, numberOfTeams)]
+
+		self.enPassantKeys: list[int] = [randomGenerator.getrandbits(64) for cellIndex in range(numberOfCells)]
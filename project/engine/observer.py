@@ -1,9 +1,15 @@
+# Signals sent while a transaction is open (see beginTransaction) are queued, and delivered
+# together, in order, when the outermost transaction ends. Signals sent by observers during
+# delivery join the queue, so that observers never see them out of order.
 class Observer():
 	def __init__(self):
 		self.name = __name__
 		self.signalObservers: dict[str, Observer] = {}
 		self.signalHandlers: dict[str, function] = {}
 
+		self.transactionDepth = 0
+		self.queuedSignals: list[tuple] = []
+
 	def attach(self, observer, signalId: str) -> None:
 		observers: list[Observer] = self.signalObservers.get(signalId, [])
 		if len(observers) == 0:
@@ -19,7 +25,39 @@ class Observer():
 		
 		observers.remove(observer)
 
+	def beginTransaction(self) -> None:
+		self.transactionDepth += 1
+
+	def endTransaction(self) -> int:
+		if self.transactionDepth == 0:
+			print("Observer::endTransaction - No open transaction")
+			return -1
+
+		# A failing signal handler still closes the transaction, dropping the signals left to deliver.
+		try:
+			if self.transactionDepth == 1:
+				queuedSignalIndex = 0
+				while queuedSignalIndex < len(self.queuedSignals):
+					(signalId, payload) = self.queuedSignals[queuedSignalIndex]
+					queuedSignalIndex += 1
+
+					self.deliver(signalId, payload)
+		finally:
+			if self.transactionDepth == 1:
+				self.queuedSignals.clear()
+
+			self.transactionDepth -= 1
+
+		return 0
+
 	def notify(self, signalId: str, payload = None) -> None:
+		if self.transactionDepth > 0:
+			self.queuedSignals.append((signalId, payload))
+			return
+
+		self.deliver(signalId, payload)
+
+	def deliver(self, signalId: str, payload = None) -> None:
 		observers: list[Observer] = self.signalObservers.get(signalId, None)
 		if observers == None:
 			return
@@ -0,0 +1,64 @@
+import argparse
+
+from chess.chessBoard import ChessBoard
+from chess.chessEvaluator import ChessBatchEvaluator
+import chess.chessPerft
+
+def readFens(fenFilePath: str) -> list:
+	if fenFilePath is None:
+		return [position.fen for position in chess.chessPerft.ReferencePositions]
+
+	with open(fenFilePath, "r") as fenFile:
+		return [line.strip() for line in fenFile if line.strip() != ""]
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description = "Evaluate positions in one batch with NumPy, eg to check the batch evaluator or export training data.")
+	parser.add_argument("fens", nargs = "?", help = "file with one FEN per line (default: the perft reference positions)")
+	parser.add_argument("--check", action = "store_true", help = "check the batch piece-square scores against the incremental evaluator")
+	parser.add_argument("--planes", help = "NumPy .npz file to write the piece planes and scores to")
+	args = parser.parse_args()
+
+	board = ChessBoard()
+
+	try:
+		batchEvaluator = ChessBatchEvaluator(board)
+	except ImportError as error:
+		print(error)
+		return 1
+
+	fens = readFens(args.fens)
+
+	# Cell codes and incremental (first team's) evaluation of every position.
+	boardCellCodes: list[list[int]] = []
+	evaluatorScores: list[int] = []
+	for fen in fens:
+		if board.loadFromFen(fen) < 0:
+			return 1
+
+		boardCellCodes.append(batchEvaluator.getBoardCellCodes(board))
+		evaluatorScores.append(board.evaluator.evaluate(0))
+
+	cellCodes = batchEvaluator.packBoards(boardCellCodes)
+	termScores = batchEvaluator.getTermScores(cellCodes)
+	scores = batchEvaluator.evaluate(cellCodes)
+
+	numberOfMismatches = 0
+	for (positionIndex, fen) in enumerate(fens):
+		print(fen + ": " + str(int(scores[positionIndex])) + " (" + ", ".join(termName + " " + str(int(termScore[positionIndex])) for (termName, termScore) in termScores.items()) + ")")
+
+		pieceSquareScore = int(termScores["pieceSquare"][positionIndex])
+		if args.check and pieceSquareScore != evaluatorScores[positionIndex]:
+			print("  piece-square score differs from ChessEvaluator.evaluate: " + str(evaluatorScores[positionIndex]))
+			numberOfMismatches += 1
+
+	if args.planes is not None:
+		batchEvaluator.numpy.savez(args.planes, piecePlanes = batchEvaluator.getPiecePlanes(cellCodes), scores = scores)
+		print(args.planes + ": " + str(len(fens)) + " positions")
+
+	if args.check:
+		print(str(len(fens) - numberOfMismatches) + " of " + str(len(fens)) + " piece-square scores match ChessEvaluator.evaluate")
+
+	return 0 if numberOfMismatches == 0 else 1
+
+if __name__ == "__main__":
+	exit(main())
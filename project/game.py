@@ -2,34 +2,50 @@ from os import sys
 
 from chess.chessGameModel import ChessGameModel
 from chess.chessGameController import ChessGameController
-from chess.guiChessGameView import GuiChessGameView
 from chess.clChessGameView import ClChessGameView
 
-def main() -> None:
+ViewNames = ["gui", "cl"]
+
+def main(viewName: str = "gui") -> None:
 	gameModel = ChessGameModel()
 	
 	chessGameController = ChessGameController(gameModel)
 
-	guiChessGameView = GuiChessGameView(gameModel, chessGameController)
-	clChessGameView = ClChessGameView(gameModel, chessGameController)
+	if viewName == "gui":
+		# pygame (through the gui package) is only imported when a window is wanted.
+		from chess.guiChessGameView import GuiChessGameView
+
+		mainView = GuiChessGameView(gameModel, chessGameController)
+		clChessGameView = ClChessGameView(gameModel, chessGameController)
+	else:
+		mainView = ClChessGameView(gameModel, chessGameController, True)
 
 	gameModel.initialize()
-	guiChessGameView.loop()
+	mainView.loop()
 	gameModel.shutdown()
 
 if __name__ == "__main__":
 	profile = False
+	viewName = "gui"
 
 	for arg in sys.argv[1:]:
 		argString: str = arg
 		if argString.lower() == "profile":
 			profile = True
+		elif argString.lower() == "--headless":
+			viewName = "cl"
+		elif argString.lower().startswith("--view="):
+			viewName = argString[len("--view="):].lower()
+
+	if viewName not in ViewNames:
+		print("Unknown view " + viewName + ", expected one of: " + ", ".join(ViewNames))
+		sys.exit(1)
 
 	if profile:
 		import cProfile
 
 		cProfileOutputFilename = "cProfileOutput.dat"
-		cProfile.run("main()", cProfileOutputFilename)
+		cProfile.run("main(viewName)", cProfileOutputFilename)
 
 		import pstats
 		from pstats import SortKey
@@ -42,4 +58,4 @@ if __name__ == "__main__":
 			p = pstats.Stats(cProfileOutputFilename, stream = file)
 			p.sort_stats("calls").print_stats()
 	else:
-		main()
+		main(viewName)
@@ -34,6 +34,13 @@ class GuiGameView(GameView):
 		self.screen = pygame.display.set_mode((800, 600))
 
 		self.guiNodes: list[GuiNode] = []
+
+		# Signal handlers invalidate the view rather than drawing it, and the loop draws it
+		# once per frame, however many signals a frame brought.
+		self.isDrawOutdated = False
+
+		# After the first draw, only the screen areas changed by the nodes are redrawn and updated.
+		self.isFullDrawOutdated = True
 	
 	def __del__(self):
 		pygame.quit()
@@ -45,13 +52,42 @@ class GuiGameView(GameView):
 		while self.running:
 			self.proccessEvents()
 			self.process()
+
+			if self.isDrawOutdated:
+				self.draw()
 		
 		return 0
 
 	def process(self) -> None:
 		pass
 
+	def invalidate(self) -> None:
+		self.isDrawOutdated = True
+
 	def draw(self) -> None:
+		self.isDrawOutdated = False
+
+		if self.isFullDrawOutdated:
+			self.isFullDrawOutdated = False
+			self.drawAll()
+			return
+
+		dirtyRects: list[pygame.Rect] = []
+		for guiNode in self.guiNodes:
+			dirtyRects += guiNode.getDirtyScreenRects()
+
+		if len(dirtyRects) == 0:
+			return
+
+		for dirtyRect in dirtyRects:
+			self.screen.fill(self.backgroundColor, dirtyRect)
+
+			for guiNode in self.guiNodes:
+				guiNode.drawArea(self.screen, dirtyRect)
+
+		pygame.display.update(dirtyRects)
+
+	def drawAll(self) -> None:
 		self.screen.fill(self.backgroundColor)
 		
 		for guiNode in self.guiNodes:
@@ -15,6 +15,14 @@ class GuiNode(Observer):
 
 		self.surface: pygame.Surface = None
 
+		# Set by invalidate, so that changes are rendered once, when next drawn.
+		self.isRenderOutdated = False
+
+		# Areas of the surface changed since the node was last drawn, and where it was drawn on screen,
+		# for views to update only the parts of the screen which changed (see getDirtyScreenRects).
+		self.dirtyRects: list[pygame.Rect] = []
+		self.screenRect: pygame.Rect = None
+
 	def setPosition(self, position: List[int]) -> None:
 		self.position = position.copy()
 
@@ -27,10 +35,48 @@ class GuiNode(Observer):
 			self.surface.get_height()
 		]
 
+	def invalidate(self) -> None:
+		self.isRenderOutdated = True
+
 	def render(self) -> None:
+		self.isRenderOutdated = False
+
 		self.renderOnSelf()
 		self.renderChildrenOnSelf()
 
+		self.markDirty()
+
+	# Marks an area of the surface (all of it by default) as changed.
+	def markDirty(self, rect: pygame.Rect = None) -> None:
+		if rect is None:
+			if self.surface is None:
+				return
+
+			rect = self.surface.get_rect()
+
+		self.dirtyRects.append(rect)
+
+	def getScreenRect(self) -> pygame.Rect:
+		return pygame.Rect(self.position, self.getDimensions())
+
+	# Returns the screen areas changed since the node was last drawn, and forgets them.
+	# When the node moved or changed size, the area it covered before is included.
+	def getDirtyScreenRects(self) -> List[pygame.Rect]:
+		if self.isRenderOutdated:
+			self.render()
+
+		screenRect = self.getScreenRect()
+		dirtyScreenRects = [rect.move(self.position) for rect in self.dirtyRects]
+		if self.screenRect != screenRect:
+			dirtyScreenRects.append(screenRect)
+			if self.screenRect is not None:
+				dirtyScreenRects.append(self.screenRect)
+
+		self.screenRect = screenRect
+		self.dirtyRects = []
+
+		return dirtyScreenRects
+
 	def renderOnSelf(self) -> None:
 		pass
 
@@ -39,5 +85,20 @@ class GuiNode(Observer):
 			guiNode.draw(self.surface)
 
 	def draw(self, destinationSurface: pygame.Surface) -> None:
+		if self.isRenderOutdated:
+			self.render()
+
+		self.screenRect = self.getScreenRect()
+		self.dirtyRects = []
+
 		if self.surface is not None:
 			destinationSurface.blit(self.surface, self.position)
+
+	# Draws the part of the node within the given screen area only.
+	def drawArea(self, destinationSurface: pygame.Surface, screenRect: pygame.Rect) -> None:
+		if self.surface is None:
+			return
+
+		areaRect = self.getScreenRect().clip(screenRect)
+		if areaRect.width > 0 and areaRect.height > 0:
+			destinationSurface.blit(self.surface, areaRect.topleft, areaRect.move(-self.position[0], -self.position[1]))
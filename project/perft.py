@@ -0,0 +1,84 @@
+import argparse
+
+from chess.chessBoard import ChessBoard
+from chess.bitboardChessBoard import BitboardChessBoard
+import chess.chessPerft
+import chess.chessParallelPerft
+
+def createBoard(useBitboardBoard: bool) -> ChessBoard:
+	if useBitboardBoard:
+		return BitboardChessBoard()
+
+	return ChessBoard()
+
+def runPosition(position: chess.chessPerft.ChessPerftPosition, args) -> bool:
+	board = createBoard(args.bitboard)
+	position.loadIntoBoard(board)
+
+	depth: int = args.depth
+
+	if args.workers > 0:
+		chessPerft = chess.chessParallelPerft.ChessParallelPerft(board, args.workers, args.split_depth)
+	else:
+		chessPerft = chess.chessPerft.ChessPerft(board)
+
+	if args.enumerate:
+		chessPerft.enumeratePositions(depth)
+	elif args.divide:
+		for (move, nodeCount) in chessPerft.divide(depth):
+			print(board.getCellNameFromIndex(move[0]) + board.getCellNameFromIndex(move[1]) + ": " + str(nodeCount))
+	else:
+		chessPerft.perft(depth)
+
+	numberOfNodes = chessPerft.numberOfNodes
+	status = ""
+	isExpected = True
+	if not args.enumerate and depth <= len(position.expectedNodeCounts):
+		expectedNumberOfNodes = position.expectedNodeCounts[depth - 1]
+		isExpected = numberOfNodes == expectedNumberOfNodes
+		status = "OK" if isExpected else "FAIL (expected " + str(expectedNumberOfNodes) + ")"
+
+	nodeDescription = " distinct positions, " if args.enumerate else " nodes, "
+	print(position.name + " depth " + str(depth) + ": " + str(numberOfNodes) + nodeDescription + str(chessPerft.milliseconds) + " ms, " + str(chessPerft.getNodesPerSecond()) + " nps " + status)
+
+	if args.workers > 0:
+		for workerStatistics in chessPerft.workerStatistics.values():
+			print("  worker " + str(workerStatistics.processId) + ": " + str(workerStatistics.numberOfTasks) + " tasks, " + str(workerStatistics.numberOfNodes) + " nodes, " + str(workerStatistics.getNodesPerSecond()) + " nps")
+
+	return isExpected
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description = "Count the leaf nodes of the legal move tree of chess positions.")
+	parser.add_argument("depth", type = int, nargs = "?", default = 3)
+	parser.add_argument("--position", help = "reference position name (default: all reference positions)")
+	parser.add_argument("--fen", help = "position to count instead, in FEN")
+	parser.add_argument("--divide", action = "store_true", help = "break the node count down per root move")
+	parser.add_argument("--enumerate", action = "store_true", help = "count the distinct positions at the given depth instead")
+	parser.add_argument("--bitboard", action = "store_true", help = "use the bitboard backed chess board")
+	parser.add_argument("--workers", type = int, default = 0, help = "number of worker processes (default: count in this process)")
+	parser.add_argument("--split-depth", type = int, default = 1, help = "plies expanded before handing positions to workers")
+	args = parser.parse_args()
+
+	positions = chess.chessPerft.ReferencePositions
+	if args.fen is not None:
+		if createBoard(False).loadFromFen(args.fen) < 0:
+			return -1
+
+		positions = [chess.chessPerft.ChessPerftPosition("fen", args.fen, [])]
+	elif args.position is not None:
+		position = chess.chessPerft.getReferencePosition(args.position)
+		if position is None:
+			print("Unknown position: " + args.position)
+			return -1
+
+		positions = [position]
+
+	areAllExpected = True
+	for position in positions:
+		if not runPosition(position, args):
+			areAllExpected = False
+
+	return 0 if areAllExpected else 1
+
+if __name__ == "__main__":
+	exit(main())
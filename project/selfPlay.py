@@ -0,0 +1,51 @@
+import argparse
+
+from chess.chessBoard import ChessBoard
+from chess.chessSearch import ChessSearchLimits
+from chess.transpositionTable import TranspositionTable
+from chess.chessSelfPlay import ChessSelfPlaySettings, ChessSelfPlayRunner
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description = "Play AI against AI games without views, across worker processes.")
+	parser.add_argument("games", type = int, help = "number of games to play")
+	parser.add_argument("--output", default = "selfplay.pgn", help = "PGN file to write the games to")
+	parser.add_argument("--workers", type = int, default = 0, help = "number of worker processes (default: one per CPU)")
+	parser.add_argument("--depth", type = int, default = -1, help = "maximum search depth per move")
+	parser.add_argument("--nodes", type = int, default = -1, help = "maximum search nodes per move")
+	parser.add_argument("--milliseconds", type = int, default = -1, help = "maximum search time per move")
+	parser.add_argument("--random-plies", type = int, default = 4, help = "random moves opening every game")
+	parser.add_argument("--max-plies", type = int, default = 300, help = "plies after which games are drawn")
+	parser.add_argument("--fen", default = ChessBoard.StartingFen, help = "start position, in FEN")
+	parser.add_argument("--hash-mb", type = float, default = TranspositionTable.DefaultSizeMb, help = "transposition table size per game")
+	parser.add_argument("--book", help = "opening book file")
+	parser.add_argument("--tablebases", help = "endgame tablebases directory")
+	parser.add_argument("--bitboard", action = "store_true", help = "use the bitboard backed chess board")
+	parser.add_argument("--batch-eval", action = "store_true", help = "order root moves by NumPy batch evaluation")
+	parser.add_argument("--seed", type = int, default = 0, help = "seed of the random opening moves")
+	args = parser.parse_args()
+
+	searchLimits = ChessSearchLimits(args.depth, args.nodes, args.milliseconds)
+	if args.depth < 0 and args.nodes < 0 and args.milliseconds < 0:
+		searchLimits = ChessSearchLimits(maximumDepth = 2)
+
+	settings = ChessSelfPlaySettings(searchLimits, args.bitboard)
+	settings.useBatchEvaluator = args.batch_eval
+	settings.transpositionTableSizeMb = args.hash_mb
+	settings.openingBookPath = args.book
+	settings.tablebasesDirectoryPath = args.tablebases
+	settings.startFen = args.fen
+	settings.numberOfRandomPlies = args.random_plies
+	settings.maximumPlies = args.max_plies
+
+	runner = ChessSelfPlayRunner(settings, args.workers, args.seed)
+	with open(args.output, "w") as pgnFile:
+		runner.run(args.games, pgnFile)
+
+	print(str(runner.numberOfGames) + " games, " + str(runner.numberOfPlies) + " plies, " + str(runner.milliseconds) + " ms")
+	print("{:.2f} games/s, {:.1f} ms average move latency".format(runner.getGamesPerSecond(), runner.getAverageMoveMilliseconds()))
+	print(", ".join(result + ": " + str(count) for (result, count) in sorted(runner.resultCounts.items())))
+
+	return 0
+
+if __name__ == "__main__":
+	exit(main())